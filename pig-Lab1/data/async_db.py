@@ -0,0 +1,99 @@
+import asyncio
+import contextlib
+import functools
+import itertools
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, AsyncIterator, Callable, Iterable, Iterator, Optional
+from data.db import Database
+from data.db_config import DBConfig
+from data.instrumentation import call_as, current_caller
+
+
+def _take(it: Iterator, n: int) -> list:
+    return list(itertools.islice(it, n))
+
+
+class AsyncDatabase:
+    """Awaitable facade over `Database`.
+
+    Calls run on a dedicated executor so the event loop (or the Tk loop
+    driving it) never blocks on SQL. With a connection pool the executor
+    gets one thread per pooled connection; otherwise a single thread.
+    """
+    def __init__(self, db: Optional[Database] = None, database_url: str = "", max_workers: Optional[int] = None):
+        self.db = db if db is not None else Database(database_url)
+        workers = max_workers or max(1, self.db.pool_size())
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="db")
+
+    async def run(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, self._binder()(fn, *args, **kwargs))
+
+    def _binder(self) -> Callable[..., Callable[[], Any]]:
+        # firul executorului nu vede în stivă cine a cerut lucrul: cu statistici active, îl transmitem explicit
+        if not self.db.query_stats_enabled():
+            return functools.partial
+        return functools.partial(functools.partial, call_as, current_caller())
+
+    async def execute(self, sql: str, params: Iterable[Any] = ()) -> None:
+        await self.run(self.db.execute, sql, tuple(params))
+
+    async def execute_many(self, sql: str, rows: Iterable[Iterable[Any]], batch_size: Optional[int] = None) -> int:
+        return await self.run(self.db.execute_many, sql, rows, batch_size)
+
+    async def copy_rows(self, table: str, columns: Iterable[str], rows: Iterable[Iterable[Any]],
+                        batch_size: Optional[int] = None) -> int:
+        return await self.run(self.db.copy_rows, table, tuple(columns), rows, batch_size)
+
+    async def query(self, sql: str, params: Iterable[Any] = ()) -> list[tuple]:
+        return await self.run(self.db.query, sql, tuple(params))
+
+    async def scalar(self, sql: str, params: Iterable[Any] = ()) -> Optional[Any]:
+        return await self.run(self.db.scalar, sql, tuple(params))
+
+    def iter_query(self, sql: str, params: Iterable[Any] = (), chunk_size: Optional[int] = None) -> AsyncIterator[tuple]:
+        return self.stream(lambda: self.db.iter_query(sql, tuple(params), chunk_size), chunk_size)
+
+    async def stream(self, make_iter: Callable[[], Iterator[Any]], chunk_size: Optional[int] = None) -> AsyncIterator[Any]:
+        """Async-iterates a blocking generator, one chunk per executor hop.
+
+        The generator lives on its own thread for its whole life: its read
+        transaction is tracked per thread, so it must not hop between workers.
+        Without a connection pool that thread reads through `Database.private_read()`
+        (a connection of its own), so the shared connection stays free for
+        calls awaited inside the loop; with a pool it holds one pooled reader.
+        """
+        size = max(1, int(chunk_size or DBConfig.FETCH_CHUNK_SIZE))
+        loop = asyncio.get_running_loop()
+        bind = self._binder()
+        ex = ThreadPoolExecutor(max_workers=1, thread_name_prefix="db-stream")
+        scope = self.db.private_read() if self.db.pool_size() == 0 else contextlib.nullcontext()
+        entered = False
+        it: Optional[Iterator[Any]] = None
+        try:
+            await loop.run_in_executor(ex, bind(scope.__enter__))
+            entered = True
+            it = await loop.run_in_executor(ex, bind(lambda: iter(make_iter())))
+            while True:
+                chunk = await loop.run_in_executor(ex, bind(_take, it, size))
+                if not chunk:
+                    break
+                for item in chunk:
+                    yield item
+        finally:
+            close = getattr(it, "close", None)
+            if close is not None:
+                await loop.run_in_executor(ex, bind(close))
+            if entered:
+                await loop.run_in_executor(ex, bind(scope.__exit__, None, None, None))
+            ex.shutdown(wait=False)
+
+    async def close(self) -> None:
+        await self.run(self.db.close)
+        self._executor.shutdown(wait=True)
+
+    async def __aenter__(self) -> "AsyncDatabase":
+        return self
+
+    async def __aexit__(self, *exc: Any) -> None:
+        await self.close()
@@ -1,43 +1,342 @@
+import os
+import atexit
+import queue
 import sqlite3
+import threading
+import time
 import importlib
-from typing import Any, Iterable, Optional
+import itertools
+from typing import Any, Iterable, Iterator, Optional
 from contextlib import contextmanager
 from data.db_config import DBConfig
+from data.migrations import MIGRATIONS
+from data.instrumentation import QueryStats
+
+
+def _pg_sql(sql: str) -> str:
+    # repository-ul scrie SQL cu '?'; psycopg vrea '%s'
+    return sql.replace("%", "%%").replace("?", "%s")
+
+
+class _PgCursor:
+    """psycopg cursor that accepts the '?' placeholders used across the repo."""
+    def __init__(self, cur: Any):
+        self._cur = cur
+
+    def execute(self, sql: str, params: Iterable[Any] = ()):
+        return self._cur.execute(_pg_sql(sql), tuple(params))
+
+    def executemany(self, sql: str, rows: Iterable[Iterable[Any]]):
+        return self._cur.executemany(_pg_sql(sql), [tuple(r) for r in rows])
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._cur, name)
+
 
 class Database:
     """SQLite by default; optional PostgreSQL via psycopg."""
+    CHECKPOINT_POLICIES = ("auto", "commits", "pages", "interval")
+
     def __init__(self, database_url: str = ""):
         self._pg = False
         self._database_url = (database_url or "").strip()
         self._conn: Any = None
         self._sqlite_path: Optional[str] = None
 
+        self._ckpt_policy = "auto"
+        self._ckpt_mode = "TRUNCATE"
+        self._ckpt_lock = threading.Lock()
+        self._ckpt_stop = threading.Event()
+        self._ckpt_thread: Optional[threading.Thread] = None
+        self._page_size = 4096
+        self._commits = 0
+        self._commits_since_ckpt = 0
+        self._ckpt_count = 0
+        self._ckpt_seconds = 0.0
+        self._ckpt_last_seconds = 0.0
+        self._ckpt_last_pages = 0
+        self._local = threading.local()  # starea tranzacțiilor curente, per fir
+        self._write_lock = threading.RLock()
+        self._readers: Optional[queue.Queue] = None
+        self._reader_conns: list = []
+        self._pg_pool: Any = None
+        self._server_cursor_ids = itertools.count(1)
+        self._integrity_errors: tuple = (sqlite3.IntegrityError,)
+        self._qstats: Optional[QueryStats] = None
+        self._qstats_atexit = False
+        self._profile = self._check_profile(DBConfig.PROFILE)
+        if DBConfig.QUERY_STATS:
+            self.enable_query_stats()
+
         if self._database_url:
             psycopg = importlib.import_module("psycopg")  # type: ignore
             self._pg = True
-            self._conn = psycopg.connect(self._database_url, autocommit=True)
+            self._integrity_errors = (sqlite3.IntegrityError, psycopg.IntegrityError)
+            self._pg_pool = self._open_pg_pool(int(DBConfig.PG_POOL_SIZE or 0))
+            if self._pg_pool is None:
+                self._conn = psycopg.connect(self._database_url, autocommit=True)
         else:
             self._sqlite_path = DBConfig.SQLITE_PATH
-            self._conn = sqlite3.connect(
-                self._sqlite_path,
-                check_same_thread=False,
-                timeout=30.0,
-            )
-            self._conn.execute("PRAGMA journal_mode=WAL;")
-            self._conn.execute("PRAGMA synchronous=NORMAL;")
-            self._conn.execute("PRAGMA busy_timeout=30000;")
+            self._conn = self._connect_sqlite()
+            self._page_size = int(self._conn.execute("PRAGMA page_size;").fetchone()[0])
+            self._setup_checkpoint_policy()
 
         self._init_schema()
+        if not self._pg and int(DBConfig.POOL_SIZE or 0) > 0:
+            self._open_readers(int(DBConfig.POOL_SIZE))
 
     def sqlite_path(self) -> Optional[str]:
         return self._sqlite_path
 
-    def _checkpoint(self):
+    def is_postgres(self) -> bool:
+        return self._pg
+
+    def integrity_errors(self) -> tuple:
+        return self._integrity_errors
+
+    def pool_size(self) -> int:
+        # câte conexiuni pot lucra în paralel (0 = o singură conexiune partajată)
+        if self._pg_pool is not None:
+            return int(self._pg_pool.max_size)
+        return len(self._reader_conns)
+
+    def close(self) -> None:
+        self._ckpt_stop.set()
+        if self._ckpt_thread is not None:
+            self._ckpt_thread.join()
+            self._ckpt_thread = None
+        for conn in self._reader_conns:
+            conn.close()
+        self._reader_conns = []
+        self._readers = None
+        if self._pg_pool is not None:
+            self._pg_pool.close()
+        if self._conn is not None:
+            self._conn.close()
+
+    def _open_pg_pool(self, size: int) -> Any:
+        if size <= 0:
+            return None
+        try:
+            pool_mod = importlib.import_module("psycopg_pool")  # type: ignore
+        except ImportError:
+            return None  # fără psycopg_pool: o singură conexiune, cu lock
+        return pool_mod.ConnectionPool(
+            self._database_url,
+            min_size=1,
+            max_size=size,
+            kwargs={"autocommit": True},
+            open=True,
+        )
+
+    def _open_readers(self, n: int) -> None:
+        # WAL permite cititori concurenți cu un singur writer
+        self._readers = queue.Queue()
+        for _ in range(n):
+            conn = self._connect_sqlite()
+            conn.execute("PRAGMA query_only=ON;")
+            self._reader_conns.append(conn)
+            self._readers.put(conn)
+
+    def _connect_sqlite(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(
+            self._sqlite_path,
+            check_same_thread=False,
+            timeout=30.0,
+        )
+        settings = DBConfig.PROFILES[self._profile]
+        if conn.execute("PRAGMA page_count;").fetchone()[0] == 0:
+            # page_size se poate schimba doar înainte de prima tabelă (și înainte de WAL)
+            conn.execute(f"PRAGMA page_size={int(settings.get('page_size', 4096))};")
+        conn.execute("PRAGMA journal_mode=WAL;")
+        conn.execute("PRAGMA busy_timeout=30000;")
+        # codurile de categorie sunt chei străine spre tabelele de lookup (migrarea 7)
+        conn.execute("PRAGMA foreign_keys=ON;")
+        self._apply_pragmas(conn, settings)
+        return conn
+
+    # ---------- performance profiles ----------
+    @staticmethod
+    def _check_profile(name: str) -> str:
+        key = (name or "").strip().lower()
+        if key not in DBConfig.PROFILES:
+            raise ValueError(f"Unknown DB profile: {name}")
+        return key
+
+    @staticmethod
+    def _apply_pragmas(conn: sqlite3.Connection, settings: dict) -> None:
+        conn.execute(f"PRAGMA synchronous={settings['synchronous']};")
+        conn.execute(f"PRAGMA cache_size={int(settings['cache_size'])};")
+        conn.execute(f"PRAGMA mmap_size={int(settings['mmap_size'])};")
+        conn.execute(f"PRAGMA temp_store={settings['temp_store']};")
+
+    def profile(self) -> str:
+        return self._profile
+
+    def apply_profile(self, name: str) -> str:
+        """Switches the writer connection to another profile; returns the previous one.
+
+        Reader connections keep the profile they were opened with; only the
+        writer's synchronous/cache settings matter for imports.
+        """
+        key = self._check_profile(name)
+        previous = self._profile
         if not self._pg:
-            try:
-                self._conn.execute("PRAGMA wal_checkpoint(TRUNCATE);")
-            except Exception:
-                pass
+            with self._write_lock:
+                self._apply_pragmas(self._conn, DBConfig.PROFILES[key])
+        self._profile = key
+        return previous
+
+    @contextmanager
+    def bulk_load(self):
+        # profilul "bulk-load" doar pe durata importului, apoi revenim
+        previous = self.apply_profile("bulk-load")
+        try:
+            yield self
+        finally:
+            self.apply_profile(previous)
+
+    # ---------- WAL checkpoint policy ----------
+    def _setup_checkpoint_policy(self) -> None:
+        policy = (DBConfig.CHECKPOINT_POLICY or "auto").strip().lower()
+        if policy not in self.CHECKPOINT_POLICIES:
+            raise ValueError(f"Unknown checkpoint policy: {DBConfig.CHECKPOINT_POLICY}")
+        self._ckpt_policy = policy
+        self._ckpt_mode = (DBConfig.CHECKPOINT_MODE or "TRUNCATE").strip().upper()
+        if self._ckpt_mode not in ("PASSIVE", "FULL", "RESTART", "TRUNCATE"):
+            raise ValueError(f"Unknown checkpoint mode: {DBConfig.CHECKPOINT_MODE}")
+
+        if policy == "auto":
+            # SQLite face singur checkpoint PASSIVE la fiecare N pagini din WAL
+            self._conn.execute(f"PRAGMA wal_autocheckpoint={int(DBConfig.CHECKPOINT_WAL_PAGES)};")
+            return
+        # politica noastră e singura care face checkpoint
+        self._conn.execute("PRAGMA wal_autocheckpoint=0;")
+        if policy == "interval":
+            self._ckpt_thread = threading.Thread(
+                target=self._checkpointer_loop,
+                args=(float(DBConfig.CHECKPOINT_INTERVAL),),
+                name="wal-checkpointer",
+                daemon=True,
+            )
+            self._ckpt_thread.start()
+
+    def _checkpointer_loop(self, interval: float) -> None:
+        # conexiune proprie, ca să nu împartă cursorul cu firul principal
+        conn = self._connect_sqlite()
+        try:
+            while not self._ckpt_stop.wait(interval):
+                self._run_checkpoint(conn, self._ckpt_mode)
+        finally:
+            conn.close()
+
+    def _run_checkpoint(self, conn: sqlite3.Connection, mode: str) -> Optional[tuple]:
+        pages = self.wal_pages()
+        start = time.perf_counter()
+        try:
+            row = conn.execute(f"PRAGMA wal_checkpoint({mode});").fetchone()
+        except Exception:
+            return None
+        elapsed = time.perf_counter() - start
+        with self._ckpt_lock:
+            self._ckpt_count += 1
+            self._ckpt_seconds += elapsed
+            self._ckpt_last_seconds = elapsed
+            self._ckpt_last_pages = pages
+            self._commits_since_ckpt = 0
+        return row
+
+    def _after_commit(self) -> None:
+        if self._pg:
+            return
+        with self._ckpt_lock:
+            self._commits += 1
+            self._commits_since_ckpt += 1
+            pending = self._commits_since_ckpt
+        if self._ckpt_policy == "commits":
+            if pending >= max(1, int(DBConfig.CHECKPOINT_EVERY_COMMITS)):
+                self._run_checkpoint(self._conn, self._ckpt_mode)
+        elif self._ckpt_policy == "pages":
+            if self.wal_pages() >= max(1, int(DBConfig.CHECKPOINT_WAL_PAGES)):
+                # doar TRUNCATE micșorează fișierul -wal după care măsurăm
+                self._run_checkpoint(self._conn, "TRUNCATE")
+
+    def checkpoint(self, mode: Optional[str] = None) -> Optional[tuple]:
+        """Forces a WAL checkpoint; returns SQLite's (busy, log, checkpointed) row."""
+        if self._pg:
+            return None
+        with self._write_lock:
+            return self._run_checkpoint(self._conn, (mode or self._ckpt_mode).strip().upper())
+
+    def wal_bytes(self) -> int:
+        if self._pg or not self._sqlite_path:
+            return 0
+        try:
+            return os.path.getsize(self._sqlite_path + "-wal")
+        except OSError:
+            return 0
+
+    def wal_pages(self) -> int:
+        # antet WAL de 32 de octeți + cadre de (24 + page_size)
+        size = self.wal_bytes()
+        return max(0, (size - 32) // (self._page_size + 24)) if size else 0
+
+    def checkpoint_stats(self) -> dict:
+        with self._ckpt_lock:
+            stats = {
+                "policy": self._ckpt_policy,
+                "mode": self._ckpt_mode,
+                "commits": self._commits,
+                "checkpoints": self._ckpt_count,
+                "checkpoint_seconds": self._ckpt_seconds,
+                "last_checkpoint_seconds": self._ckpt_last_seconds,
+                "last_checkpoint_wal_pages": self._ckpt_last_pages,
+            }
+        stats["wal_pages"] = self.wal_pages()
+        stats["wal_bytes"] = self.wal_bytes()
+        return stats
+
+    # ---------- query instrumentation ----------
+    def enable_query_stats(self, slow_ms: Optional[float] = None, explain: Optional[bool] = None) -> QueryStats:
+        self._qstats = QueryStats(
+            DBConfig.SLOW_QUERY_MS if slow_ms is None else slow_ms,
+            DBConfig.EXPLAIN_SLOW_QUERIES if explain is None else explain,
+        )
+        # o singură înregistrare la atexit, care scrie statisticile curente (și după re-activare)
+        if DBConfig.QUERY_STATS_DUMP and not self._qstats_atexit:
+            atexit.register(self._dump_query_stats_at_exit)
+            self._qstats_atexit = True
+        return self._qstats
+
+    def disable_query_stats(self) -> None:
+        self._qstats = None
+
+    def query_stats_enabled(self) -> bool:
+        return self._qstats is not None
+
+    def query_stats(self) -> list[dict]:
+        return [] if self._qstats is None else self._qstats.snapshot()
+
+    def dump_query_stats(self, path: str = "") -> None:
+        if self._qstats is not None:
+            self._qstats.dump(path)
+
+    def _dump_query_stats_at_exit(self) -> None:
+        if DBConfig.QUERY_STATS_DUMP:
+            self.dump_query_stats(DBConfig.QUERY_STATS_DUMP)
+
+    def _record(self, sql: str, start: float, rows: int, params: Any = ()) -> None:
+        if self._qstats is not None:
+            self._qstats.record(sql, time.perf_counter() - start, rows, params, self._explain)
+
+    def _explain(self, sql: str, params: Any) -> list[tuple]:
+        if not sql.lstrip().upper().startswith(("SELECT", "WITH", "INSERT", "UPDATE", "DELETE")):
+            return []
+        prefix = "EXPLAIN " if self._pg else "EXPLAIN QUERY PLAN "
+        # cursor direct, nu query(): planul nu trebuie să apară în statistici
+        with self.read() as cur:
+            cur.execute(prefix + sql, tuple(params))
+            return cur.fetchall()
 
     def _init_schema(self) -> None:
         with self.transaction() as cur:
@@ -47,7 +346,7 @@ class Database:
             if cur.fetchone()[0] == 0:
                 cur.execute("INSERT INTO __schema_version__(v) VALUES (0)")
 
-            # tabele
+            # tabele (schema inițială; migrarea 7 le reconstruiește cu coduri de categorie)
             cur.execute("""
                 CREATE TABLE IF NOT EXISTS teacher(
                     id TEXT PRIMARY KEY,
@@ -74,47 +373,335 @@ class Database:
                 );
             """)
 
-            # exemple de migrare viitoare:
-            cur.execute("SELECT v FROM __schema_version__")
-            v = cur.fetchone()[0]
-            if v < 1:
-                # ex.: cur.execute("ALTER TABLE student ADD COLUMN group_name TEXT DEFAULT ''")
-                cur.execute("UPDATE __schema_version__ SET v=1")
+        # indecși, coloane noi etc. vin din data/migrations.py
+        self._migrate()
+
+    def schema_version(self) -> int:
+        return int(self.scalar("SELECT v FROM __schema_version__") or 0)
+
+    def _migrate(self) -> None:
+        current = self.schema_version()
+        for m in sorted(MIGRATIONS, key=lambda m: m.version):
+            if m.version <= current:
+                continue
+            with self.transaction() as cur:
+                if not self._pg:
+                    # DDL-ul nu deschide implicit tranzacție în sqlite3
+                    cur.execute("BEGIN IMMEDIATE")
+                for step in m.steps(self._pg):
+                    if callable(step):
+                        step(cur, self._pg)
+                    else:
+                        cur.execute(step)
+                cur.execute("UPDATE __schema_version__ SET v=?", (m.version,))
+            current = m.version
 
     @contextmanager
     def transaction(self):
+        # SQLite: un singur writer, tranzacțiile de scriere sunt serializate între fire
+        local = self._local
+        depth = getattr(local, "write_depth", 0)
+        conn = local.write_conn if depth else self._acquire_writer()
+        local.write_conn = conn
+        local.write_depth = depth + 1
+        try:
+            if self._pg:
+                # tranzacție reală; imbricată devine SAVEPOINT
+                with conn.transaction():
+                    cur = _PgCursor(conn.cursor())
+                    try:
+                        yield cur
+                    finally:
+                        cur.close()
+            else:
+                cur = conn.cursor()
+                try:
+                    yield cur
+                    conn.commit()
+                    self._after_commit()
+                except:
+                    conn.rollback()
+                    raise
+                finally:
+                    cur.close()
+        finally:
+            local.write_depth = depth
+            if depth == 0:
+                local.write_conn = None
+                self._release_writer(conn)
+
+    @contextmanager
+    def read(self):
+        """Cursor for SELECTs only: no commit and no checkpoint.
+
+        Nested `read()` blocks share one read transaction, so a group of
+        queries (a whole snapshot, a chart payload) sees a single consistent
+        state of the database. In pool mode the transaction runs on one of
+        the reader connections; inside `transaction()` it reuses the writer.
+        """
+        local = self._local
+        depth = getattr(local, "read_depth", 0)
+        if depth == 0:
+            if getattr(local, "write_depth", 0):
+                # citire în interiorul unei scrieri: vede modificările necomise
+                local.read_conn, local.read_owned, local.read_began = local.write_conn, False, False
+            else:
+                conn = self._acquire_reader()
+                try:
+                    local.read_began = self._begin_read(conn)
+                except:
+                    self._release_reader(conn)
+                    raise
+                local.read_conn, local.read_owned = conn, True
+        local.read_depth = depth + 1
+        conn = local.read_conn
+        cur = _PgCursor(conn.cursor()) if self._pg else conn.cursor()
+        try:
+            yield cur
+        finally:
+            cur.close()
+            local.read_depth -= 1
+            # ultimul care iese (bloc sau generator) închide tranzacția
+            if local.read_depth == 0:
+                local.read_conn = None
+                if local.read_owned:
+                    try:
+                        if local.read_began:
+                            self._end_read(conn)
+                    finally:
+                        self._release_reader(conn)
+
+    @contextmanager
+    def private_read(self):
+        """Read transaction on a short-lived connection of its own, for long streams.
+
+        `read()` blocks entered on this thread inside it reuse that connection,
+        so a generator can be consumed slowly (across awaits, between chunks)
+        without holding the shared connection's lock or a pooled reader.
+        """
+        local = self._local
+        if getattr(local, "read_depth", 0) or getattr(local, "write_depth", 0):
+            with self.read():  # deja într-o tranzacție pe acest fir: o refolosim
+                yield
+            return
         if self._pg:
-            cur = self._conn.cursor()
-            try:
-                yield cur
-            finally:
-                cur.close()
+            conn = importlib.import_module("psycopg").connect(self._database_url, autocommit=True)
         else:
-            cur = self._conn.cursor()
+            conn = self._connect_sqlite()
+            conn.execute("PRAGMA query_only=ON;")
+        try:
+            began = self._begin_read(conn)
+            local.read_conn, local.read_owned, local.read_began = conn, False, began
+            local.read_depth = 1
             try:
-                yield cur
-                self._conn.commit()
-                self._checkpoint()  # face scrierile vizibile imediat pentru vizualizatoare externe
-            except:
-                self._conn.rollback()
-                raise
+                yield
             finally:
-                cur.close()
+                local.read_depth = 0
+                local.read_conn = None
+                if began:
+                    self._end_read(conn)
+        finally:
+            conn.close()
+
+    def _begin_read(self, conn: Any) -> bool:
+        if self._pg:
+            conn.execute("BEGIN ISOLATION LEVEL REPEATABLE READ READ ONLY")
+            return True
+        if not conn.in_transaction:
+            conn.execute("BEGIN")  # DEFERRED: snapshot-ul se ia la primul SELECT
+            return True
+        return False
+
+    def _end_read(self, conn: Any) -> None:
+        # nimic de scris: închidem tranzacția fără commit/checkpoint
+        if self._pg:
+            conn.execute("COMMIT")
+        elif conn.in_transaction:
+            conn.rollback()
+
+    def _acquire_writer(self) -> Any:
+        if self._pg_pool is not None:
+            return self._pg_pool.getconn()
+        self._write_lock.acquire()
+        return self._conn
+
+    def _release_writer(self, conn: Any) -> None:
+        if self._pg_pool is not None:
+            self._pg_pool.putconn(conn)
+        else:
+            self._write_lock.release()
+
+    def _acquire_reader(self) -> Any:
+        if self._pg_pool is not None:
+            return self._pg_pool.getconn()
+        if self._readers is None:
+            self._write_lock.acquire()
+            return self._conn
+        return self._readers.get()
+
+    def _release_reader(self, conn: Any) -> None:
+        if self._pg_pool is not None:
+            self._pg_pool.putconn(conn)
+        elif self._readers is None:
+            self._write_lock.release()
+        else:
+            self._readers.put(conn)
 
     def execute(self, sql: str, params: Iterable[Any] = ()):
+        params = tuple(params)
+        start = time.perf_counter()
         try:
             with self.transaction() as cur:
-                cur.execute(sql, tuple(params))
-        except sqlite3.IntegrityError as e:
+                cur.execute(sql, params)
+                rows = cur.rowcount
+            self._record(sql, start, rows, params)
+        except self._integrity_errors as e:
+            raise ValueError(f"Integrity error: {e}")
+
+    def execute_many(
+        self,
+        sql: str,
+        rows: Iterable[Iterable[Any]],
+        batch_size: Optional[int] = None,
+    ) -> int:
+        """Runs `sql` for every row, one transaction (and one commit) per batch.
+
+        `rows` may be any iterable, including a generator, so large loads are
+        never materialized all at once. Returns the number of rows written.
+        """
+        size = max(1, int(batch_size or DBConfig.BATCH_SIZE))
+        it = iter(rows)
+        total = 0
+        try:
+            while True:
+                batch = [tuple(r) for r in itertools.islice(it, size)]
+                if not batch:
+                    break
+                start = time.perf_counter()
+                with self.transaction() as cur:
+                    cur.executemany(sql, batch)
+                self._record(sql, start, len(batch), batch[0])
+                total += len(batch)
+        except self._integrity_errors as e:
+            raise ValueError(f"Integrity error: {e}")
+        return total
+
+    def copy_rows(
+        self,
+        table: str,
+        columns: Iterable[str],
+        rows: Iterable[Iterable[Any]],
+        batch_size: Optional[int] = None,
+    ) -> int:
+        """Bulk-loads rows into `table`, one transaction per batch.
+
+        PostgreSQL streams each batch with COPY FROM STDIN; SQLite stages the
+        batch in a TEMP table and moves it with one INSERT ... SELECT.
+        """
+        cols = list(columns)
+        if not self._pg:
+            return self._copy_rows_sqlite(table, cols, rows, batch_size)
+
+        size = max(1, int(batch_size or DBConfig.COPY_BATCH_SIZE))
+        it = iter(rows)
+        total = 0
+        try:
+            while True:
+                batch = list(itertools.islice(it, size))
+                if not batch:
+                    break
+                stmt = f"COPY {table} ({','.join(cols)}) FROM STDIN"
+                start = time.perf_counter()
+                with self.transaction() as cur:
+                    with cur.copy(stmt) as copy:
+                        for r in batch:
+                            copy.write_row(tuple(r))
+                self._record(stmt, start, len(batch))
+                total += len(batch)
+        except self._integrity_errors as e:
+            raise ValueError(f"Integrity error: {e}")
+        return total
+
+    def _copy_rows_sqlite(self, table: str, cols: list[str], rows: Iterable[Iterable[Any]],
+                          batch_size: Optional[int]) -> int:
+        # FTS5 își golește buffer-ul la fiecare statement care îl atinge prin triggere,
+        # deci un INSERT per rând e de ~10x mai lent decât un singur INSERT ... SELECT per batch
+        size = max(1, int(batch_size or DBConfig.BATCH_SIZE))
+        col_list = ",".join(cols)
+        stage = f"_copy_{table}"
+        stmt = f"INSERT INTO {table}({col_list}) SELECT {col_list} FROM temp.{stage}"
+        it = iter(rows)
+        total = 0
+        try:
+            while True:
+                batch = [tuple(r) for r in itertools.islice(it, size)]
+                if not batch:
+                    break
+                start = time.perf_counter()
+                with self.transaction() as cur:
+                    # coloane fără tip: valorile ajung neschimbate la afinitatea tabelului țintă
+                    cur.execute(f"CREATE TEMP TABLE IF NOT EXISTS {stage}({col_list})")
+                    cur.executemany(f"INSERT INTO temp.{stage} VALUES({','.join('?' for _ in cols)})", batch)
+                    cur.execute(stmt)
+                    cur.execute(f"DELETE FROM temp.{stage}")
+                self._record(stmt, start, len(batch))
+                total += len(batch)
+        except self._integrity_errors as e:
             raise ValueError(f"Integrity error: {e}")
+        return total
 
     def query(self, sql: str, params: Iterable[Any] = ()) -> list[tuple]:
-        with self.transaction() as cur:
-            cur.execute(sql, tuple(params))
-            return cur.fetchall()
+        params = tuple(params)
+        start = time.perf_counter()
+        with self.read() as cur:
+            cur.execute(sql, params)
+            rows = cur.fetchall()
+        self._record(sql, start, len(rows), params)
+        return rows
+
+    def iter_query(
+        self,
+        sql: str,
+        params: Iterable[Any] = (),
+        chunk_size: Optional[int] = None,
+    ) -> Iterator[tuple]:
+        """Yields rows fetched `chunk_size` at a time, inside one read transaction.
+
+        Only one chunk is held in memory; the transaction stays open until the
+        generator is exhausted or closed.
+        """
+        size = max(1, int(chunk_size or DBConfig.FETCH_CHUNK_SIZE))
+        with self.read() as cur:
+            if self._pg:
+                # cursor named (server-side): rândurile rămân pe server până la fetch
+                name = f"iter_query_{next(self._server_cursor_ids)}"
+                server_cur = self._local.read_conn.cursor(name=name)
+                server_cur.itersize = size
+                cur = _PgCursor(server_cur)
+            params = tuple(params)
+            # se măsoară doar timpul petrecut în DB, nu și în consumator
+            spent, count = 0.0, 0
+            try:
+                start = time.perf_counter()
+                cur.execute(sql, params)
+                while True:
+                    rows = cur.fetchmany(size)
+                    spent += time.perf_counter() - start
+                    if not rows:
+                        break
+                    count += len(rows)
+                    yield from rows
+                    start = time.perf_counter()
+            finally:
+                if self._pg:
+                    cur.close()
+            self._record(sql, time.perf_counter() - spent, count, params)
 
     def scalar(self, sql: str, params: Iterable[Any] = ()) -> Optional[Any]:
-        with self.transaction() as cur:
-            cur.execute(sql, tuple(params))
+        params = tuple(params)
+        start = time.perf_counter()
+        with self.read() as cur:
+            cur.execute(sql, params)
             row = cur.fetchone()
-            return None if row is None else row[0]
+        self._record(sql, start, 0 if row is None else 1, params)
+        return None if row is None else row[0]
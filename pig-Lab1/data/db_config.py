@@ -12,3 +12,48 @@ class DBConfig:
     BASE_DIR = _app_root()
     SQLITE_PATH = str((BASE_DIR / "school.db").resolve())
     DATABASE_URL = ""  # lasă gol pentru SQLite
+    BATCH_SIZE = 1000  # rânduri per tranzacție în Database.execute_many
+    FETCH_CHUNK_SIZE = 1000  # rânduri per fetchmany în Database.iter_query
+    # Profiluri de performanță SQLite; page_size se aplică doar la crearea fișierului.
+    #   durable   - fsync la fiecare commit, cache mic, fără mmap
+    #   balanced  - implicit: citiri prin mmap, cache 64 MB, temporare în memorie
+    #   bulk-load - pentru importuri (Database.bulk_load()): fără fsync, cache mare
+    PROFILE = "balanced"
+    PROFILES = {
+        "durable": {
+            "synchronous": "FULL", "cache_size": -16_000, "mmap_size": 0,
+            "temp_store": "DEFAULT", "page_size": 4096,
+        },
+        "balanced": {
+            "synchronous": "NORMAL", "cache_size": -64_000, "mmap_size": 256 * 1024 * 1024,
+            "temp_store": "MEMORY", "page_size": 4096,
+        },
+        "bulk-load": {
+            "synchronous": "OFF", "cache_size": -256_000, "mmap_size": 256 * 1024 * 1024,
+            "temp_store": "MEMORY", "page_size": 4096,
+        },
+    }
+
+    # 0 = o singură conexiune (cu lock); N > 0 = N conexiuni de citire + un writer serializat
+    POOL_SIZE = 0
+    # PostgreSQL: conexiuni în psycopg_pool (0 sau fără psycopg_pool = o singură conexiune)
+    PG_POOL_SIZE = 5
+    COPY_BATCH_SIZE = 100_000  # rânduri per COPY FROM STDIN
+
+    # Statistici per instrucțiune SQL (Database.query_stats()); dezactivate implicit
+    QUERY_STATS = False
+    SLOW_QUERY_MS = 100.0         # pragul pentru logger-ul "data.db.slow"
+    EXPLAIN_SLOW_QUERIES = False  # atașează EXPLAIN (QUERY PLAN) la interogările lente
+    QUERY_STATS_DUMP = ""         # fișier JSON scris la ieșirea din program
+
+    # Checkpoint WAL (doar SQLite):
+    #   "auto"     - checkpoint automat SQLite la CHECKPOINT_WAL_PAGES pagini
+    #   "commits"  - checkpoint după fiecare CHECKPOINT_EVERY_COMMITS commit-uri
+    #   "pages"    - checkpoint TRUNCATE când WAL depășește CHECKPOINT_WAL_PAGES pagini
+    #   "interval" - fir de fundal, checkpoint la fiecare CHECKPOINT_INTERVAL secunde
+    # Vizualizatoarele externe află de modificări din tabelul __changes__, nu din checkpoint-uri.
+    CHECKPOINT_POLICY = "auto"
+    CHECKPOINT_MODE = "TRUNCATE"  # PASSIVE | FULL | RESTART | TRUNCATE
+    CHECKPOINT_EVERY_COMMITS = 1
+    CHECKPOINT_WAL_PAGES = 1000
+    CHECKPOINT_INTERVAL = 5.0
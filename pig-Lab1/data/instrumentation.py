@@ -0,0 +1,172 @@
+"""Opt-in per-statement query statistics for `Database`.
+
+Enabled with `DBConfig.QUERY_STATS`. Statements are grouped by their
+normalized text (literals and IN-lists collapsed), and each group keeps
+call count, total time, rows, the callers outside `data/`, and a bounded
+reservoir of latencies for p50/p95/p99.
+"""
+import json
+import logging
+import random
+import re
+import sys
+import threading
+from contextvars import ContextVar
+from typing import Any, Callable, Optional
+
+log = logging.getLogger("data.db.slow")
+
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r"\b\d+(?:\.\d+)?\b")
+_IN_LIST = re.compile(r"\bIN\s*\(\s*\?(?:\s*,\s*\?)+\s*\)", re.IGNORECASE)
+_SPACES = re.compile(r"\s+")
+
+# cadrele din aceste module nu sunt „apelanți” interesanți
+_SKIP_MODULES = (
+    "data.db", "data.async_db", "data.instrumentation", "repository.async_repository",
+    "contextlib", "concurrent.futures", "threading", "asyncio",
+)
+
+# pe firele executorului stiva se oprește în concurrent.futures/threading; apelantul real
+# e cel care a trimis lucrul, reținut de AsyncDatabase înainte de salt (vezi call_as)
+_submitter: ContextVar[str] = ContextVar("query_submitter", default="?")
+
+
+def normalize_sql(sql: str) -> str:
+    s = _STRING.sub("?", sql)
+    s = _NUMBER.sub("?", s)
+    s = _IN_LIST.sub("IN (?)", s)
+    return _SPACES.sub(" ", s).strip()
+
+
+def _percentile(sorted_vals: list[float], q: float) -> float:
+    if not sorted_vals:
+        return 0.0
+    k = (len(sorted_vals) - 1) * q
+    lo = int(k)
+    hi = min(lo + 1, len(sorted_vals) - 1)
+    return sorted_vals[lo] + (sorted_vals[hi] - sorted_vals[lo]) * (k - lo)
+
+
+def _caller() -> str:
+    f = sys._getframe(1)
+    while f is not None:
+        mod = f.f_globals.get("__name__", "")
+        if not mod.startswith(_SKIP_MODULES):
+            return f"{mod}.{f.f_code.co_name}"
+        f = f.f_back
+    return _submitter.get()
+
+
+def current_caller() -> str:
+    """The caller `QueryStats` would report for a query issued from here."""
+    return _caller()
+
+
+def call_as(caller: str, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+    """Runs `fn` with `caller` reported for queries whose stack has no caller of its own."""
+    token = _submitter.set(caller)
+    try:
+        return fn(*args, **kwargs)
+    finally:
+        _submitter.reset(token)
+
+
+class _StatementStats:
+    __slots__ = ("sql", "calls", "total", "max", "rows", "samples", "seen", "callers")
+
+    def __init__(self, sql: str):
+        self.sql = sql
+        self.calls = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.rows = 0
+        self.samples: list[float] = []
+        self.seen = 0
+        self.callers: dict[str, int] = {}
+
+
+class QueryStats:
+    def __init__(self, slow_ms: float = 100.0, explain: bool = False, sample_size: int = 1024):
+        self.slow_ms = float(slow_ms)
+        self.explain = bool(explain)
+        self.sample_size = max(1, int(sample_size))
+        self._lock = threading.Lock()
+        self._rand = random.Random(0)
+        self._stmts: dict[str, _StatementStats] = {}
+
+    def record(
+        self,
+        sql: str,
+        seconds: float,
+        rows: int = 0,
+        params: Any = (),
+        explain: Optional[Callable[[str, Any], list]] = None,
+    ) -> None:
+        key = normalize_sql(sql)
+        caller = _caller()
+        with self._lock:
+            st = self._stmts.get(key)
+            if st is None:
+                st = self._stmts[key] = _StatementStats(key)
+            st.calls += 1
+            st.total += seconds
+            st.max = max(st.max, seconds)
+            st.rows += max(0, int(rows or 0))
+            st.callers[caller] = st.callers.get(caller, 0) + 1
+            # eșantion rezervor: percentile pe toată rularea, memorie constantă
+            st.seen += 1
+            if len(st.samples) < self.sample_size:
+                st.samples.append(seconds)
+            else:
+                j = self._rand.randrange(st.seen)
+                if j < self.sample_size:
+                    st.samples[j] = seconds
+
+        ms = seconds * 1000.0
+        if ms >= self.slow_ms:
+            plan = ""
+            if self.explain and explain is not None:
+                try:
+                    plan = " | ".join(str(r[-1]) for r in explain(sql, params))
+                except Exception:
+                    plan = ""
+            log.warning("slow query %.1f ms from %s: %s%s", ms, caller, key, f" [plan: {plan}]" if plan else "")
+
+    def snapshot(self) -> list[dict]:
+        with self._lock:
+            items = [
+                (st.sql, st.calls, st.total, st.max, st.rows, sorted(st.samples), dict(st.callers))
+                for st in self._stmts.values()
+            ]
+        out = []
+        for sql, calls, total, mx, rows, samples, callers in items:
+            out.append({
+                "sql": sql,
+                "calls": calls,
+                "total_ms": total * 1000.0,
+                "mean_ms": total * 1000.0 / calls if calls else 0.0,
+                "p50_ms": _percentile(samples, 0.50) * 1000.0,
+                "p95_ms": _percentile(samples, 0.95) * 1000.0,
+                "p99_ms": _percentile(samples, 0.99) * 1000.0,
+                "max_ms": mx * 1000.0,
+                "rows": rows,
+                "callers": sorted(callers.items(), key=lambda x: -x[1]),
+            })
+        return sorted(out, key=lambda x: -x["total_ms"])
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stmts.clear()
+
+    def dump(self, path: str = "") -> None:
+        data = self.snapshot()
+        if path:
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(data, f, indent=2, ensure_ascii=False)
+            return
+        for st in data:
+            log.info(
+                "%6d calls %9.1f ms total p50=%.2f p95=%.2f p99=%.2f rows=%d  %s",
+                st["calls"], st["total_ms"], st["p50_ms"], st["p95_ms"], st["p99_ms"], st["rows"], st["sql"],
+            )
@@ -0,0 +1,581 @@
+"""Versioned schema migrations, applied in order by `Database._migrate()`.
+
+`__schema_version__.v` holds the last applied version. On start-up every
+migration with a higher version runs in its own transaction, and the
+version is bumped in that same transaction, so a failed migration leaves
+the database at the previous version.
+
+To ship a new index or column:
+
+    * append a `Migration` with the next version number to `MIGRATIONS`;
+    * use additive, idempotent statements (`CREATE INDEX IF NOT EXISTS`,
+      `ALTER TABLE ... ADD COLUMN ... DEFAULT ...`) so no table is rebuilt
+      (migration 7 is the exception: SQLite cannot change a column's type);
+    * give a `postgres` list only when the SQL differs between backends;
+    * for data changes pass a callable `step(cur, pg)` instead of a string.
+
+Never edit or renumber a migration that has already been released.
+"""
+from typing import Any, Callable, Sequence, Union
+
+Step = Union[str, Callable[[Any, bool], None]]
+
+
+class Migration:
+    def __init__(self, version: int, description: str, sqlite: Sequence[Step], postgres: Sequence[Step] | None = None):
+        self.version = version
+        self.description = description
+        self.sqlite = list(sqlite)
+        self.postgres = None if postgres is None else list(postgres)
+
+    def steps(self, pg: bool) -> list[Step]:
+        if pg and self.postgres is not None:
+            return self.postgres
+        return self.sqlite
+
+
+def _in_list(values: Sequence[str]) -> str:
+    return "(" + ", ".join("'" + v.replace("'", "''") + "'" for v in values) + ")"
+
+
+# valorile permise la momentul migrării 3 (migrările nu se mai modifică după release)
+_V3_DEPARTMENTS = ("Human Resources", "Finance", "Engineering", "Marketing", "Unknown")
+_V3_SUBJECTS = ("Mathematics", "Physics", "Chemistry", "Biology", "Unknown")
+_V3_SPECIALITIES = ("Computer Science", "Mathematics", "Physics", "Engineering", "Unknown")
+
+# tabel -> (condiție „rând nenormalizat” pentru SQLite, idem Postgres, coloanele urmărite)
+_V3_DIRTY = {
+    "teacher": (
+        f"NEW.department NOT IN {_in_list(_V3_DEPARTMENTS)} OR NEW.subject NOT IN {_in_list(_V3_SUBJECTS)}"
+        " OR typeof(NEW.salary) <> 'real'",
+        f"NEW.department NOT IN {_in_list(_V3_DEPARTMENTS)} OR NEW.subject NOT IN {_in_list(_V3_SUBJECTS)}",
+        "salary, department, subject",
+    ),
+    "assistant": (
+        f"NEW.department NOT IN {_in_list(_V3_DEPARTMENTS)} OR typeof(NEW.salary) <> 'real'",
+        f"NEW.department NOT IN {_in_list(_V3_DEPARTMENTS)}",
+        "salary, department",
+    ),
+    "student": (
+        f"NEW.speciality NOT IN {_in_list(_V3_SPECIALITIES)} OR typeof(NEW.grade) <> 'integer'",
+        f"NEW.speciality NOT IN {_in_list(_V3_SPECIALITIES)}",
+        "grade, speciality",
+    ),
+}
+
+_V3_META = [
+    "CREATE TABLE IF NOT EXISTS __meta__(key TEXT PRIMARY KEY, value TEXT NOT NULL)",
+    # bazele existente trebuie normalizate o dată
+    "INSERT INTO __meta__(key, value) VALUES ('normalize_dirty', '1') ON CONFLICT(key) DO NOTHING",
+    "INSERT INTO __meta__(key, value) VALUES ('normalize_version', '') ON CONFLICT(key) DO NOTHING",
+]
+
+_V3_SQLITE = _V3_META + [
+    f"""CREATE TRIGGER IF NOT EXISTS trg_{t}_dirty_{op.split()[0].lower()} AFTER {op} ON {t}
+        WHEN {cond}
+        BEGIN UPDATE __meta__ SET value='1' WHERE key='normalize_dirty'; END"""
+    for t, (cond, _, cols) in _V3_DIRTY.items()
+    for op in ("INSERT", f"UPDATE OF {cols}")
+]
+
+_V3_POSTGRES = _V3_META + [
+    """CREATE OR REPLACE FUNCTION __mark_normalize_dirty() RETURNS trigger AS $$
+        BEGIN UPDATE __meta__ SET value='1' WHERE key='normalize_dirty'; RETURN NULL; END
+        $$ LANGUAGE plpgsql""",
+] + [
+    f"""CREATE TRIGGER trg_{t}_dirty AFTER INSERT OR UPDATE ON {t}
+        FOR EACH ROW WHEN ({cond}) EXECUTE FUNCTION __mark_normalize_dirty()"""
+    for t, (_, cond, _) in _V3_DIRTY.items()
+]
+
+
+# tabel -> (rol, [(tip agregat, coloana cheie, coloana însumată sau None)])
+_SUMMARY_SPEC = {
+    "teacher": ("Teacher", [("subject", "subject", None), ("department", "department", "salary")]),
+    "assistant": ("Assistant", [("department", "department", "salary")]),
+    "student": ("Student", [("speciality", "speciality", None)]),
+}
+
+_SUMMARY_TABLE = """CREATE TABLE IF NOT EXISTS __summary__(
+    kind TEXT NOT NULL,
+    key TEXT NOT NULL,
+    n INTEGER NOT NULL DEFAULT 0,
+    total REAL NOT NULL DEFAULT 0,
+    PRIMARY KEY(kind, key)
+)"""
+
+# recalculează __summary__ din tabelele de bază, pe coloanele text de la migrarea 4
+_V4_SUMMARY_REBUILD = [
+    "DELETE FROM __summary__",
+] + [
+    f"INSERT INTO __summary__(kind, key, n, total) SELECT 'role', '{role}', COUNT(*), 0 FROM {t}"
+    for t, (role, _) in _SUMMARY_SPEC.items()
+] + [
+    "INSERT INTO __summary__(kind, key, n, total) SELECT 'subject', subject, COUNT(*), 0 FROM teacher GROUP BY subject",
+    "INSERT INTO __summary__(kind, key, n, total) SELECT 'speciality', speciality, COUNT(*), 0 FROM student GROUP BY speciality",
+    """INSERT INTO __summary__(kind, key, n, total)
+        SELECT 'department', department, COUNT(*), SUM(salary) FROM (
+            SELECT department, salary FROM teacher
+            UNION ALL
+            SELECT department, salary FROM assistant
+        ) x GROUP BY department""",
+]
+
+
+def _bump(kind: str, key: str, sign: int, total: str | None) -> str:
+    amount = "0" if total is None else (total if sign > 0 else f"-{total}")
+    return (
+        f"INSERT INTO __summary__(kind, key, n, total) VALUES('{kind}', {key}, {sign}, {amount}) "
+        "ON CONFLICT(kind, key) DO UPDATE SET n = __summary__.n + excluded.n, total = __summary__.total + excluded.total;"
+    )
+
+
+def _bumps(t: str, row: str, sign: int, with_role: bool, spec: dict = _SUMMARY_SPEC, key: str = "{}") -> list[str]:
+    role, aggs = spec[t]
+    out = [_bump("role", f"'{role}'", sign, None)] if with_role else []
+    out += [_bump(kind, key.format(f"{row}.{col}"), sign, None if tot is None else f"{row}.{tot}")
+            for kind, col, tot in aggs]
+    return out
+
+
+def _summary_sqlite(spec: dict = _SUMMARY_SPEC, key: str = "{}", rebuild: list[str] = _V4_SUMMARY_REBUILD) -> list[str]:
+    out = [_SUMMARY_TABLE]
+    for t, (_, aggs) in spec.items():
+        cols = ", ".join(dict.fromkeys(c for _, col, tot in aggs for c in (col, tot) if c))
+        out += [
+            f"CREATE TRIGGER IF NOT EXISTS trg_{t}_summary_insert AFTER INSERT ON {t} BEGIN "
+            + " ".join(_bumps(t, "NEW", 1, True, spec, key)) + " END",
+            f"CREATE TRIGGER IF NOT EXISTS trg_{t}_summary_delete AFTER DELETE ON {t} BEGIN "
+            + " ".join(_bumps(t, "OLD", -1, True, spec, key)) + " END",
+            f"CREATE TRIGGER IF NOT EXISTS trg_{t}_summary_update AFTER UPDATE OF {cols} ON {t} BEGIN "
+            + " ".join(_bumps(t, "OLD", -1, False, spec, key) + _bumps(t, "NEW", 1, False, spec, key)) + " END",
+        ]
+    return out + rebuild
+
+
+def _summary_postgres(spec: dict = _SUMMARY_SPEC, key: str = "{}", rebuild: list[str] = _V4_SUMMARY_REBUILD) -> list[str]:
+    out = [_SUMMARY_TABLE]
+    for t in spec:
+        out += [
+            f"""CREATE OR REPLACE FUNCTION __summary_{t}() RETURNS trigger AS $$
+            BEGIN
+                IF TG_OP = 'INSERT' THEN {" ".join(_bumps(t, "NEW", 1, True, spec, key))}
+                ELSIF TG_OP = 'DELETE' THEN {" ".join(_bumps(t, "OLD", -1, True, spec, key))}
+                ELSE {" ".join(_bumps(t, "OLD", -1, False, spec, key) + _bumps(t, "NEW", 1, False, spec, key))}
+                END IF;
+                RETURN NULL;
+            END
+            $$ LANGUAGE plpgsql""",
+            f"""CREATE TRIGGER trg_{t}_summary AFTER INSERT OR UPDATE OR DELETE ON {t}
+                FOR EACH ROW EXECUTE FUNCTION __summary_{t}()""",
+        ]
+    return out + rebuild
+
+
+# tabel -> (rol, coloana de departament, coloana de specialitate) copiate în search_doc pentru filtre
+_SEARCH_SPEC = {
+    "teacher": ("Teacher", "department", None),
+    "assistant": ("Assistant", "department", None),
+    "student": ("Student", None, "speciality"),
+}
+
+
+# coloanele de filtrare din search_doc au același nume ca în tabelele de bază
+_SEARCH_COLS = ("department", "speciality")
+
+
+def _search_values(t: str, row: str, spec: dict = _SEARCH_SPEC) -> str:
+    role, dep, sp = spec[t]
+    return (f"'{role}', {row}.id, {row}.name, "
+            f"{f'{row}.{dep}' if dep else 'NULL'}, {f'{row}.{sp}' if sp else 'NULL'}")
+
+
+def _search_sync(t: str, spec: dict = _SEARCH_SPEC, doc_cols: tuple = _SEARCH_COLS) -> dict[str, str]:
+    role, dep, sp = spec[t]
+    cols = ", ".join(["id = NEW.id", "name = NEW.name"] + [f"{c} = NEW.{c}" for c in (dep, sp) if c])
+    return {
+        "insert": f"INSERT INTO search_doc(role, id, name, {', '.join(doc_cols)}) VALUES({_search_values(t, 'NEW', spec)});",
+        "delete": f"DELETE FROM search_doc WHERE role = '{role}' AND id = OLD.id;",
+        "update": f"UPDATE search_doc SET {cols} WHERE role = '{role}' AND id = OLD.id;",
+    }
+
+
+def _search_backfill(spec: dict = _SEARCH_SPEC, doc_cols: tuple = _SEARCH_COLS) -> list[str]:
+    return [
+        f"INSERT INTO search_doc(role, id, name, {', '.join(doc_cols)}) SELECT {_search_values(t, t, spec)} FROM {t}"
+        for t in spec
+    ]
+
+
+def _search_sqlite(spec: dict = _SEARCH_SPEC, doc_cols: tuple = _SEARCH_COLS, col_type: str = "TEXT") -> list[str]:
+    dep_col, spec_col = doc_cols
+    out = [
+        f"""CREATE TABLE IF NOT EXISTS search_doc(
+            docid INTEGER PRIMARY KEY,
+            role TEXT NOT NULL,
+            id TEXT NOT NULL,
+            name TEXT NOT NULL,
+            {dep_col} {col_type},
+            {spec_col} {col_type},
+            UNIQUE(role, id)
+        )""",
+        # prefix pe cuvinte (fără diacritice) și trigrame pentru potriviri aproximative
+        """CREATE VIRTUAL TABLE IF NOT EXISTS person_fts USING fts5(
+            name, content='search_doc', content_rowid='docid',
+            tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+        )""",
+        """CREATE VIRTUAL TABLE IF NOT EXISTS person_trgm USING fts5(
+            name, content='search_doc', content_rowid='docid', tokenize='trigram'
+        )""",
+    ]
+    for fts in ("person_fts", "person_trgm"):
+        out += [
+            f"""CREATE TRIGGER IF NOT EXISTS trg_search_doc_{fts}_insert AFTER INSERT ON search_doc BEGIN
+                INSERT INTO {fts}(rowid, name) VALUES(NEW.docid, NEW.name); END""",
+            f"""CREATE TRIGGER IF NOT EXISTS trg_search_doc_{fts}_delete AFTER DELETE ON search_doc BEGIN
+                INSERT INTO {fts}({fts}, rowid, name) VALUES('delete', OLD.docid, OLD.name); END""",
+            f"""CREATE TRIGGER IF NOT EXISTS trg_search_doc_{fts}_update AFTER UPDATE OF name ON search_doc BEGIN
+                INSERT INTO {fts}({fts}, rowid, name) VALUES('delete', OLD.docid, OLD.name);
+                INSERT INTO {fts}(rowid, name) VALUES(NEW.docid, NEW.name); END""",
+        ]
+    for t, (_, dep, sp) in spec.items():
+        sync = _search_sync(t, spec, doc_cols)
+        cols = ", ".join(["id", "name"] + [c for c in (dep, sp) if c])
+        out += [
+            f"CREATE TRIGGER IF NOT EXISTS trg_{t}_search_insert AFTER INSERT ON {t} BEGIN {sync['insert']} END",
+            f"CREATE TRIGGER IF NOT EXISTS trg_{t}_search_delete AFTER DELETE ON {t} BEGIN {sync['delete']} END",
+            f"CREATE TRIGGER IF NOT EXISTS trg_{t}_search_update AFTER UPDATE OF {cols} ON {t} BEGIN {sync['update']} END",
+        ]
+    return out + [
+        f"CREATE INDEX IF NOT EXISTS idx_search_doc_department ON search_doc({dep_col})",
+        f"CREATE INDEX IF NOT EXISTS idx_search_doc_speciality ON search_doc({spec_col})",
+    ] + _search_backfill(spec, doc_cols)
+
+
+def _search_postgres(spec: dict = _SEARCH_SPEC, doc_cols: tuple = _SEARCH_COLS, col_type: str = "TEXT") -> list[str]:
+    dep_col, spec_col = doc_cols
+    out = [
+        "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+        f"""CREATE TABLE IF NOT EXISTS search_doc(
+            docid BIGINT GENERATED ALWAYS AS IDENTITY PRIMARY KEY,
+            role TEXT NOT NULL,
+            id TEXT NOT NULL,
+            name TEXT NOT NULL,
+            {dep_col} {col_type},
+            {spec_col} {col_type},
+            tsv tsvector GENERATED ALWAYS AS (to_tsvector('simple', name)) STORED,
+            UNIQUE(role, id)
+        )""",
+        "CREATE INDEX IF NOT EXISTS idx_search_doc_tsv ON search_doc USING GIN(tsv)",
+        "CREATE INDEX IF NOT EXISTS idx_search_doc_trgm ON search_doc USING GIN(name gin_trgm_ops)",
+        f"CREATE INDEX IF NOT EXISTS idx_search_doc_department ON search_doc({dep_col})",
+        f"CREATE INDEX IF NOT EXISTS idx_search_doc_speciality ON search_doc({spec_col})",
+    ]
+    for t in spec:
+        sync = _search_sync(t, spec, doc_cols)
+        out += [
+            f"""CREATE OR REPLACE FUNCTION __search_{t}() RETURNS trigger AS $$
+            BEGIN
+                IF TG_OP = 'INSERT' THEN {sync['insert']}
+                ELSIF TG_OP = 'DELETE' THEN {sync['delete']}
+                ELSE {sync['update']}
+                END IF;
+                RETURN NULL;
+            END
+            $$ LANGUAGE plpgsql""",
+            f"""CREATE TRIGGER trg_{t}_search AFTER INSERT OR UPDATE OR DELETE ON {t}
+                FOR EACH ROW EXECUTE FUNCTION __search_{t}()""",
+        ]
+    return out + _search_backfill(spec, doc_cols)
+
+
+_CHANGES_ROLES = {"teacher": "Teacher", "assistant": "Assistant", "student": "Student"}
+
+
+def _change(role: str, row: str, op: str) -> str:
+    return f"INSERT INTO __changes__(role, id, op) VALUES('{role}', {row}.id, '{op}');"
+
+
+def _change_id_moved(role: str) -> str:
+    # schimbarea de id apare ca ștergerea id-ului vechi
+    return f"INSERT INTO __changes__(role, id, op) SELECT '{role}', OLD.id, 'D' WHERE OLD.id <> NEW.id;"
+
+
+def _changes_sqlite() -> list[str]:
+    out = [
+        """CREATE TABLE IF NOT EXISTS __changes__(
+            version INTEGER PRIMARY KEY AUTOINCREMENT,
+            role TEXT NOT NULL,
+            id TEXT NOT NULL,
+            op TEXT NOT NULL
+        )""",
+    ]
+    for t, role in _CHANGES_ROLES.items():
+        out += [
+            f"CREATE TRIGGER IF NOT EXISTS trg_{t}_changes_insert AFTER INSERT ON {t} BEGIN {_change(role, 'NEW', 'I')} END",
+            f"CREATE TRIGGER IF NOT EXISTS trg_{t}_changes_delete AFTER DELETE ON {t} BEGIN {_change(role, 'OLD', 'D')} END",
+            f"CREATE TRIGGER IF NOT EXISTS trg_{t}_changes_update AFTER UPDATE ON {t} BEGIN "
+            f"{_change_id_moved(role)} {_change(role, 'NEW', 'U')} END",
+        ]
+    return out
+
+
+def _changes_postgres() -> list[str]:
+    out = [
+        """CREATE TABLE IF NOT EXISTS __changes__(
+            version BIGINT GENERATED ALWAYS AS IDENTITY PRIMARY KEY,
+            role TEXT NOT NULL,
+            id TEXT NOT NULL,
+            op TEXT NOT NULL
+        )""",
+    ]
+    for t, role in _CHANGES_ROLES.items():
+        out += [
+            # lock-ul ține ordinea versiunilor = ordinea commit-urilor, altfel un cititor ar putea sări
+            # peste o versiune mai mică comisă mai târziu
+            f"""CREATE OR REPLACE FUNCTION __changes_{t}() RETURNS trigger AS $$
+            BEGIN
+                PERFORM pg_advisory_xact_lock(hashtext('__changes__'));
+                IF TG_OP = 'INSERT' THEN {_change(role, 'NEW', 'I')}
+                ELSIF TG_OP = 'DELETE' THEN {_change(role, 'OLD', 'D')}
+                ELSE {_change_id_moved(role)} {_change(role, 'NEW', 'U')}
+                END IF;
+                RETURN NULL;
+            END
+            $$ LANGUAGE plpgsql""",
+            f"""CREATE TRIGGER trg_{t}_changes AFTER INSERT OR UPDATE OR DELETE ON {t}
+                FOR EACH ROW EXECUTE FUNCTION __changes_{t}()""",
+        ]
+    return out
+
+
+# ---------- migrarea 7: categorii ca și coduri întregi în tabele de lookup ----------
+# cod = poziția în tuplu, aceeași ca în ALLOWED_* din model/caracteristica.py
+_V7_LOOKUPS = {
+    "department": (_V3_DEPARTMENTS, {"hr": "Human Resources", "fin": "Finance", "eng": "Engineering",
+                                     "it": "Engineering", "mkt": "Marketing"}),
+    "subject": (_V3_SUBJECTS, {"math": "Mathematics", "phys": "Physics", "chem": "Chemistry", "bio": "Biology"}),
+    "speciality": (_V3_SPECIALITIES, {"cs": "Computer Science", "math": "Mathematics", "phys": "Physics",
+                                      "eng": "Engineering", "it": "Engineering",
+                                      "mathematatics": "Mathematics"}),
+}
+
+# tabel -> (coloana numerică, [(coloana text veche, coloana cod, tabelul de lookup)])
+_V7_TABLES = {
+    "teacher": ("salary REAL NOT NULL", [("department", "department_id", "department"), ("subject", "subject_id", "subject")]),
+    "assistant": ("salary REAL NOT NULL", [("department", "department_id", "department")]),
+    "student": ("grade INTEGER NOT NULL", [("speciality", "speciality_id", "speciality")]),
+}
+
+_V7_INDEXES = [
+    "CREATE INDEX IF NOT EXISTS idx_teacher_name ON teacher(name, id)",
+    "CREATE INDEX IF NOT EXISTS idx_teacher_salary ON teacher(salary, id)",
+    "CREATE INDEX IF NOT EXISTS idx_teacher_department_salary ON teacher(department_id, salary)",
+    "CREATE INDEX IF NOT EXISTS idx_teacher_subject ON teacher(subject_id)",
+    "CREATE INDEX IF NOT EXISTS idx_assistant_name ON assistant(name, id)",
+    "CREATE INDEX IF NOT EXISTS idx_assistant_salary ON assistant(salary, id)",
+    "CREATE INDEX IF NOT EXISTS idx_assistant_department_salary ON assistant(department_id, salary)",
+    "CREATE INDEX IF NOT EXISTS idx_student_name ON student(name, id)",
+    "CREATE INDEX IF NOT EXISTS idx_student_grade ON student(grade, id)",
+    "CREATE INDEX IF NOT EXISTS idx_student_speciality ON student(speciality_id)",
+]
+
+_V7_SUMMARY_SPEC = {
+    "teacher": ("Teacher", [("subject", "subject_id", None), ("department", "department_id", "salary")]),
+    "assistant": ("Assistant", [("department", "department_id", "salary")]),
+    "student": ("Student", [("speciality", "speciality_id", None)]),
+}
+_V7_SUMMARY_KEY = "CAST({} AS TEXT)"
+
+_V7_SEARCH_SPEC = {
+    "teacher": ("Teacher", "department_id", None),
+    "assistant": ("Assistant", "department_id", None),
+    "student": ("Student", None, "speciality_id"),
+}
+_V7_SEARCH_COLS = ("department_id", "speciality_id")
+
+# recalculează __summary__ din tabelele de bază (migrarea 7 și SchoolRepository.rebuild_summaries);
+# cheile categoriilor sunt codurile, ca text
+SUMMARY_REBUILD = [
+    "DELETE FROM __summary__",
+] + [
+    f"INSERT INTO __summary__(kind, key, n, total) SELECT 'role', '{role}', COUNT(*), 0 FROM {t}"
+    for t, (role, _) in _V7_SUMMARY_SPEC.items()
+] + [
+    "INSERT INTO __summary__(kind, key, n, total) "
+    "SELECT 'subject', CAST(subject_id AS TEXT), COUNT(*), 0 FROM teacher GROUP BY subject_id",
+    "INSERT INTO __summary__(kind, key, n, total) "
+    "SELECT 'speciality', CAST(speciality_id AS TEXT), COUNT(*), 0 FROM student GROUP BY speciality_id",
+    """INSERT INTO __summary__(kind, key, n, total)
+        SELECT 'department', CAST(department_id AS TEXT), COUNT(*), SUM(salary) FROM (
+            SELECT department_id, salary FROM teacher
+            UNION ALL
+            SELECT department_id, salary FROM assistant
+        ) x GROUP BY department_id""",
+]
+
+
+def _v7_lookup_tables(code_type: str) -> list[str]:
+    out = []
+    for lookup, (values, _) in _V7_LOOKUPS.items():
+        rows = ", ".join(f"({i}, '{v}')" for i, v in enumerate(values))
+        out += [
+            f"CREATE TABLE IF NOT EXISTS {lookup}(id {code_type} PRIMARY KEY, name TEXT NOT NULL UNIQUE)",
+            f"INSERT INTO {lookup}(id, name) VALUES {rows} ON CONFLICT(id) DO NOTHING",
+        ]
+    return out
+
+
+def _v7_encode(col: str, lookup: str) -> str:
+    # aceleași reguli ca modelul: nume permis (fără diferențe de majuscule/spații) sau alias, altfel Unknown
+    values, aliases = _V7_LOOKUPS[lookup]
+    codes = {v.casefold(): i for i, v in enumerate(values)}
+    codes.update({a: values.index(v) for a, v in aliases.items()})
+    whens = " ".join(f"WHEN '{k}' THEN {c}" for k, c in codes.items())
+    return f"(CASE lower(trim({col})) {whens} ELSE {values.index('Unknown')} END)"
+
+
+_V7_DIRTY_SQLITE = [
+    # categoriile nu mai pot fi nenormalizate (cheile străine le validează); rămân numerele salvate ca text
+    f"""CREATE TRIGGER IF NOT EXISTS trg_{t}_dirty_{op.split()[0].lower()} AFTER {op} ON {t}
+        WHEN typeof(NEW.{col}) <> '{typ}'
+        BEGIN UPDATE __meta__ SET value='1' WHERE key='normalize_dirty'; END"""
+    for t, col, typ in (("teacher", "salary", "real"), ("assistant", "salary", "real"), ("student", "grade", "integer"))
+    for op in ("INSERT", f"UPDATE OF {col}")
+]
+
+
+def _v7_sqlite() -> list[str]:
+    out = _v7_lookup_tables("INTEGER")
+    for t, (number, cats) in _V7_TABLES.items():
+        # SQLite nu poate schimba tipul unei coloane: tabel nou, copiere, redenumire;
+        # indecșii și triggerele vechi dispar odată cu tabelul
+        fks = ", ".join(f"{code} INTEGER NOT NULL REFERENCES {lookup}(id)" for _, code, lookup in cats)
+        codes = ", ".join(code for _, code, _ in cats)
+        encoded = ", ".join(_v7_encode(old, lookup) for old, _, lookup in cats)
+        number_col = number.split()[0]
+        out += [
+            f"CREATE TABLE {t}__v7(id TEXT PRIMARY KEY, name TEXT NOT NULL, {number}, {fks})",
+            f"INSERT INTO {t}__v7(id, name, {number_col}, {codes}) SELECT id, name, {number_col}, {encoded} FROM {t}",
+            f"DROP TABLE {t}",
+            f"ALTER TABLE {t}__v7 RENAME TO {t}",
+        ]
+    out += [
+        # search_doc și indecșii FTS se reconstruiesc pe coduri (după tabele: RENAME verifică triggerele lor)
+        "DROP TABLE IF EXISTS person_fts",
+        "DROP TABLE IF EXISTS person_trgm",
+        "DROP TABLE IF EXISTS search_doc",
+    ]
+    return (out + _V7_INDEXES + _V7_DIRTY_SQLITE
+            + _summary_sqlite(_V7_SUMMARY_SPEC, _V7_SUMMARY_KEY, SUMMARY_REBUILD)
+            + _search_sqlite(_V7_SEARCH_SPEC, _V7_SEARCH_COLS, "INTEGER")
+            + _changes_sqlite() + ["ANALYZE"])
+
+
+def _v7_postgres() -> list[str]:
+    out = _v7_lookup_tables("SMALLINT")
+    for t, (_, cats) in _V7_TABLES.items():
+        # triggerele se scot pe durata conversiei, altfel UPDATE-ul ar umple __changes__ și __summary__
+        out += [f"DROP TRIGGER IF EXISTS trg_{t}_{kind} ON {t}" for kind in ("dirty", "summary", "search", "changes")]
+        out += [f"ALTER TABLE {t} ADD COLUMN {code} SMALLINT REFERENCES {lookup}(id)" for _, code, lookup in cats]
+        out += [
+            f"UPDATE {t} SET " + ", ".join(f"{code} = {_v7_encode(old, lookup)}" for old, code, lookup in cats),
+        ]
+        out += [f"ALTER TABLE {t} ALTER COLUMN {code} SET NOT NULL" for _, code, _ in cats]
+        # DROP COLUMN ia cu el și indecșii pe coloana text
+        out += [f"ALTER TABLE {t} DROP COLUMN {old}" for old, _, _ in cats]
+    out += _V7_INDEXES + [
+        "DROP FUNCTION IF EXISTS __mark_normalize_dirty()",
+        "TRUNCATE search_doc",
+        "ALTER TABLE search_doc DROP COLUMN department, DROP COLUMN speciality, "
+        "ADD COLUMN department_id SMALLINT, ADD COLUMN speciality_id SMALLINT",
+    ]
+    return (out + _summary_postgres(_V7_SUMMARY_SPEC, _V7_SUMMARY_KEY, SUMMARY_REBUILD)
+            + _search_postgres(_V7_SEARCH_SPEC, _V7_SEARCH_COLS, "SMALLINT")
+            + _changes_postgres() + ["ANALYZE"])
+
+
+# ordinea "Name" nu ține cont de majuscule: SQLite NOCASE (pliază doar ASCII), Postgres lower()
+_V8_TABLES = ("teacher", "assistant", "student")
+
+# ordinea totală a paginilor (cheie, nume pliat ASCII, id) - vezi repository/school_repository.py;
+# în Postgres plierea e translate() pe A-Z cu COLLATE "C", identică cu cea din Python
+_V9_PG_NAME = "(translate(name, 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz')) COLLATE \"C\""
+_V9_LEADS = {"teacher": "salary", "assistant": "salary", "student": "grade"}
+
+
+MIGRATIONS: list[Migration] = [
+    # v1 era stub-ul inițial; bazele existente sunt deja la v1
+    Migration(1, "initial schema", []),
+    Migration(
+        2,
+        "secondary indexes for name/grade/salary sorts and category group-bys",
+        [
+            "CREATE INDEX IF NOT EXISTS idx_teacher_name ON teacher(name, id)",
+            "CREATE INDEX IF NOT EXISTS idx_teacher_salary ON teacher(salary, id)",
+            "CREATE INDEX IF NOT EXISTS idx_teacher_department_salary ON teacher(department, salary)",
+            "CREATE INDEX IF NOT EXISTS idx_teacher_subject ON teacher(subject)",
+            "CREATE INDEX IF NOT EXISTS idx_assistant_name ON assistant(name, id)",
+            "CREATE INDEX IF NOT EXISTS idx_assistant_salary ON assistant(salary, id)",
+            "CREATE INDEX IF NOT EXISTS idx_assistant_department_salary ON assistant(department, salary)",
+            "CREATE INDEX IF NOT EXISTS idx_student_name ON student(name, id)",
+            "CREATE INDEX IF NOT EXISTS idx_student_grade ON student(grade, id)",
+            "CREATE INDEX IF NOT EXISTS idx_student_speciality ON student(speciality)",
+            "ANALYZE",
+        ],
+    ),
+    Migration(
+        3,
+        "__meta__ table and triggers flagging rows that need normalization",
+        _V3_SQLITE,
+        _V3_POSTGRES,
+    ),
+    Migration(
+        4,
+        "__summary__ counters kept current by triggers for the dashboard charts",
+        _summary_sqlite(),
+        _summary_postgres(),
+    ),
+    Migration(
+        5,
+        "search_doc with FTS5 (SQLite) / tsvector + pg_trgm (Postgres) indexes for people search",
+        _search_sqlite(),
+        _search_postgres(),
+    ),
+    Migration(
+        6,
+        "__changes__ log written by triggers for incremental sync",
+        _changes_sqlite(),
+        _changes_postgres(),
+    ),
+    Migration(
+        7,
+        "lookup tables for department/subject/speciality; base tables rebuilt with integer codes",
+        _v7_sqlite(),
+        _v7_postgres(),
+    ),
+    Migration(
+        8,
+        "case-insensitive (name, id) indexes for Name-sorted pages",
+        [f"CREATE INDEX IF NOT EXISTS idx_{t}_name_nocase ON {t}(name COLLATE NOCASE, id)" for t in _V8_TABLES]
+        + ["ANALYZE"],
+        [f"CREATE INDEX IF NOT EXISTS idx_{t}_name_lower ON {t}(lower(name), id)" for t in _V8_TABLES]
+        + ["ANALYZE"],
+    ),
+    Migration(
+        9,
+        "indexes for the total page order (grade/salary descending, then folded name, id)",
+        [f"CREATE INDEX IF NOT EXISTS idx_{t}_{c}_order ON {t}(-{c}, name COLLATE NOCASE, id)"
+         for t, c in _V9_LEADS.items()]
+        + ["ANALYZE"],
+        [f"DROP INDEX IF EXISTS idx_{t}_name_lower" for t in _V8_TABLES]
+        + [f'CREATE INDEX IF NOT EXISTS idx_{t}_name_fold ON {t}({_V9_PG_NAME}, id COLLATE "C")' for t in _V8_TABLES]
+        + [f'CREATE INDEX IF NOT EXISTS idx_{t}_{c}_order ON {t}((-{c}), {_V9_PG_NAME}, id COLLATE "C")'
+           for t, c in _V9_LEADS.items()]
+        + ["ANALYZE"],
+    ),
+]
+
+
+def latest_version() -> int:
+    return max((m.version for m in MIGRATIONS), default=0)
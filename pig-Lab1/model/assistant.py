@@ -1,5 +1,7 @@
 from model.caracteristica import Employee
 
 class Assistant(Employee):  # Assistant inherits from Employee
+    __slots__ = ()
+
     def __init__(self, name, id, salary, department):
         super().__init__(name, id, salary, department)
\ No newline at end of file
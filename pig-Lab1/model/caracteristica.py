@@ -1,75 +1,159 @@
+import operator
+from functools import lru_cache
+from types import MappingProxyType
+
+# Tabele de lookup la nivel de modul, read-only: construite o dată, partajate de toate instanțele.
+_DEPARTMENT_ALIASES = MappingProxyType({
+    "hr": "Human Resources",
+    "human resources": "Human Resources",
+    "fin": "Finance",
+    "finance": "Finance",
+    "eng": "Engineering",
+    "engineering": "Engineering",
+    "it": "Engineering",
+    "mkt": "Marketing",
+    "marketing": "Marketing",
+})
+
+_SUBJECT_ALIASES = MappingProxyType({
+    "math": "Mathematics", "mathematics": "Mathematics",
+    "phys": "Physics", "physics": "Physics",
+    "chem": "Chemistry", "chemistry": "Chemistry",
+    "bio": "Biology", "biology": "Biology",
+})
+
+_SPECIALITY_ALIASES = MappingProxyType({
+    "cs": "Computer Science", "computer science": "Computer Science",
+    "math": "Mathematics", "mathematics": "Mathematics",
+    # grafia veche din tabela de alias-uri rămâne acceptată, dar duce la numele corect
+    "mathematatics": "Mathematics",
+    "phys": "Physics", "physics": "Physics",
+    "eng": "Engineering", "engineering": "Engineering", "it": "Engineering",
+})
+
+# valorile brute se repetă mult (generator, import, formulare): memoizăm rezultatul
+_NORMALIZE_CACHE = 4096
+
+
+def _normalize(value: str, aliases, allowed: frozenset) -> str:
+    s = (value or "").strip()
+    if not s:
+        return "Unknown"
+    v = aliases.get(s.casefold(), s.title())
+    return v if v in allowed else "Unknown"
+
+
+def _code(value, codes, normalize, allowed: tuple, what: str) -> int:
+    # None/"" rămân "Unknown" ca înainte; codurile întregi trec neschimbate; restul e o eroare clară
+    if value is None or isinstance(value, str):
+        return codes[normalize(value)]
+    if not isinstance(value, bool):
+        try:
+            code = operator.index(value)  # int, dar și numpy.int64 din backend-ul columnar
+        except TypeError:
+            code = None
+        if code is not None and 0 <= code < len(allowed):
+            return code
+    raise ValueError(f"Invalid {what}: {value!r}")
+
+
+def _codes(allowed: tuple) -> MappingProxyType:
+    return MappingProxyType({v: i for i, v in enumerate(allowed)})
+
+
+# Categoriile se păstrează ca indici în ALLOWED_* (aceleași coduri ca tabelele de lookup din DB,
+# migrarea 7); valori noi se adaugă doar la coadă, împreună cu o migrare care le inserează.
 class Departament:
+    __slots__ = ()
     ALLOWED_DEPARTMENTS = ("Human Resources", "Finance", "Engineering", "Marketing", "Unknown")
+    ALIASES = _DEPARTMENT_ALIASES
 
     @staticmethod
+    @lru_cache(maxsize=_NORMALIZE_CACHE)
     def _normalize_department(value: str) -> str:
-        s = (value or "").strip()
-        if not s:
-            return "Unknown"
-        k = s.casefold()
-        alias = {
-            "hr": "Human Resources",
-            "human resources": "Human Resources",
-            "fin": "Finance",
-            "finance": "Finance",
-            "eng": "Engineering",
-            "engineering": "Engineering",
-            "it": "Engineering",
-            "mkt": "Marketing",
-            "marketing": "Marketing",
-        }
-        v = alias.get(k, s.title())
-        return v if v in Departament.ALLOWED_DEPARTMENTS else "Unknown"
-
-    def __init__(self, department: str):
-        self.department = self._normalize_department(department)
+        return _normalize(value, _DEPARTMENT_ALIASES, _ALLOWED_DEPARTMENTS)
+
+    @staticmethod
+    def department_code(value) -> int:
+        """Code of a raw department name; codes pass through unchanged, other types raise ValueError."""
+        return _code(value, _DEPARTMENT_CODES, Departament._normalize_department, Departament.ALLOWED_DEPARTMENTS, "department")
+
+    @property
+    def department(self) -> str:
+        return Departament.ALLOWED_DEPARTMENTS[self.department_id]
+
+    @department.setter
+    def department(self, value) -> None:
+        self.department_id = Departament.department_code(value)
+
+    def __init__(self, department):
+        self.department = department
 
 
 class Subject:
+    __slots__ = ()
     ALLOWED_SUBJECTS = ("Mathematics", "Physics", "Chemistry", "Biology", "Unknown")
+    ALIASES = _SUBJECT_ALIASES
 
     @staticmethod
+    @lru_cache(maxsize=_NORMALIZE_CACHE)
     def _normalize_subject(value: str) -> str:
-        s = (value or "").strip()
-        if not s:
-            return "Unknown"
-        k = s.casefold()
-        alias = {
-            "math": "Mathematics", "mathematics": "Mathematics",
-            "phys": "Physics", "physics": "Physics",
-            "chem": "Chemistry", "chemistry": "Chemistry",
-            "bio": "Biology", "biology": "Biology",
-        }
-        v = alias.get(k, s.title())
-        return v if v in Subject.ALLOWED_SUBJECTS else "Unknown"
-
-    def __init__(self, subject: str):
-        self.subject = self._normalize_subject(subject)
+        return _normalize(value, _SUBJECT_ALIASES, _ALLOWED_SUBJECTS)
+
+    @staticmethod
+    def subject_code(value) -> int:
+        return _code(value, _SUBJECT_CODES, Subject._normalize_subject, Subject.ALLOWED_SUBJECTS, "subject")
+
+    @property
+    def subject(self) -> str:
+        return Subject.ALLOWED_SUBJECTS[self.subject_id]
+
+    @subject.setter
+    def subject(self, value) -> None:
+        self.subject_id = Subject.subject_code(value)
+
+    def __init__(self, subject):
+        self.subject = subject
 
 
 class Speciality:
+    __slots__ = ()
     ALLOWED_SPECIALTIES = ("Computer Science", "Mathematics", "Physics", "Engineering", "Unknown")
+    ALIASES = _SPECIALITY_ALIASES
 
     @staticmethod
+    @lru_cache(maxsize=_NORMALIZE_CACHE)
     def _normalize_speciality(value: str) -> str:
-        s = (value or "").strip()
-        if not s:
-            return "Unknown"
-        k = s.casefold()
-        alias = {
-            "cs": "Computer Science", "computer science": "Computer Science",
-            "math": "Mathematics", "mathematics": "Mathematatics",
-            "phys": "Physics", "physics": "Physics",
-            "eng": "Engineering", "engineering": "Engineering", "it": "Engineering",
-        }
-        v = alias.get(k, s.title())
-        return v if v in Speciality.ALLOWED_SPECIALTIES else "Unknown"
-
-    def __init__(self, speciality: str):
-        self.speciality = self._normalize_speciality(speciality)
+        return _normalize(value, _SPECIALITY_ALIASES, _ALLOWED_SPECIALTIES)
+
+    @staticmethod
+    def speciality_code(value) -> int:
+        return _code(value, _SPECIALITY_CODES, Speciality._normalize_speciality, Speciality.ALLOWED_SPECIALTIES, "speciality")
+
+    @property
+    def speciality(self) -> str:
+        return Speciality.ALLOWED_SPECIALTIES[self.speciality_id]
+
+    @speciality.setter
+    def speciality(self, value) -> None:
+        self.speciality_id = Speciality.speciality_code(value)
+
+    def __init__(self, speciality):
+        self.speciality = speciality
+
+
+_ALLOWED_DEPARTMENTS = frozenset(Departament.ALLOWED_DEPARTMENTS)
+_ALLOWED_SUBJECTS = frozenset(Subject.ALLOWED_SUBJECTS)
+_ALLOWED_SPECIALTIES = frozenset(Speciality.ALLOWED_SPECIALTIES)
+_DEPARTMENT_CODES = _codes(Departament.ALLOWED_DEPARTMENTS)
+_SUBJECT_CODES = _codes(Subject.ALLOWED_SUBJECTS)
+_SPECIALITY_CODES = _codes(Speciality.ALLOWED_SPECIALTIES)
 
 
 class Employee(Departament):
+    # mixin-urile au __slots__ goale, deci atributele se declară în clasele concrete
+    __slots__ = ("name", "id", "salary", "department_id")
+
     def __init__(self, name, id, salary, department):
         self.name = name
         self.id = id
@@ -0,0 +1,90 @@
+# model/columnar_stats.py
+"""Columnar (NumPy) backend for StatsModel.
+
+The role lists are walked once: the models' category codes become small
+integer arrays and salaries/grades dense arrays; every statistic after that is a vectorized
+group-by (bincount / stable argsort). Results match the loop-based
+StatsModel methods, including their handling of unparsable values.
+"""
+from operator import attrgetter
+from typing import Dict, List, Sequence, Tuple
+import numpy as np
+from model.student import Student
+from model.teacher import Teacher
+from model.assistant import Assistant
+from model.caracteristica import Departament, Subject, Speciality
+
+
+def _codes(objs: list, attr: str, labels: tuple) -> Tuple[np.ndarray, List[str]]:
+    # codurile vin gata din model: fără dicționar de codificare, doar un array compact
+    dtype = np.min_scalar_type(len(labels) - 1)
+    return np.fromiter(map(attrgetter(attr), objs), dtype=dtype, count=len(objs)), list(labels)
+
+
+def _parse(values: Sequence, cast) -> Tuple[np.ndarray, np.ndarray]:
+    # aceeași conversie ca în StatsModel; invalidele devin 0 cu ok=False
+    dtype = np.float64 if cast is float else np.int64
+    try:
+        # cazul obișnuit (valori din DB): o singură trecere în C, fără listă intermediară
+        return np.fromiter(map(cast, values), dtype=dtype, count=len(values)), np.ones(len(values), dtype=bool)
+    except (TypeError, ValueError, OverflowError):
+        pass
+    out, ok = np.zeros(len(values), dtype=dtype), np.ones(len(values), dtype=bool)
+    for i, v in enumerate(values):
+        try:
+            out[i] = cast(v)
+        except (TypeError, ValueError, OverflowError):
+            ok[i] = False
+    return out, ok
+
+
+def _ranked(labels: List[str], counts: np.ndarray) -> List[Tuple[str, int]]:
+    pairs = [(labels[i], int(c)) for i, c in enumerate(counts.tolist()) if c]
+    return sorted(pairs, key=lambda x: (-x[1], x[0]))
+
+
+class ColumnarStats:
+    def __init__(self, data: Dict[str, List[object]]):
+        self._roles = [(role, len(items)) for role, items in data.items()]
+
+        employees = [o for role in ("Teacher", "Assistant") for o in data.get(role, [])
+                     if isinstance(o, (Teacher, Assistant))]
+        self._dep, self._dep_labels = _codes(employees, "department_id", Departament.ALLOWED_DEPARTMENTS)
+        self._salary, self._salary_ok = _parse(list(map(attrgetter("salary"), employees)), float)
+
+        teachers = [o for o in data.get("Teacher", []) if isinstance(o, Teacher)]
+        self._subj, self._subj_labels = _codes(teachers, "subject_id", Subject.ALLOWED_SUBJECTS)
+
+        students = [o for o in data.get("Student", []) if isinstance(o, Student)]
+        self._spec, self._spec_labels = _codes(students, "speciality_id", Speciality.ALLOWED_SPECIALTIES)
+        self._grade, self._grade_ok = _parse(list(map(attrgetter("grade"), students)), int)
+
+    def roles_distribution(self) -> List[Tuple[str, int]]:
+        return list(self._roles)
+
+    def students_by_speciality(self) -> List[Tuple[str, int]]:
+        return _ranked(self._spec_labels, np.bincount(self._spec, minlength=len(self._spec_labels)))
+
+    def teachers_by_subject(self) -> List[Tuple[str, int]]:
+        return _ranked(self._subj_labels, np.bincount(self._subj, minlength=len(self._subj_labels)))
+
+    def avg_salary_by_department(self) -> List[Tuple[str, float]]:
+        n = len(self._dep_labels)
+        # bincount adună în ordinea intrărilor, deci sumele sunt identice cu bucla Python
+        sums = np.bincount(self._dep, weights=self._salary, minlength=n)
+        counts = np.bincount(self._dep, minlength=n)
+        result = [(self._dep_labels[i], s / c) for i, (s, c) in enumerate(zip(sums.tolist(), counts.tolist())) if c]
+        return sorted(result, key=lambda x: (-x[1], x[0]))
+
+    def student_grades_series(self) -> List[int]:
+        return self._grade[self._grade_ok].tolist()
+
+    def salaries_series(self) -> List[float]:
+        return self._salary[self._salary_ok].tolist()
+
+    def salary_by_department_groups(self) -> List[Tuple[str, List[float]]]:
+        order = np.argsort(self._dep, kind="stable")
+        counts = np.bincount(self._dep, minlength=len(self._dep_labels))
+        parts = np.split(self._salary[order], np.cumsum(counts)[:-1]) if len(order) else []
+        groups = [(self._dep_labels[i], p.tolist()) for i, p in enumerate(parts) if len(p)]
+        return sorted(groups, key=lambda x: x[0])
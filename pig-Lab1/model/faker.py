@@ -1,11 +1,22 @@
 # model/faker.py
-import random
+"""Synthetic people, generated as a stream of row blocks.
+
+Each role is cut into fixed-size blocks; block i of a role gets ids
+`start_id + i * block_size ...` and its own seed derived from (seed, role, i).
+The output therefore depends only on (counts, seed, distributions,
+block_size, start_id) - not on how many shards or processes produce the
+blocks - so perf fixtures are reproducible at any scale. Rows come out as tuples in the
+repository's column order (see model/records.py), ready for the bulk path.
+"""
+import hashlib
 import itertools
-from typing import Dict, List
+import math
+import random
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Sequence, Tuple
 from model.teacher import Teacher
 from model.student import Student
 from model.assistant import Assistant
-from model.caracteristica import Subject, Speciality  # folosește listele permise
+from model.caracteristica import Departament, Subject, Speciality  # folosește listele permise
 
 _FIRST = [
     "Alex", "Mara", "Elena", "Daria", "Tudor", "Vlad", "Mihai", "Irina",
@@ -18,64 +29,224 @@ _LAST = [
 
 _DEPARTMENTS = ["Human Resources", "Finance", "Engineering", "Marketing"]
 
-_SUBJECTS = list(getattr(Subject, "ALLOWED_SUBJECTS", ("Mathematics", "Physics", "Chemistry", "Biology")))
-_SPECIALITIES = list(getattr(Speciality, "ALLOWED_SPECIALTIES", ("Computer Science", "Mathematics", "Physics", "Engineering")))
-
-_id_counter = itertools.count(10001)
-
-def _name(rand: random.Random) -> str:
-    return f"{rand.choice(_FIRST)} {rand.choice(_LAST)}"
-
-def _next_id(prefix: str) -> str:
-    return f"{prefix}-{next(_id_counter)}"
-
-def make_teachers(n: int, rand: random.Random) -> List[Teacher]:
-    out = []
-    for _ in range(max(0, n)):
-        subj = rand.choice(_SUBJECTS)
-        out.append(
-            Teacher(
-                _name(rand),
-                _next_id("T"),
-                str(rand.randint(900, 2500)),
-                rand.choice(_DEPARTMENTS),
-                subj,
-            )
-        )
-    return out
+# "Unknown" e doar substitutul pentru valori invalide, nu o categorie de generat
+_SUBJECTS = [s for s in getattr(Subject, "ALLOWED_SUBJECTS", ("Mathematics", "Physics", "Chemistry", "Biology")) if s != "Unknown"]
+_SPECIALITIES = [s for s in getattr(Speciality, "ALLOWED_SPECIALTIES", ("Computer Science", "Mathematics", "Physics", "Engineering"))
+                 if s != "Unknown"]
 
-def make_assistants(n: int, rand: random.Random) -> List[Assistant]:
-    out = []
-    for _ in range(max(0, n)):
-        out.append(
-            Assistant(
-                _name(rand),
-                _next_id("A"),
-                str(rand.randint(600, 1600)),
-                rand.choice(_DEPARTMENTS),
-            )
-        )
-    return out
+# rândurile poartă codurile categoriilor, ca tabelele (migrarea 7)
+_DEPARTMENT_CODES = [Departament.department_code(d) for d in _DEPARTMENTS]
+_SUBJECT_CODES = [Subject.subject_code(s) for s in _SUBJECTS]
+_SPECIALITY_CODES = [Speciality.speciality_code(s) for s in _SPECIALITIES]
 
-def make_students(n: int, rand: random.Random) -> List[Student]:
-    out = []
-    for _ in range(max(0, n)):
-        grade = f"{rand.randint(1, 10)}"
-        spec = rand.choice(_SPECIALITIES)
-        out.append(
-            Student(
-                _name(rand),
-                _next_id("S"),
-                grade,
-                spec,
-            )
-        )
+ROLES = ("Teacher", "Assistant", "Student")
+_PREFIX = {"Teacher": "T", "Assistant": "A", "Student": "S"}
+START_ID = 10001
+BLOCK_SIZE = 10_000
+
+
+class Distributions:
+    """How values are drawn.
+
+    salary_shape: "uniform" over the (lo, hi) range, "normal" centred in it
+    (sd = range / 6) or "lognormal" with its median in the middle (long
+    right tail); normal/lognormal are clipped at lo. *_weights map a category
+    (or grade 1..10) to a relative weight, e.g. {"Engineering": 5} to skew
+    departments; missing categories weigh 1.
+    """
+    SHAPES = ("uniform", "normal", "lognormal")
+
+    def __init__(
+        self,
+        teacher_salary: Tuple[int, int] = (900, 2500),
+        assistant_salary: Tuple[int, int] = (600, 1600),
+        salary_shape: str = "uniform",
+        grade_weights: Optional[Dict[int, float]] = None,
+        department_weights: Optional[Dict[str, float]] = None,
+        subject_weights: Optional[Dict[str, float]] = None,
+        speciality_weights: Optional[Dict[str, float]] = None,
+    ):
+        if salary_shape not in self.SHAPES:
+            raise ValueError(f"Unknown salary_shape {salary_shape!r}; expected one of {self.SHAPES}")
+        self.teacher_salary = teacher_salary
+        self.assistant_salary = assistant_salary
+        self.salary_shape = salary_shape
+        self.grades = list(range(1, 11))
+        self.grade_cum = _cum_weights(self.grades, grade_weights)
+        self.department_cum = _cum_weights(_DEPARTMENTS, department_weights)
+        self.subject_cum = _cum_weights(_SUBJECTS, subject_weights)
+        self.speciality_cum = _cum_weights(_SPECIALITIES, speciality_weights)
+
+
+def _cum_weights(values: Sequence, weights: Optional[dict]) -> List[float]:
+    w = [float((weights or {}).get(v, 1.0)) for v in values]
+    if any(x < 0 for x in w) or not sum(w):
+        raise ValueError(f"Invalid weights {weights!r}")
+    return list(itertools.accumulate(w))
+
+
+class Block(NamedTuple):
+    role: str
+    index: int
+    start_id: int
+    count: int
+
+
+def block_seed(seed: int, role: str, index: int) -> int:
+    # stabil între procese și rulări (spre deosebire de hash())
+    digest = hashlib.sha256(f"{seed}:{role}:{index}".encode("ascii")).digest()
+    return int.from_bytes(digest[:8], "big")
+
+
+def plan_blocks(counts: Dict[str, int], block_size: int = BLOCK_SIZE, start_id: int = START_ID) -> List[Block]:
+    blocks = []
+    for role in ROLES:
+        n = max(0, int(counts.get(role, 0)))
+        for i, lo in enumerate(range(0, n, block_size)):
+            blocks.append(Block(role, i, start_id + lo, min(block_size, n - lo)))
+    return blocks
+
+
+def shard_blocks(blocks: List[Block], shard: int, shards: int) -> List[Block]:
+    """The blocks shard `shard` of `shards` produces (round-robin, so shards stay balanced)."""
+    return blocks[shard::shards]
+
+
+def _salaries(rand: random.Random, n: int, lo_hi: Tuple[int, int], shape: str) -> List[float]:
+    lo, hi = lo_hi
+    if shape == "uniform":
+        span = hi - lo + 1
+        return [float(lo + int(rand.random() * span)) for _ in range(n)]
+    mid = (lo + hi) / 2
+    if shape == "normal":
+        sd = (hi - lo) / 6
+        return [float(max(lo, round(rand.gauss(mid, sd)))) for _ in range(n)]
+    mu = math.log(mid)
+    return [float(max(lo, round(rand.lognormvariate(mu, 0.35)))) for _ in range(n)]
+
+
+def generate_block(block: Block, seed: int, dist: Optional[Distributions] = None) -> List[tuple]:
+    """Rows for one block, in the column order of TeacherRow / AssistantRow / StudentRow."""
+    dist = dist or Distributions()
+    rand = random.Random(block_seed(seed, block.role, block.index))
+    n = block.count
+    prefix = _PREFIX[block.role]
+    ids = [f"{prefix}-{i}" for i in range(block.start_id, block.start_id + n)]
+    names = [f"{a} {b}" for a, b in zip(rand.choices(_FIRST, k=n), rand.choices(_LAST, k=n))]
+    if block.role == "Student":
+        grades = rand.choices(dist.grades, cum_weights=dist.grade_cum, k=n)
+        specs = rand.choices(_SPECIALITY_CODES, cum_weights=dist.speciality_cum, k=n)
+        return list(zip(ids, names, grades, specs))
+    lo_hi = dist.teacher_salary if block.role == "Teacher" else dist.assistant_salary
+    salaries = _salaries(rand, n, lo_hi, dist.salary_shape)
+    deps = rand.choices(_DEPARTMENT_CODES, cum_weights=dist.department_cum, k=n)
+    if block.role == "Teacher":
+        subjects = rand.choices(_SUBJECT_CODES, cum_weights=dist.subject_cum, k=n)
+        return list(zip(ids, names, salaries, deps, subjects))
+    return list(zip(ids, names, salaries, deps))
+
+
+def _resolve_seed(seed: Optional[int]) -> int:
+    return random.SystemRandom().randrange(2 ** 63) if seed is None else int(seed)
+
+
+def stream_rows(
+    counts: Dict[str, int],
+    seed: Optional[int] = None,
+    dist: Optional[Distributions] = None,
+    block_size: int = BLOCK_SIZE,
+    shard: int = 0,
+    shards: int = 1,
+    start_id: int = START_ID,
+) -> Iterator[Tuple[str, List[tuple]]]:
+    """Yields (role, rows) one block at a time; only one block is in memory."""
+    seed = _resolve_seed(seed)
+    for block in shard_blocks(plan_blocks(counts, block_size, start_id), shard, shards):
+        yield block.role, generate_block(block, seed, dist)
+
+
+def _generate(args: Tuple[Block, int, Optional[Distributions]]) -> Tuple[str, List[tuple]]:
+    block, seed, dist = args
+    return block.role, generate_block(block, seed, dist)
+
+
+def load_into(
+    repo,
+    counts: Dict[str, int],
+    seed: Optional[int] = None,
+    dist: Optional[Distributions] = None,
+    block_size: int = BLOCK_SIZE,
+    processes: int = 1,
+    start_id: Optional[int] = None,
+) -> Dict[str, int]:
+    """Streams generated blocks into `repo.add_rows`; with processes > 1 workers generate while this process writes.
+
+    Ids start at `start_id`, by default just past the highest generated-style
+    id already in the repository, so repeated loads append instead of colliding.
+    """
+    seed = _resolve_seed(seed)
+    if start_id is None:
+        start_id = max([START_ID] + [repo.max_id_number(role, f"{_PREFIX[role]}-") + 1 for role in ROLES])
+    blocks = plan_blocks(counts, block_size, start_id)
+    written = dict.fromkeys(ROLES, 0)
+
+    def write(chunks: Iterable[Tuple[str, List[tuple]]]) -> None:
+        for role, rows in chunks:
+            written[role] += repo.add_rows(role, rows)
+
+    if processes <= 1:
+        write(_generate((b, seed, dist)) for b in blocks)
+    else:
+        import multiprocessing
+        with multiprocessing.Pool(processes) as pool:
+            # imap păstrează ordinea blocurilor: aceeași bază indiferent de numărul de procese
+            write(pool.imap(_generate, ((b, seed, dist) for b in blocks), chunksize=1))
+    return written
+
+
+def synthesize(counts: Dict[str, int], seed: int | None = None, start_id: int = START_ID) -> Dict[str, List[object]]:
+    """Small in-memory data sets as model objects (same rows as stream_rows)."""
+    out: Dict[str, List[object]] = {role: [] for role in ROLES}
+    for role, rows in stream_rows(counts, seed, start_id=start_id):
+        if role == "Teacher":
+            out[role].extend(Teacher(r[1], r[0], str(r[2]), r[3], r[4]) for r in rows)
+        elif role == "Assistant":
+            out[role].extend(Assistant(r[1], r[0], str(r[2]), r[3]) for r in rows)
+        else:
+            out[role].extend(Student(r[1], r[0], str(r[2]), r[3]) for r in rows)
     return out
 
-def synthesize(counts: Dict[str, int], seed: int | None = None) -> Dict[str, List[object]]:
-    rand = random.Random(seed)
-    return {
-        "Teacher": make_teachers(counts.get("Teacher", 0), rand),
-        "Assistant": make_assistants(counts.get("Assistant", 0), rand),
-        "Student": make_students(counts.get("Student", 0), rand),
-    }
+
+if __name__ == "__main__":
+    # python -m model.faker --students 10000000 --processes 4 --db /tmp/perf.db
+    import argparse
+    import time
+    from data.db_config import DBConfig
+    from data.db import Database
+    from repository.school_repository import SchoolRepository
+
+    ap = argparse.ArgumentParser(description="Bulk-load synthetic people for perf fixtures.")
+    ap.add_argument("--teachers", type=int, default=0)
+    ap.add_argument("--assistants", type=int, default=0)
+    ap.add_argument("--students", type=int, default=0)
+    ap.add_argument("--seed", type=int, default=42)
+    ap.add_argument("--processes", type=int, default=1)
+    ap.add_argument("--block-size", type=int, default=BLOCK_SIZE)
+    ap.add_argument("--salary-shape", choices=Distributions.SHAPES, default="uniform")
+    ap.add_argument("--db", default="", help="SQLite file (default: DBConfig.SQLITE_PATH)")
+    ap.add_argument("--database-url", default="")
+    args = ap.parse_args()
+
+    if args.db:
+        DBConfig.SQLITE_PATH = args.db
+    db = Database(args.database_url)
+    started = time.perf_counter()
+    with db.bulk_load():
+        done = load_into(
+            SchoolRepository(db),
+            {"Teacher": args.teachers, "Assistant": args.assistants, "Student": args.students},
+            seed=args.seed, dist=Distributions(salary_shape=args.salary_shape),
+            block_size=args.block_size, processes=args.processes,
+        )
+    db.close()
+    print(f"{done} in {time.perf_counter() - started:.1f}s")
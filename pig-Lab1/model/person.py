@@ -1,4 +1,6 @@
 class Person:
+    __slots__ = ("name", "id")
+
     def __init__(self, name, id):
         self.name = name
         self.id = id
\ No newline at end of file
@@ -0,0 +1,71 @@
+# model/records.py
+from typing import NamedTuple, Optional
+from model.caracteristica import Departament, Subject, Speciality
+
+_DEPARTMENTS = Departament.ALLOWED_DEPARTMENTS
+_SUBJECTS = Subject.ALLOWED_SUBJECTS
+_SPECIALITIES = Speciality.ALLOWED_SPECIALTIES
+
+
+# Proiecții read-only ale rândurilor din DB: fără __init__-ul modelelor și fără re-normalizare.
+# Categoriile vin ca și coduri (*_id); numele pentru UI sunt proprietăți.
+class TeacherRow(NamedTuple):
+    id: str
+    name: str
+    salary: float
+    department_id: int
+    subject_id: int
+
+    @property
+    def department(self) -> str:
+        return _DEPARTMENTS[self.department_id]
+
+    @property
+    def subject(self) -> str:
+        return _SUBJECTS[self.subject_id]
+
+
+class AssistantRow(NamedTuple):
+    id: str
+    name: str
+    salary: float
+    department_id: int
+
+    @property
+    def department(self) -> str:
+        return _DEPARTMENTS[self.department_id]
+
+
+class StudentRow(NamedTuple):
+    id: str
+    name: str
+    grade: int
+    speciality_id: int
+
+    @property
+    def speciality(self) -> str:
+        return _SPECIALITIES[self.speciality_id]
+
+
+class SearchHit(NamedTuple):
+    role: str
+    id: str
+    name: str
+    department_id: Optional[int]
+    speciality_id: Optional[int]
+    score: float
+
+    @property
+    def department(self) -> Optional[str]:
+        return None if self.department_id is None else _DEPARTMENTS[self.department_id]
+
+    @property
+    def speciality(self) -> Optional[str]:
+        return None if self.speciality_id is None else _SPECIALITIES[self.speciality_id]
+
+
+class Change(NamedTuple):
+    version: int
+    role: str
+    id: str
+    op: str  # "I" | "U" | "D"
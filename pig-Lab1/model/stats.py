@@ -1,14 +1,37 @@
 # model/stats.py
-from typing import Dict, List, Tuple
+from typing import TYPE_CHECKING, Dict, List, Tuple, Union
 from model.student import Student
 from model.teacher import Teacher
 from model.assistant import Assistant
+from model.caracteristica import Departament, Subject, Speciality
+
+if TYPE_CHECKING:
+    from model.columnar_stats import ColumnarStats
 
 class StatsModel:
-    def roles_distribution(self, data: Dict[str, List[object]]) -> List[Tuple[str, int]]:
+    """Per-role statistics over in-memory people.
+
+    Every method takes either the role dict or the columnar frame returned by
+    `load(data)`; the frame (NumPy) answers the same questions vectorized.
+    """
+
+    @staticmethod
+    def load(data: Dict[str, List[object]]):
+        """Columnar frame for repeated statistics over `data`; the dict itself when NumPy is missing."""
+        try:
+            from model.columnar_stats import ColumnarStats
+        except ImportError:
+            return data
+        return ColumnarStats(data)
+
+    def roles_distribution(self, data: Union[Dict[str, List[object]], "ColumnarStats"]) -> List[Tuple[str, int]]:
+        if not isinstance(data, dict):
+            return data.roles_distribution()
         return [(role, len(items)) for role, items in data.items()]
 
-    def students_by_speciality(self, data: Dict[str, List[object]]) -> List[Tuple[str, int]]:
+    def students_by_speciality(self, data: Union[Dict[str, List[object]], "ColumnarStats"]) -> List[Tuple[str, int]]:
+        if not isinstance(data, dict):
+            return data.students_by_speciality()
         counts: Dict[str, int] = {}
         for obj in data.get("Student", []):
             if isinstance(obj, Student):
@@ -16,7 +39,9 @@ class StatsModel:
                 counts[spec] = counts.get(spec, 0) + 1
         return sorted(counts.items(), key=lambda x: (-x[1], x[0]))
 
-    def avg_salary_by_department(self, data: Dict[str, List[object]]) -> List[Tuple[str, float]]:
+    def avg_salary_by_department(self, data: Union[Dict[str, List[object]], "ColumnarStats"]) -> List[Tuple[str, float]]:
+        if not isinstance(data, dict):
+            return data.avg_salary_by_department()
         sums: Dict[str, float] = {}
         counts: Dict[str, int] = {}
         for role in ("Teacher", "Assistant"):
@@ -35,7 +60,9 @@ class StatsModel:
             result.append((dep, total / c if c else 0.0))
         return sorted(result, key=lambda x: (-x[1], x[0]))
 
-    def teachers_by_subject(self, data: Dict[str, List[object]]) -> List[Tuple[str, int]]:
+    def teachers_by_subject(self, data: Union[Dict[str, List[object]], "ColumnarStats"]) -> List[Tuple[str, int]]:
+        if not isinstance(data, dict):
+            return data.teachers_by_subject()
         counts: Dict[str, int] = {}
         for obj in data.get("Teacher", []):
             if isinstance(obj, Teacher):
@@ -43,7 +70,9 @@ class StatsModel:
                 counts[subj] = counts.get(subj, 0) + 1
         return sorted(counts.items(), key=lambda x: (-x[1], x[0]))
 
-    def student_grades_series(self, data: Dict[str, List[object]]) -> List[int]:
+    def student_grades_series(self, data: Union[Dict[str, List[object]], "ColumnarStats"]) -> List[int]:
+        if not isinstance(data, dict):
+            return data.student_grades_series()
         vals: List[int] = []
         for obj in data.get("Student", []):
             if isinstance(obj, Student):
@@ -53,7 +82,9 @@ class StatsModel:
                     pass
         return vals
 
-    def salaries_series(self, data: Dict[str, List[object]]) -> List[float]:
+    def salaries_series(self, data: Union[Dict[str, List[object]], "ColumnarStats"]) -> List[float]:
+        if not isinstance(data, dict):
+            return data.salaries_series()
         vals: List[float] = []
         for role in ("Teacher", "Assistant"):
             for obj in data.get(role, []):
@@ -64,7 +95,9 @@ class StatsModel:
                         pass
         return vals
 
-    def salary_by_department_groups(self, data: Dict[str, List[object]]) -> List[Tuple[str, List[float]]]:
+    def salary_by_department_groups(self, data: Union[Dict[str, List[object]], "ColumnarStats"]) -> List[Tuple[str, List[float]]]:
+        if not isinstance(data, dict):
+            return data.salary_by_department_groups()
         groups: Dict[str, List[float]] = {}
         for role in ("Teacher", "Assistant"):
             for obj in data.get(role, []):
@@ -76,3 +109,101 @@ class StatsModel:
                         sal = 0.0
                     groups.setdefault(dep, []).append(sal)
         return sorted(groups.items(), key=lambda x: x[0])
+
+
+class IncrementalStats:
+    """Running chart aggregates, updated with per-row deltas instead of recomputed.
+
+    Feed it every write with `apply(role, before, after)` (None for a missing
+    side); records only need the stored attributes (models or row projections).
+    Counters are keyed by category code and named only when queried, so each
+    query costs O(number of categories), independent of the row count.
+    """
+    ROLES = ("Teacher", "Assistant", "Student")
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self) -> None:
+        self._roles: Dict[str, int] = dict.fromkeys(self.ROLES, 0)
+        self._speciality: Dict[int, int] = {}
+        self._subject: Dict[int, int] = {}
+        self._dep_sum: Dict[int, float] = {}
+        self._dep_count: Dict[int, int] = {}
+
+    @staticmethod
+    def _bump(counts: dict, key: int, delta) -> None:
+        v = counts.get(key, 0) + delta
+        if v:
+            counts[key] = v
+        else:
+            counts.pop(key, None)
+
+    def _add(self, role: str, obj, sign: int) -> None:
+        if role not in self._roles:
+            return
+        self._roles[role] += sign
+        if role == "Student":
+            self._bump(self._speciality, obj.speciality_id, sign)
+            return
+        if role == "Teacher":
+            self._bump(self._subject, obj.subject_id, sign)
+        dep = obj.department_id
+        self._bump(self._dep_count, dep, sign)
+        if dep in self._dep_count:
+            self._dep_sum[dep] = self._dep_sum.get(dep, 0.0) + sign * float(getattr(obj, "salary", 0) or 0)
+        else:
+            self._dep_sum.pop(dep, None)
+
+    def apply(self, role: str, before=None, after=None) -> None:
+        if before is not None:
+            self._add(role, before, -1)
+        if after is not None:
+            self._add(role, after, 1)
+
+    def rebuild(self, repo) -> None:
+        """Reloads every counter from the repository's trigger-kept __summary__ rows (no table scan)."""
+        self.reset()
+        for kind, key, n, total in repo.summary_rows():
+            if kind == "role":
+                if key in self._roles:
+                    self._roles[key] = int(n)
+            elif n:  # cheile categoriilor sunt codurile, ca text (migrarea 7)
+                if kind == "speciality":
+                    self._speciality[int(key)] = int(n)
+                elif kind == "subject":
+                    self._subject[int(key)] = int(n)
+                elif kind == "department":
+                    self._dep_count[int(key)] = int(n)
+                    self._dep_sum[int(key)] = float(total or 0)
+
+    def check(self, repo, tol: float = 1e-6) -> List[str]:
+        """Differences against the repository aggregates; empty when consistent."""
+        problems = []
+        for name in ("roles_distribution", "students_by_speciality", "teachers_by_subject"):
+            mine = getattr(self, name)()
+            theirs = getattr(repo, "counts_by_role" if name == "roles_distribution" else name)()
+            if sorted(mine) != sorted((k, int(v)) for k, v in theirs):
+                problems.append(f"{name}: {mine} != {theirs}")
+        mine = dict(self.avg_salary_by_department())
+        theirs = {k: float(v) for k, v in repo.avg_salary_by_department()}
+        if mine.keys() != theirs.keys() or any(abs(mine[k] - theirs[k]) > tol * max(1.0, abs(theirs[k])) for k in mine):
+            problems.append(f"avg_salary_by_department: {mine} != {theirs}")
+        return problems
+
+    def roles_distribution(self) -> List[Tuple[str, int]]:
+        return [(role, self._roles[role]) for role in self.ROLES]
+
+    @staticmethod
+    def _named(items, labels: tuple) -> List[Tuple[str, float]]:
+        return sorted(((labels[k], v) for k, v in items), key=lambda x: (-x[1], x[0]))
+
+    def students_by_speciality(self) -> List[Tuple[str, int]]:
+        return self._named(self._speciality.items(), Speciality.ALLOWED_SPECIALTIES)
+
+    def teachers_by_subject(self) -> List[Tuple[str, int]]:
+        return self._named(self._subject.items(), Subject.ALLOWED_SUBJECTS)
+
+    def avg_salary_by_department(self) -> List[Tuple[str, float]]:
+        result = ((dep, self._dep_sum[dep] / c) for dep, c in self._dep_count.items())
+        return self._named(result, Departament.ALLOWED_DEPARTMENTS)
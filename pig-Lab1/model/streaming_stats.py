@@ -0,0 +1,243 @@
+# model/streaming_stats.py
+"""Bounded-memory summaries for value streams (salaries, grades).
+
+`RunningMoments` keeps count/mean/variance with Welford's update and Chan's
+pairwise merge; `KLLSketch` is a KLL quantile sketch whose size grows only
+with log(n). Both merge, so shards or processes can summarize their part
+and combine the results (`to_dict`/`from_dict` for transport).
+"""
+import math
+import random
+from typing import Dict, Hashable, Iterable, List, Optional, Tuple
+
+
+class RunningMoments:
+    __slots__ = ("n", "mean", "m2", "min", "max")
+
+    def __init__(self):
+        self.n = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def add(self, x: float) -> None:
+        x = float(x)
+        self.n += 1
+        d = x - self.mean
+        self.mean += d / self.n
+        self.m2 += d * (x - self.mean)
+        if x < self.min:
+            self.min = x
+        if x > self.max:
+            self.max = x
+
+    def merge(self, other: "RunningMoments") -> "RunningMoments":
+        if other.n:
+            n = self.n + other.n
+            d = other.mean - self.mean
+            self.mean += d * other.n / n
+            self.m2 += other.m2 + d * d * self.n * other.n / n
+            self.n = n
+            self.min = min(self.min, other.min)
+            self.max = max(self.max, other.max)
+        return self
+
+    def variance(self, ddof: int = 0) -> float:
+        return self.m2 / (self.n - ddof) if self.n > ddof else 0.0
+
+    def stddev(self, ddof: int = 0) -> float:
+        return math.sqrt(self.variance(ddof))
+
+    def to_dict(self) -> dict:
+        return {"n": self.n, "mean": self.mean, "m2": self.m2,
+                "min": self.min if self.n else None, "max": self.max if self.n else None}
+
+    @classmethod
+    def from_dict(cls, d: dict) -> "RunningMoments":
+        m = cls()
+        m.n, m.mean, m.m2 = int(d["n"]), float(d["mean"]), float(d["m2"])
+        if m.n:
+            m.min, m.max = float(d["min"]), float(d["max"])
+        return m
+
+
+class KLLSketch:
+    """KLL quantile sketch; rank error is about 1.7/k with high probability."""
+
+    def __init__(self, k: int = 200, seed: Optional[int] = None):
+        self.k = max(8, int(k))
+        self.n = 0
+        self._rand = random.Random(seed)
+        self._levels: List[List[float]] = []
+        self._size = 0
+        self._max_size = 0
+        self._grow()
+
+    def _capacity(self, h: int) -> int:
+        depth = len(self._levels) - h - 1
+        return int(math.ceil(self.k * (2 / 3) ** depth)) + 1
+
+    def _grow(self) -> None:
+        self._levels.append([])
+        self._max_size = sum(self._capacity(h) for h in range(len(self._levels)))
+
+    def _compress(self) -> None:
+        # compactează primul nivel plin: jumătate din elemente urcă cu greutate dublă
+        for h, items in enumerate(self._levels):
+            if len(items) >= self._capacity(h):
+                if h + 1 >= len(self._levels):
+                    self._grow()
+                items.sort()
+                keep = items[:len(items) % 2]
+                pairs = items[len(keep):]
+                self._levels[h + 1].extend(pairs[self._rand.random() < 0.5::2])
+                self._levels[h] = keep
+                self._size = sum(len(lv) for lv in self._levels)
+                return
+
+    def add(self, x: float) -> None:
+        self._levels[0].append(float(x))
+        self.n += 1
+        self._size += 1
+        if self._size >= self._max_size:
+            self._compress()
+
+    def merge(self, other: "KLLSketch") -> "KLLSketch":
+        while len(self._levels) < len(other._levels):
+            self._grow()
+        for h, items in enumerate(other._levels):
+            self._levels[h].extend(items)
+        self.n += other.n
+        self._size = sum(len(lv) for lv in self._levels)
+        while self._size >= self._max_size:
+            self._compress()
+        return self
+
+    def _weighted(self) -> List[Tuple[float, int]]:
+        return sorted((x, 1 << h) for h, items in enumerate(self._levels) for x in items)
+
+    def quantiles(self, qs: Iterable[float]) -> List[float]:
+        items = self._weighted()
+        if not items:
+            return [math.nan for _ in qs]
+        total = sum(w for _, w in items)
+        out = []
+        for q in qs:
+            target = min(max(float(q), 0.0), 1.0) * total
+            acc = 0
+            value = items[-1][0]
+            for x, w in items:
+                acc += w
+                if acc >= target:
+                    value = x
+                    break
+            out.append(value)
+        return out
+
+    def quantile(self, q: float) -> float:
+        return self.quantiles([q])[0]
+
+    def rank(self, x: float) -> float:
+        """Approximate fraction of values <= x."""
+        items = self._weighted()
+        total = sum(w for _, w in items)
+        return sum(w for v, w in items if v <= x) / total if total else 0.0
+
+    def retained(self) -> int:
+        return self._size
+
+    def to_dict(self) -> dict:
+        return {"k": self.k, "n": self.n, "levels": [list(lv) for lv in self._levels]}
+
+    @classmethod
+    def from_dict(cls, d: dict, seed: Optional[int] = None) -> "KLLSketch":
+        s = cls(d["k"], seed)
+        s.n = int(d["n"])
+        s._levels = [[float(x) for x in lv] for lv in d["levels"]] or [[]]
+        s._max_size = sum(s._capacity(h) for h in range(len(s._levels)))
+        s._size = sum(len(lv) for lv in s._levels)
+        return s
+
+
+class StreamSummary:
+    """Moments plus quantile sketch for one stream."""
+    __slots__ = ("moments", "sketch")
+
+    def __init__(self, k: int = 200, seed: Optional[int] = None):
+        self.moments = RunningMoments()
+        self.sketch = KLLSketch(k, seed)
+
+    def add(self, x: float) -> None:
+        self.moments.add(x)
+        self.sketch.add(x)
+
+    def merge(self, other: "StreamSummary") -> "StreamSummary":
+        self.moments.merge(other.moments)
+        self.sketch.merge(other.sketch)
+        return self
+
+    def summary(self) -> dict:
+        m = self.moments
+        if not m.n:
+            return {"n": 0}
+        p25, p50, p75, p95 = self.sketch.quantiles((0.25, 0.5, 0.75, 0.95))
+        return {"n": m.n, "mean": m.mean, "stddev": m.stddev(), "min": m.min,
+                "p25": p25, "median": p50, "p75": p75, "p95": p95, "max": m.max}
+
+    def to_dict(self) -> dict:
+        return {"moments": self.moments.to_dict(), "sketch": self.sketch.to_dict()}
+
+    @classmethod
+    def from_dict(cls, d: dict) -> "StreamSummary":
+        s = cls(d["sketch"]["k"])
+        s.moments = RunningMoments.from_dict(d["moments"])
+        s.sketch = KLLSketch.from_dict(d["sketch"])
+        return s
+
+
+class GroupedStreamStats:
+    """One StreamSummary per key (department, speciality, ...)."""
+
+    def __init__(self, k: int = 200, seed: Optional[int] = None):
+        self.k = k
+        self._seed = seed
+        self.groups: Dict[Hashable, StreamSummary] = {}
+
+    def add(self, key: Hashable, x: float) -> None:
+        g = self.groups.get(key)
+        if g is None:
+            g = self.groups[key] = StreamSummary(self.k, self._seed)
+        g.add(x)
+
+    def consume(self, pairs: Iterable[Tuple[Hashable, float]]) -> "GroupedStreamStats":
+        for key, x in pairs:
+            self.add(key, x)
+        return self
+
+    def merge(self, other: "GroupedStreamStats") -> "GroupedStreamStats":
+        for key, g in other.groups.items():
+            mine = self.groups.get(key)
+            if mine is None:
+                self.groups[key] = StreamSummary.from_dict(g.to_dict())
+            else:
+                mine.merge(g)
+        return self
+
+    def overall(self) -> StreamSummary:
+        total = StreamSummary(self.k, self._seed)
+        for g in self.groups.values():
+            total.merge(g)
+        return total
+
+    def summaries(self) -> List[Tuple[Hashable, dict]]:
+        return sorted(((k, g.summary()) for k, g in self.groups.items()), key=lambda x: str(x[0]))
+
+    def to_dict(self) -> dict:
+        return {"k": self.k, "groups": [[k, g.to_dict()] for k, g in self.groups.items()]}
+
+    @classmethod
+    def from_dict(cls, d: dict) -> "GroupedStreamStats":
+        s = cls(d["k"])
+        s.groups = {k: StreamSummary.from_dict(g) for k, g in d["groups"]}
+        return s
@@ -1,6 +1,8 @@
 from model.caracteristica import Employee, Subject
 
 class Teacher(Employee, Subject):  # Teacher inherits from Employee
+    __slots__ = ("subject_id",)
+
     def __init__(self, name, id, salary, department, subject):
         Employee.__init__(self, name, id, salary, department)
         Subject.__init__(self, subject)
\ No newline at end of file
@@ -2,10 +2,11 @@ from typing import Dict, List, Tuple
 from model.teacher import Teacher
 from model.student import Student
 from model.assistant import Assistant
-from model.stats import StatsModel
-from model.faker import synthesize
+from model.caracteristica import Departament, Speciality
+from model.stats import StatsModel, IncrementalStats
+from model.faker import load_into
 from data.db import Database
-from repository.school_repository import SchoolRepository
+from repository.school_repository import SchoolRepository, page_sort_key
 
 class SchoolPresenter:
     def __init__(
@@ -16,11 +17,15 @@ class SchoolPresenter:
     ):
         self.view = None
         self._stats = StatsModel()
+        # agregatele graficelor, actualizate cu delte la fiecare CRUD din acest presenter
+        self._agg = IncrementalStats()
         self._db = Database(database_url)
         self._repo = SchoolRepository(self._db)
 
         # sortare curentă (Name | Grade | Salary) — fără “Role”
         self._sort_mode = "Name"
+        # ultima versiune din __changes__ pe care a văzut-o UI-ul
+        self._version = 0
 
         try:
             self._repo.normalize_db_values()
@@ -34,6 +39,7 @@ class SchoolPresenter:
             default_counts = {"Teacher": 4, "Assistant": 3, "Student": 12}
             to_make = default_counts if initial_counts is None else initial_counts
             self._seed_random(to_make, seed=seed)
+        self._agg.rebuild(self._repo)
 
     def set_view(self, view) -> None:
         self.view = view
@@ -57,6 +63,61 @@ class SchoolPresenter:
         else:
             self._sort_mode = "Name"
 
+    def get_page(self, person_type: str, after=None, limit: int = 50) -> tuple[list, object]:
+        """Keyset-paged records in the current sort mode; pass back the returned cursor for the next page."""
+        if person_type == "Teacher":
+            return self._repo.page_teachers(self._sort_mode, after, limit)
+        if person_type == "Assistant":
+            return self._repo.page_assistants(self._sort_mode, after, limit)
+        if person_type == "Student":
+            return self._repo.page_students(self._sort_mode, after, limit)
+        return [], None
+
+    # ------------ Incremental sync ------------
+    def pull_changes(self) -> dict | None:
+        """Deltas since the last snapshot/pull: {role: {"upserted": [rows], "deleted": [ids]}}.
+
+        Returns None when the change log no longer reaches back that far;
+        the caller should then do a full reload. Either way the chart
+        aggregates are reloaded from __summary__ in the same read when anything changed.
+        """
+        with self._db.read():
+            changes = self._repo.changes_since(self._version)
+            if changes is None:
+                self._agg.rebuild(self._repo)
+                return None
+            # jurnalul nu păstrează valorile vechi, deci delta nu se poate scădea:
+            # reîncărcăm contoarele din __summary__ (O(categorii), fără scanarea tabelelor)
+            if changes:
+                self._agg.rebuild(self._repo)
+            latest: dict[tuple[str, str], str] = {}
+            for ch in changes:
+                latest[(ch.role, ch.id)] = ch.op
+            out = {}
+            for role in ("Teacher", "Assistant", "Student"):
+                ids = [i for (r, i), op in latest.items() if r == role]
+                if not ids:
+                    continue
+                deleted = [i for i in ids if latest[(role, i)] == "D"]
+                out[role] = {"upserted": self._repo.get_rows(role, [i for i in ids if latest[(role, i)] != "D"]),
+                             "deleted": deleted}
+        if changes:
+            self._version = changes[-1].version
+        return out
+
+    # ------------ Search ------------
+    def search_people(self, text: str, person_type: str | None = None, department: str | None = None,
+                      speciality: str | None = None, fuzzy: bool = False,
+                      page: int = 0, page_size: int = 20) -> list:
+        """Ranked matches for `text`; filters accept the same aliases as the edit forms ("hr", "cs")."""
+        roles = [person_type] if person_type in ("Teacher", "Assistant", "Student") else None
+        if department:
+            department = Departament._normalize_department(department)
+        if speciality:
+            speciality = Speciality._normalize_speciality(speciality)
+        return self._repo.search(text, roles, department or None, speciality or None, fuzzy,
+                                 limit=page_size, offset=max(0, page) * page_size)
+
     # ------------ CRUD ------------
     def add_person(self, person_type: str, values: dict) -> Tuple[bool, str]:
         try:
@@ -71,16 +132,20 @@ class SchoolPresenter:
                 self._repo.add_assistant(obj)
             else:
                 return False, f"Invalid person type: {person_type}"
+            self._agg.apply(person_type, after=self._repo.row_of(person_type, obj))
             return True, f"Added {person_type}: {values['Name']}"
         except Exception as e:
             return False, f"Error adding {person_type}: {e}"
 
     def edit_person(self, person_type: str, name: str, values: dict) -> Tuple[bool, str]:
         try:
-            all_data = self._snapshot()
-            target = next((o for o in all_data.get(person_type, []) if getattr(o, "name", "") == name), None)
+            target = self._find_by_name(person_type, name)
             if not target:
                 return False, f"{person_type} '{name}' not found"
+            # rândul "înainte" vine din obiectul deja citit; UPDATE-ul țintește id-ul vechi,
+            # ca o schimbare de ID să mute rândul în loc să nu atingă nimic
+            before = self._repo.row_of(person_type, target)
+            old_id = target.id
 
             if person_type == "Teacher":
                 target.name = values.get("Name", target.name)
@@ -88,32 +153,33 @@ class SchoolPresenter:
                 target.salary = values.get("Salary", target.salary)
                 target.department = values.get("Department", target.department)
                 target.subject = values.get("Subject", target.subject)
-                self._repo.update_teacher(target)
+                self._repo.update_teacher_by_id(old_id, target)
 
             elif person_type == "Student":
                 target.name = values.get("Name", target.name)
                 target.id = values.get("ID", target.id)
                 target.grade = values.get("Grade", target.grade)
                 target.speciality = values.get("Speciality", target.speciality)
-                self._repo.update_student(target)
+                self._repo.update_student_by_id(old_id, target)
 
             else:  # Assistant
                 target.name = values.get("Name", target.name)
                 target.id = values.get("ID", target.id)
                 target.salary = values.get("Salary", target.salary)
                 target.department = values.get("Department", target.department)
-                self._repo.update_assistant(target)
+                self._repo.update_assistant_by_id(old_id, target)
 
+            self._agg.apply(person_type, before, self._repo.row_of(person_type, target))
             return True, f"Edited {person_type}: {target.name}"
         except Exception as e:
             return False, f"Error editing {person_type}: {e}"
 
     def delete_person(self, person_type: str, name: str) -> Tuple[bool, str]:
         try:
-            all_data = self._snapshot()
-            target = next((o for o in all_data.get(person_type, []) if getattr(o, "name", "") == name), None)
+            target = self._find_by_name(person_type, name)
             if not target:
                 return False, f"{person_type} '{name}' not found"
+            before = self._repo.row_of(person_type, target)
 
             if person_type == "Teacher":
                 self._repo.delete_teacher(target.id)
@@ -122,20 +188,18 @@ class SchoolPresenter:
             else:
                 self._repo.delete_assistant(target.id)
 
+            self._agg.apply(person_type, before)
             return True, f"Deleted {person_type}: {name}"
         except Exception as e:
             return False, f"Error deleting {person_type}: {e}"
 
     # ------------ ID-centric ------------
     def find_by_id(self, person_type: str, id_: str):
-        snap = self._snapshot()
-        for obj in snap.get(person_type, []):
-            if getattr(obj, "id", None) == id_:
-                return obj
-        return None
+        return self._repo.get(person_type, id_)
 
     def delete_by_id(self, person_type: str, id_: str) -> Tuple[bool, str]:
         try:
+            before = self._row(person_type, id_)
             if person_type == "Teacher":
                 self._repo.delete_teacher(id_)
             elif person_type == "Student":
@@ -144,6 +208,7 @@ class SchoolPresenter:
                 self._repo.delete_assistant(id_)
             else:
                 return False, f"Invalid person type: {person_type}"
+            self._agg.apply(person_type, before)
             return True, f"Deleted {person_type} id={id_}"
         except Exception as e:
             return False, f"Error deleting {person_type} id={id_}: {e}"
@@ -153,28 +218,30 @@ class SchoolPresenter:
         if not obj:
             return False, f"{person_type} id={id_} not found"
         try:
+            before = self._repo.row_of(person_type, obj)
             if person_type == "Teacher":
                 obj.name = values.get("Name", obj.name)
                 obj.id = values.get("ID", obj.id)
                 obj.salary = values.get("Salary", obj.salary)
                 obj.department = values.get("Department", obj.department)
                 obj.subject = values.get("Subject", obj.subject)
-                self._repo.update_teacher(obj)
+                self._repo.update_teacher_by_id(id_, obj)
 
             elif person_type == "Student":
                 obj.name = values.get("Name", obj.name)
                 obj.id = values.get("ID", obj.id)
                 obj.grade = values.get("Grade", obj.grade)
                 obj.speciality = values.get("Speciality", obj.speciality)
-                self._repo.update_student(obj)
+                self._repo.update_student_by_id(id_, obj)
 
             else:  # Assistant
                 obj.name = values.get("Name", obj.name)
                 obj.id = values.get("ID", obj.id)
                 obj.salary = values.get("Salary", obj.salary)
                 obj.department = values.get("Department", obj.department)
-                self._repo.update_assistant(obj)
+                self._repo.update_assistant_by_id(id_, obj)
 
+            self._agg.apply(person_type, before, self._repo.row_of(person_type, obj))
             return True, f"Edited {person_type}: {obj.name}"
         except Exception as e:
             return False, f"Error editing {person_type} id={id_}: {e}"
@@ -185,6 +252,7 @@ class SchoolPresenter:
             return False, f"{person_type} id={original_id} not found", original_id
 
         try:
+            before = self._repo.row_of(person_type, obj)
             new_id = values.get("ID", getattr(obj, "id", original_id)) or original_id
             new_name = values.get("Name", getattr(obj, "name", ""))
 
@@ -213,6 +281,7 @@ class SchoolPresenter:
             else:
                 return False, f"Invalid person type: {person_type}", original_id
 
+            self._agg.apply(person_type, before, self._repo.row_of(person_type, obj))
             return True, f"Saved {person_type}: {new_name}", new_id
         except Exception as e:
             return False, f"Error saving {person_type} id={original_id}: {e}", original_id
@@ -261,30 +330,37 @@ class SchoolPresenter:
             "Teachers by Subject",
             "Student Grades (Series)",
             "All Salaries (Series)",
+            "Student Grades (Histogram)",
+            "All Salaries (Histogram)",
             "Salary by Department (Groups)",
         ]
 
     def get_chart_payload(self, chart_type: str) -> dict:
-        ct = (chart_type or "").strip().lower()
+        # o singură tranzacție de citire pentru tot payload-ul
+        with self._db.read():
+            return self._chart_payload((chart_type or "").strip().lower())
+
+    def _chart_payload(self, ct: str) -> dict:
 
+        # graficele categoriale vin din agregatorul incremental, fără drum până la DB
         if ct == "roles distribution":
-            rows = self._repo.counts_by_role()
+            rows = self._agg.roles_distribution()
             return {"type": "categorical", "labels": [r[0] for r in rows], "values": [r[1] for r in rows],
                     "title": "Distribuția rolurilor", "ylabel": "Număr"}
 
         if ct == "students by speciality":
-            rows = self._repo.students_by_speciality()
+            rows = self._agg.students_by_speciality()
             return {"type": "categorical", "labels": [r[0] for r in rows], "values": [r[1] for r in rows],
                     "title": "Studenți pe specialitate", "ylabel": "Număr"}
 
         if ct == "avg salary by department":
-            rows = self._repo.avg_salary_by_department()
+            rows = self._agg.avg_salary_by_department()
             return {"type": "categorical", "labels": [r[0] for r in rows], "values": [r[1] for r in rows],
                     "title": "Salariu mediu pe departament", "ylabel": "Salariu mediu"}
 
         if ct == "teachers by subject":
-            rows = self._repo.teachers_by_subject()
-            return {"type": "categororical", "labels": [r[0] for r in rows], "values": [r[1] for r in rows],
+            rows = self._agg.teachers_by_subject()
+            return {"type": "categorical", "labels": [r[0] for r in rows], "values": [r[1] for r in rows],
                     "title": "Profesori pe disciplină", "ylabel": "Număr"}
 
         if ct == "student grades (series)":
@@ -295,69 +371,97 @@ class SchoolPresenter:
             return {"type": "series", "series": self._repo.salaries_series(),
                     "title": "Salarii (serie)", "ylabel": "Salariu"}
 
+        # distribuțiile vin deja agregate din SQL, nu ca serii brute
+        if ct == "student grades (histogram)":
+            edges, counts = self._repo.grade_histogram()
+            return {"type": "histogram", "edges": edges, "counts": counts,
+                    "title": "Note studenți (histogramă)", "ylabel": "Frecvență"}
+
+        if ct == "all salaries (histogram)":
+            edges, counts = self._repo.salary_histogram()
+            return {"type": "histogram", "edges": edges, "counts": counts,
+                    "title": "Salarii (histogramă)", "ylabel": "Frecvență"}
+
         if ct == "salary by department (groups)":
-            return {"type": "groups", "groups": self._repo.salary_by_department_groups(),
+            return {"type": "boxstats", "stats": self._repo.salary_box_stats(),
                     "title": "Salarii pe departament (boxplot)", "ylabel": "Salariu"}
 
-        rows = self._repo.counts_by_role()
+        rows = self._agg.roles_distribution()
         return {"type": "categorical", "labels": [r[0] for r in rows], "values": [r[1] for r in rows],
                 "title": "Distribuția rolurilor", "ylabel": "Număr"}
 
     # ------------ Dump ------------
     def get_all_data(self) -> str:
+        with self._db.read():
+            return self._dump_all()
+
+    def _dump_all(self) -> str:
         lines: list[str] = []
 
-        teachers = self._repo.list_teachers()
-        lines.append(f"[Teachers] count={len(teachers)}")
-        for t in teachers:
+        # antetul cu count se completează după ce s-a parcurs stream-ul
+        head = len(lines); lines.append("")
+        for t in self._repo.iter_teacher_rows():
             lines.append(f"  - {t.id} | {t.name} | salary={t.salary} | dep={t.department} | subj={t.subject}")
+        lines[head] = f"[Teachers] count={len(lines) - head - 1}"
 
-        assistants = self._repo.list_assistants()
-        lines.append(f"[Assistants] count={len(assistants)}")
-        for a in assistants:
+        head = len(lines); lines.append("")
+        for a in self._repo.iter_assistant_rows():
             lines.append(f"  - {a.id} | {a.name} | salary={a.salary} | dep={a.department}")
+        lines[head] = f"[Assistants] count={len(lines) - head - 1}"
 
-        students = self._repo.list_students()
-        lines.append(f"[Students] count={len(students)}")
-        for s in students:
+        head = len(lines); lines.append("")
+        for s in self._repo.iter_student_rows():
             lines.append(f"  - {s.id} | {s.name} | grade={s.grade} | spec={s.speciality}")
+        lines[head] = f"[Students] count={len(lines) - head - 1}"
 
         return "\n".join(lines)
 
+    # ------------ Stats ------------
+    def rebuild_stats(self) -> None:
+        """Reloads the chart aggregates from the DB summaries (e.g. after writes from another process)."""
+        with self._db.read():
+            self._agg.rebuild(self._repo)
+
+    def check_stats(self) -> list[str]:
+        """Mismatches between the incremental aggregates and the repository; empty when in sync."""
+        with self._db.read():
+            return self._agg.check(self._repo)
+
     # ------------ Helpers ------------
+    def _row(self, person_type: str, id_: str):
+        rows = self._repo.get_rows(person_type, [id_])
+        return rows[0] if rows else None
+
+    def _find_by_name(self, person_type: str, name: str):
+        found = self._repo.find_by_name(person_type, name, limit=1)
+        return found[0] if found else None
+
+    def card_sort_key(self, person_type: str):
+        """Total order of the cards in the current sort mode (the pages' order), so pulled rows can be placed without a re-sort."""
+        return page_sort_key(person_type.lower(), self._sort_mode)
+
     def _snapshot(self) -> Dict[str, List[object]]:
         try:
-            teachers = self._repo.list_teachers()
-            assistants = self._repo.list_assistants()
-            students = self._repo.list_students()
-
-            mode = self._sort_mode
-            if mode == "Name":
-                key = lambda o: str(getattr(o, "name", "")).casefold()
-                teachers.sort(key=key)
-                assistants.sort(key=key)
-                students.sort(key=key)
-
-            elif mode == "Grade":
-                students.sort(key=lambda o: int(getattr(o, "grade", 0)), reverse=True)
-                key = lambda o: str(getattr(o, "name", "")).casefold()
-                teachers.sort(key=key)
-                assistants.sort(key=key)
-
-            elif mode == "Salary":
-                teachers.sort(key=lambda o: float(getattr(o, "salary", 0.0)), reverse=True)
-                assistants.sort(key=lambda o: float(getattr(o, "salary", 0.0)), reverse=True)
-                students.sort(key=lambda o: str(getattr(o, "name", "")).casefold())
-
+            with self._db.read():
+                # cardurile doar citesc câmpurile: proiecții, nu modele
+                teachers = list(self._repo.iter_teacher_rows())
+                assistants = list(self._repo.iter_assistant_rows())
+                students = list(self._repo.iter_student_rows())
+                # versiunea avansează doar împreună cu agregatele: altfel scrierile altui proces
+                # ar fi marcate ca văzute fără să ajungă vreodată în grafice
+                version = self._repo.data_version()
+                if version != self._version:
+                    self._agg.rebuild(self._repo)
+                self._version = version
+
+            teachers.sort(key=self.card_sort_key("Teacher"))
+            assistants.sort(key=self.card_sort_key("Assistant"))
+            students.sort(key=self.card_sort_key("Student"))
             return {"Teacher": teachers, "Assistant": assistants, "Student": students}
         except Exception:
             return {"Teacher": [], "Assistant": [], "Student": []}
 
     def _seed_random(self, counts: dict, seed: int | None) -> None:
-        synth = synthesize(counts, seed=seed)
-        for t in synth["Teacher"]:
-            self._repo.add_teacher(t)
-        for a in synth["Assistant"]:
-            self._repo.add_assistant(a)
-        for s in synth["Student"]:
-            self._repo.add_student(s)
+        # rândurile generate merg direct în copy_rows, bloc cu bloc, fără obiecte model
+        with self._db.bulk_load():
+            load_into(self._repo, counts, seed=seed)
@@ -1,11 +1,27 @@
+import math
+
+
 def _to_float(x, field: str) -> float:
     try:
-        return float(str(x).strip().replace(",", "."))
+        v = float(str(x).strip().replace(",", "."))
     except Exception:
         raise ValueError(f"{field} must be numeric")
+    if not math.isfinite(v):  # NaN/inf nu se pot stoca (NaN devine NULL în SQLite)
+        raise ValueError(f"{field} must be numeric")
+    return v
 
 def _to_int(x, field: str) -> int:
     try:
         return int(str(x).strip())
     except Exception:
         raise ValueError(f"{field} must be integer")
+
+
+def _sql_parser(parse, field: str):
+    """`parse` as a SQL function: the parsed value, or NULL where the model would reject it."""
+    def fn(x):
+        try:
+            return parse(x, field)
+        except ValueError:
+            return None
+    return fn
@@ -0,0 +1,28 @@
+from typing import Any
+from data.async_db import AsyncDatabase
+from repository.school_repository import SchoolRepository
+
+
+class AsyncSchoolRepository:
+    """Awaitable view of `SchoolRepository`.
+
+    Every public repository method becomes a coroutine that runs on the
+    `AsyncDatabase` executor; `iter_*` methods become async iterators.
+    """
+    def __init__(self, adb: AsyncDatabase):
+        self.adb = adb
+        self._repo = SchoolRepository(adb.db)
+
+    def __getattr__(self, name: str) -> Any:
+        attr = getattr(self._repo, name)
+        if name.startswith("_") or not callable(attr):
+            return attr
+
+        if name.startswith("iter_"):
+            def stream(*args: Any, **kwargs: Any):
+                return self.adb.stream(lambda: attr(*args, **kwargs), kwargs.get("chunk_size"))
+            return stream
+
+        async def call(*args: Any, **kwargs: Any) -> Any:
+            return await self.adb.run(attr, *args, **kwargs)
+        return call
@@ -1,9 +1,103 @@
-from typing import List
+import re
+from typing import Any, Callable, Iterable, Iterator, List, Optional
 from data.db import Database
+from data.migrations import SUMMARY_REBUILD
 from model.teacher import Teacher
 from model.assistant import Assistant
 from model.student import Student
-from repository._helpers import _to_float, _to_int
+from model.records import TeacherRow, AssistantRow, StudentRow, SearchHit, Change
+from model.caracteristica import Departament, Subject, Speciality
+from model.streaming_stats import GroupedStreamStats
+from repository._helpers import _sql_parser, _to_float, _to_int
+
+# Ordinea totală a listelor de persoane, aceeași în SQL și în Python:
+#   (cheia modului, nume pliat ASCII, id), toate crescător.
+# "Grade"/"Salary" sunt descrescătoare, deci cheia e -grade / -salary: o singură comparație de
+# row-value pentru keyset și indecși pe exact aceleași expresii (migrările 8-9).
+_PAGE_KEYS = {
+    "Name": None,
+    "Grade": "-grade",
+    "Salary": "-salary",
+}
+# ASCII A-Z -> a-z, exact ce face COLLATE NOCASE în SQLite (restul caracterelor rămân neschimbate)
+_NOCASE = str.maketrans("ABCDEFGHIJKLMNOPQRSTUVWXYZ", "abcdefghijklmnopqrstuvwxyz")
+# aceeași pliere în Postgres: translate() doar pe A-Z și comparație pe octeți (COLLATE "C"),
+# nu lower() (care pliază și non-ASCII) și nu colația locală
+_NAME_KEY_SQL = {
+    False: "name COLLATE NOCASE",
+    True: "translate(name, 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz') COLLATE \"C\"",
+}
+_ID_KEY_SQL = {False: "id", True: 'id COLLATE "C"'}
+
+
+def name_sort_key(obj) -> tuple:
+    """Python twin of the SQL "Name" order (folded name, id), for lists sorted in memory."""
+    return str(getattr(obj, "name", "")).translate(_NOCASE), str(getattr(obj, "id", ""))
+
+
+def page_sort_key(table: str, sort: str) -> Callable[[Any], tuple]:
+    """Python twin of the page order for `table` in sort mode `sort` (same fallback to "Name")."""
+    mode = sort if sort in _PAGE_SORTS[table] else "Name"
+    if mode == "Grade":
+        return lambda o: (-int(getattr(o, "grade", 0)),) + name_sort_key(o)
+    if mode == "Salary":
+        return lambda o: (-float(getattr(o, "salary", 0.0)),) + name_sort_key(o)
+    return name_sort_key
+
+
+# ce moduri are sens pentru fiecare tabel; restul cad pe "Name"
+_PAGE_SORTS = {
+    "teacher": ("Name", "Salary"),
+    "assistant": ("Name", "Salary"),
+    "student": ("Name", "Grade"),
+}
+
+PageCursor = tuple
+
+# rol -> (tabel, coloane, tipul proiecției)
+_ROWS = {
+    "Teacher": ("teacher", "id,name,salary,department_id,subject_id", TeacherRow),
+    "Assistant": ("assistant", "id,name,salary,department_id", AssistantRow),
+    "Student": ("student", "id,name,grade,speciality_id", StudentRow),
+}
+_IN_CHUNK = 500
+
+_ALL_SALARIES = "SELECT department_id, salary FROM teacher UNION ALL SELECT department_id, salary FROM assistant"
+
+# codurile de categorie (migrarea 7) -> nume pentru UI
+_DEPARTMENTS = Departament.ALLOWED_DEPARTMENTS
+_SUBJECTS = Subject.ALLOWED_SUBJECTS
+_SPECIALITIES = Speciality.ALLOWED_SPECIALTIES
+
+
+_WORD = re.compile(r"\w+")
+
+
+def _trigrams(terms: list[str]) -> list[str]:
+    grams = {t[i:i + 3] for t in terms for i in range(len(t) - 2)}
+    return sorted(grams)
+
+
+def _default_bins(n: int) -> int:
+    # aceeași regulă pe care o folosea graficul cu ax.hist
+    return min(10, max(5, int(n ** 0.5)))
+
+
+def _interpolate(values: dict[int, float], n: int, q: float) -> float:
+    k = (n - 1) * q
+    lo = int(k)
+    hi = min(lo + 1, n - 1)
+    return values[lo] + (values[hi] - values[lo]) * (k - lo)
+
+
+def _ranked(rows: list, labels: tuple) -> list[tuple[str, Any]]:
+    # cheile din __summary__ sunt coduri (text); ordonăm după valoare, apoi după nume
+    return sorted(((labels[int(k)], v) for k, v in rows), key=lambda x: (-x[1], x[0]))
+
+
+# se incrementează când se schimbă conversiile din normalize_db_values
+NORMALIZE_VERSION = "codes-2"
+
 
 class SchoolRepository:
     def __init__(self, db: Database):
@@ -11,22 +105,36 @@ class SchoolRepository:
 
     # ---------- Teacher ----------
     def add_teacher(self, t: Teacher) -> None:
+        # un singur rând: INSERT simplu, fără tabelul de staging al lui copy_rows
         self.db.execute(
-            "INSERT INTO teacher(id,name,salary,department,subject) VALUES(?,?,?,?,?)",
-            (t.id, t.name, _to_float(t.salary, "Salary"), t.department, t.subject),
+            "INSERT INTO teacher(id,name,salary,department_id,subject_id) VALUES(?,?,?,?,?)",
+            (t.id, t.name, _to_float(t.salary, "Salary"), t.department_id, t.subject_id),
+        )
+
+    def add_rows(self, role: str, rows: Iterable[tuple], batch_size: int | None = None) -> int:
+        """Bulk-loads ready-made rows (already validated, in the role's Row column order)."""
+        table, cols, _ = _ROWS[role]
+        return self.db.copy_rows(table, cols.split(","), rows, batch_size)
+
+    def add_teachers(self, teachers: Iterable[Teacher], batch_size: int | None = None) -> int:
+        return self.db.copy_rows(
+            "teacher",
+            ("id", "name", "salary", "department_id", "subject_id"),
+            ((t.id, t.name, _to_float(t.salary, "Salary"), t.department_id, t.subject_id) for t in teachers),
+            batch_size,
         )
 
     def update_teacher(self, t: Teacher) -> bool:
         self.db.execute(
-            "UPDATE teacher SET name=?, salary=?, department=?, subject=? WHERE id=?",
-            (t.name, _to_float(t.salary, "Salary"), t.department, t.subject, t.id),
+            "UPDATE teacher SET name=?, salary=?, department_id=?, subject_id=? WHERE id=?",
+            (t.name, _to_float(t.salary, "Salary"), t.department_id, t.subject_id, t.id),
         )
         return True
 
     def update_teacher_by_id(self, old_id: str, t: Teacher) -> bool:
         self.db.execute(
-            "UPDATE teacher SET id=?, name=?, salary=?, department=?, subject=? WHERE id=?",
-            (t.id, t.name, _to_float(t.salary, "Salary"), t.department, t.subject, old_id),
+            "UPDATE teacher SET id=?, name=?, salary=?, department_id=?, subject_id=? WHERE id=?",
+            (t.id, t.name, _to_float(t.salary, "Salary"), t.department_id, t.subject_id, old_id),
         )
         return True
 
@@ -35,27 +143,44 @@ class SchoolRepository:
         return True
 
     def list_teachers(self) -> List[Teacher]:
-        rows = self.db.query("SELECT id,name,salary,department,subject FROM teacher ORDER BY name")
-        return [Teacher(r[1], r[0], str(r[2]), r[3], r[4]) for r in rows]
+        return list(self.iter_teachers())
+
+    def iter_teachers(self, chunk_size: int | None = None) -> Iterator[Teacher]:
+        rows = self.db.iter_query(f"SELECT id,name,salary,department_id,subject_id FROM teacher ORDER BY {self._name_order()}", (), chunk_size)
+        for r in rows:
+            yield Teacher(r[1], r[0], str(r[2]), r[3], r[4])
+
+    def iter_teacher_rows(self, chunk_size: int | None = None) -> Iterator[TeacherRow]:
+        # proiecție: rândurile din DB sunt deja normalizate, nu mai construim modele
+        return map(TeacherRow._make, self.db.iter_query(
+            f"SELECT id,name,salary,department_id,subject_id FROM teacher ORDER BY {self._name_order()}", (), chunk_size))
 
     # ---------- Assistant ----------
     def add_assistant(self, a: Assistant) -> None:
         self.db.execute(
-            "INSERT INTO assistant(id,name,salary,department) VALUES(?,?,?,?)",
-            (a.id, a.name, _to_float(a.salary, "Salary"), a.department),
+            "INSERT INTO assistant(id,name,salary,department_id) VALUES(?,?,?,?)",
+            (a.id, a.name, _to_float(a.salary, "Salary"), a.department_id),
+        )
+
+    def add_assistants(self, assistants: Iterable[Assistant], batch_size: int | None = None) -> int:
+        return self.db.copy_rows(
+            "assistant",
+            ("id", "name", "salary", "department_id"),
+            ((a.id, a.name, _to_float(a.salary, "Salary"), a.department_id) for a in assistants),
+            batch_size,
         )
 
     def update_assistant(self, a: Assistant) -> bool:
         self.db.execute(
-            "UPDATE assistant SET name=?, salary=?, department=? WHERE id=?",
-            (a.name, _to_float(a.salary, "Salary"), a.department, a.id),
+            "UPDATE assistant SET name=?, salary=?, department_id=? WHERE id=?",
+            (a.name, _to_float(a.salary, "Salary"), a.department_id, a.id),
         )
         return True
 
     def update_assistant_by_id(self, old_id: str, a: Assistant) -> bool:
         self.db.execute(
-            "UPDATE assistant SET id=?, name=?, salary=?, department=? WHERE id=?",
-            (a.id, a.name, _to_float(a.salary, "Salary"), a.department, old_id),
+            "UPDATE assistant SET id=?, name=?, salary=?, department_id=? WHERE id=?",
+            (a.id, a.name, _to_float(a.salary, "Salary"), a.department_id, old_id),
         )
         return True
 
@@ -64,27 +189,43 @@ class SchoolRepository:
         return True
 
     def list_assistants(self) -> List[Assistant]:
-        rows = self.db.query("SELECT id,name,salary,department FROM assistant ORDER BY name")
-        return [Assistant(r[1], r[0], str(r[2]), r[3]) for r in rows]
+        return list(self.iter_assistants())
+
+    def iter_assistants(self, chunk_size: int | None = None) -> Iterator[Assistant]:
+        rows = self.db.iter_query(f"SELECT id,name,salary,department_id FROM assistant ORDER BY {self._name_order()}", (), chunk_size)
+        for r in rows:
+            yield Assistant(r[1], r[0], str(r[2]), r[3])
+
+    def iter_assistant_rows(self, chunk_size: int | None = None) -> Iterator[AssistantRow]:
+        return map(AssistantRow._make, self.db.iter_query(
+            f"SELECT id,name,salary,department_id FROM assistant ORDER BY {self._name_order()}", (), chunk_size))
 
     # ---------- Student ----------
     def add_student(self, s: Student) -> None:
         self.db.execute(
-            "INSERT INTO student(id,name,grade,speciality) VALUES(?,?,?,?)",
-            (s.id, s.name, _to_int(s.grade, "Grade"), s.speciality),
+            "INSERT INTO student(id,name,grade,speciality_id) VALUES(?,?,?,?)",
+            (s.id, s.name, _to_int(s.grade, "Grade"), s.speciality_id),
+        )
+
+    def add_students(self, students: Iterable[Student], batch_size: int | None = None) -> int:
+        return self.db.copy_rows(
+            "student",
+            ("id", "name", "grade", "speciality_id"),
+            ((s.id, s.name, _to_int(s.grade, "Grade"), s.speciality_id) for s in students),
+            batch_size,
         )
 
     def update_student(self, s: Student) -> bool:
         self.db.execute(
-            "UPDATE student SET name=?, grade=?, speciality=? WHERE id=?",
-            (s.name, _to_int(s.grade, "Grade"), s.speciality, s.id),
+            "UPDATE student SET name=?, grade=?, speciality_id=? WHERE id=?",
+            (s.name, _to_int(s.grade, "Grade"), s.speciality_id, s.id),
         )
         return True
 
     def update_student_by_id(self, old_id: str, s: Student) -> bool:
         self.db.execute(
-            "UPDATE student SET id=?, name=?, grade=?, speciality=? WHERE id=?",
-            (s.id, s.name, _to_int(s.grade, "Grade"), s.speciality, old_id),
+            "UPDATE student SET id=?, name=?, grade=?, speciality_id=? WHERE id=?",
+            (s.id, s.name, _to_int(s.grade, "Grade"), s.speciality_id, old_id),
         )
         return True
 
@@ -93,75 +234,479 @@ class SchoolRepository:
         return True
 
     def list_students(self) -> List[Student]:
-        rows = self.db.query("SELECT id,name,grade,speciality FROM student ORDER BY name")
-        return [Student(r[1], r[0], str(r[2]), r[3]) for r in rows]
+        return list(self.iter_students())
+
+    def iter_students(self, chunk_size: int | None = None) -> Iterator[Student]:
+        rows = self.db.iter_query(f"SELECT id,name,grade,speciality_id FROM student ORDER BY {self._name_order()}", (), chunk_size)
+        for r in rows:
+            yield Student(r[1], r[0], str(r[2]), r[3])
+
+    def iter_student_rows(self, chunk_size: int | None = None) -> Iterator[StudentRow]:
+        return map(StudentRow._make, self.db.iter_query(
+            f"SELECT id,name,grade,speciality_id FROM student ORDER BY {self._name_order()}", (), chunk_size))
+
+    # ---------- Upserts ----------
+    def upsert_many_teachers(self, teachers: Iterable[Teacher]) -> dict:
+        return self._upsert_many(
+            "teacher", ("id", "name", "salary", "department_id", "subject_id"), teachers,
+            lambda t: (t.id, t.name, _to_float(t.salary, "Salary"), t.department_id, t.subject_id),
+        )
+
+    def upsert_many_assistants(self, assistants: Iterable[Assistant]) -> dict:
+        return self._upsert_many(
+            "assistant", ("id", "name", "salary", "department_id"), assistants,
+            lambda a: (a.id, a.name, _to_float(a.salary, "Salary"), a.department_id),
+        )
+
+    def upsert_many_students(self, students: Iterable[Student]) -> dict:
+        return self._upsert_many(
+            "student", ("id", "name", "grade", "speciality_id"), students,
+            lambda s: (s.id, s.name, _to_int(s.grade, "Grade"), s.speciality_id),
+        )
+
+    def _upsert_many(self, table: str, cols: tuple, items: Iterable[Any], to_row: Callable[[Any], tuple]) -> dict:
+        """INSERT ... ON CONFLICT(id) DO UPDATE for a whole import, in one transaction.
+
+        Rows failing validation are rejected (reported, not written); rows
+        identical to what is stored are left untouched. Returns the counts of
+        inserted/updated/unchanged/rejected rows plus the rejection errors.
+        """
+        rows: dict[Any, tuple] = {}
+        errors: list[tuple[Any, str]] = []
+        for obj in items:
+            try:
+                row = to_row(obj)
+            except ValueError as e:
+                errors.append((getattr(obj, "id", None), str(e)))
+                continue
+            rows[row[0]] = row  # același id de două ori: ultimul câștigă
+
+        data = list(rows.values())
+        result = {"inserted": 0, "updated": 0, "unchanged": 0, "rejected": len(errors), "errors": errors}
+        if not data:
+            return result
+
+        rest = [c for c in cols if c != "id"]
+        differs = "IS DISTINCT FROM" if self.db.is_postgres() else "IS NOT"
+        sql = (
+            f"INSERT INTO {table}({','.join(cols)}) VALUES({','.join('?' for _ in cols)}) "
+            f"ON CONFLICT(id) DO UPDATE SET {', '.join(f'{c}=excluded.{c}' for c in rest)} "
+            f"WHERE ({', '.join(f'{table}.{c}' for c in rest)}) {differs} ({', '.join(f'excluded.{c}' for c in rest)})"
+        )
+        try:
+            with self.db.transaction() as cur:
+                existing = 0
+                ids = [r[0] for r in data]
+                for i in range(0, len(ids), 500):
+                    chunk = ids[i:i + 500]
+                    cur.execute(f"SELECT COUNT(*) FROM {table} WHERE id IN ({','.join('?' for _ in chunk)})", chunk)
+                    existing += cur.fetchone()[0]
+                cur.executemany(sql, data)
+                written = max(0, cur.rowcount)
+        except self.db.integrity_errors() as e:
+            raise ValueError(f"Integrity error: {e}")
+
+        result["inserted"] = len(data) - existing
+        result["updated"] = max(0, written - result["inserted"])
+        result["unchanged"] = existing - result["updated"]
+        return result
+
+    # ---------- Indexed lookups ----------
+    def get_teacher(self, id_: str) -> Optional[Teacher]:
+        rows = self.db.query("SELECT id,name,salary,department_id,subject_id FROM teacher WHERE id=?", (id_,))
+        return Teacher(rows[0][1], rows[0][0], str(rows[0][2]), rows[0][3], rows[0][4]) if rows else None
+
+    def get_assistant(self, id_: str) -> Optional[Assistant]:
+        rows = self.db.query("SELECT id,name,salary,department_id FROM assistant WHERE id=?", (id_,))
+        return Assistant(rows[0][1], rows[0][0], str(rows[0][2]), rows[0][3]) if rows else None
+
+    def get_student(self, id_: str) -> Optional[Student]:
+        rows = self.db.query("SELECT id,name,grade,speciality_id FROM student WHERE id=?", (id_,))
+        return Student(rows[0][1], rows[0][0], str(rows[0][2]), rows[0][3]) if rows else None
+
+    def get(self, role: str, id_: str):
+        if role == "Teacher":
+            return self.get_teacher(id_)
+        if role == "Assistant":
+            return self.get_assistant(id_)
+        if role == "Student":
+            return self.get_student(id_)
+        return None
+
+    def find_by_name(self, role: str, name: str, limit: int | None = None) -> list:
+        # folosește idx_<rol>_name (name, id); rezultatele vin ordonate după id
+        lim = "" if limit is None else f" LIMIT {int(limit)}"
+        if role == "Teacher":
+            rows = self.db.query(f"SELECT id,name,salary,department_id,subject_id FROM teacher WHERE name=? ORDER BY id{lim}", (name,))
+            return [Teacher(r[1], r[0], str(r[2]), r[3], r[4]) for r in rows]
+        if role == "Assistant":
+            rows = self.db.query(f"SELECT id,name,salary,department_id FROM assistant WHERE name=? ORDER BY id{lim}", (name,))
+            return [Assistant(r[1], r[0], str(r[2]), r[3]) for r in rows]
+        if role == "Student":
+            rows = self.db.query(f"SELECT id,name,grade,speciality_id FROM student WHERE name=? ORDER BY id{lim}", (name,))
+            return [Student(r[1], r[0], str(r[2]), r[3]) for r in rows]
+        return []
+
+    def get_rows(self, role: str, ids: Iterable[str]) -> list:
+        """Row projections for the given ids (missing ids are skipped)."""
+        if role not in _ROWS:
+            return []
+        table, cols, record = _ROWS[role]
+        ids = list(dict.fromkeys(ids))
+        out = []
+        for i in range(0, len(ids), _IN_CHUNK):
+            chunk = ids[i:i + _IN_CHUNK]
+            marks = ",".join("?" * len(chunk))
+            out.extend(map(record._make, self.db.query(f"SELECT {cols} FROM {table} WHERE id IN ({marks})", chunk)))
+        return out
+
+    def max_id_number(self, role: str, prefix: str) -> int:
+        """Largest N among ids of the form `<prefix><digits>` for `role` (0 when there are none)."""
+        table = _ROWS[role][0]
+        n = len(prefix) + 1
+        if self.db.is_postgres():
+            sql = f"SELECT MAX(CAST(substr(id, {n}) AS BIGINT)) FROM {table} WHERE id ~ ?"
+            params = ("^" + re.escape(prefix) + "[0-9]+$",)
+        else:
+            sql = (f"SELECT MAX(CAST(substr(id, {n}) AS INTEGER)) FROM {table} "
+                   f"WHERE substr(id, 1, {n - 1}) = ? AND length(id) >= {n} AND NOT substr(id, {n}) GLOB '*[^0-9]*'")
+            params = (prefix,)
+        return int(self.db.scalar(sql, params) or 0)
+
+    @staticmethod
+    def row_of(role: str, obj):
+        """The row projection a model would be stored as (same conversions as the writes, no query)."""
+        if role == "Teacher":
+            return TeacherRow(obj.id, obj.name, _to_float(obj.salary, "Salary"), obj.department_id, obj.subject_id)
+        if role == "Assistant":
+            return AssistantRow(obj.id, obj.name, _to_float(obj.salary, "Salary"), obj.department_id)
+        if role == "Student":
+            return StudentRow(obj.id, obj.name, _to_int(obj.grade, "Grade"), obj.speciality_id)
+        return None
+
+    # ---------- Change log ----------
+    def data_version(self) -> int:
+        """Version of the last logged change; grows with every insert/update/delete."""
+        return int(self.db.scalar("SELECT COALESCE(MAX(version), 0) FROM __changes__") or 0)
+
+    def changes_since(self, version: int, limit: int | None = None) -> Optional[list[Change]]:
+        """Logged changes after `version`, oldest first.
+
+        Returns None when the log was pruned past `version`; the caller must
+        then reload everything and continue from data_version().
+        """
+        with self.db.read():
+            pruned = int(self._meta("changes_pruned_through") or 0)
+            if version < pruned:
+                return None
+            lim = "" if limit is None else f" LIMIT {int(limit)}"
+            rows = self.db.query(f"SELECT version, role, id, op FROM __changes__ WHERE version > ? ORDER BY version{lim}",
+                                 (int(version),))
+        return [Change(*r) for r in rows]
+
+    def prune_changes(self, through_version: int) -> int:
+        """Drops log entries up to `through_version`; readers older than that get None from changes_since."""
+        with self.db.transaction() as cur:
+            # păstrăm mereu ultima intrare, ca data_version() să nu dea înapoi
+            cur.execute("SELECT COALESCE(MAX(version), 0) FROM __changes__")
+            through = min(int(through_version), int(cur.fetchone()[0]) - 1)
+            if through <= int(self._meta("changes_pruned_through") or 0):
+                return 0
+            cur.execute("DELETE FROM __changes__ WHERE version <= ?", (through,))
+            n = max(0, cur.rowcount)
+            self._set_meta(cur, "changes_pruned_through", str(through))
+        return n
+
+    # ---------- Search ----------
+    def search(self, text: str, roles: Iterable[str] | None = None, department: str | int | None = None,
+               speciality: str | int | None = None, fuzzy: bool = False,
+               limit: int = 20, offset: int = 0) -> list[SearchHit]:
+        """Ranked people search over search_doc (kept in sync by triggers, migration 5).
+
+        Default mode matches every word as a prefix ("ale sto" finds "Alex
+        Stoica"); fuzzy mode ranks by shared trigrams, so typos still match.
+        Best matches come first; page with limit/offset.
+        """
+        terms = [t.casefold() for t in _WORD.findall(text or "")]
+        if not terms:
+            return []
+        grams = _trigrams(terms) if fuzzy else []
+
+        where, params = [], []
+        roles = list(roles or [])
+        if roles:
+            where.append(f"d.role IN ({','.join('?' * len(roles))})")
+            params += roles
+        if department is not None:
+            where.append("d.department_id = ?")
+            params.append(Departament.department_code(department))
+        if speciality is not None:
+            where.append("d.speciality_id = ?")
+            params.append(Speciality.speciality_code(speciality))
+        filters = "".join(f" AND {w}" for w in where)
+        cols = "d.role, d.id, d.name, d.department_id, d.speciality_id"
+
+        if self.db.is_postgres():
+            if grams:
+                q = " ".join(terms)
+                sql = (f"SELECT {cols}, similarity(d.name, ?) AS score FROM search_doc d "
+                       f"WHERE d.name % ?{filters} ORDER BY score DESC, d.name, d.id LIMIT ? OFFSET ?")
+                args = [q, q, *params]
+            else:
+                q = " & ".join(f"{t}:*" for t in terms)
+                sql = (f"SELECT {cols}, ts_rank(d.tsv, q) AS score FROM search_doc d, to_tsquery('simple', ?) q "
+                       f"WHERE d.tsv @@ q{filters} ORDER BY score DESC, d.name, d.id LIMIT ? OFFSET ?")
+                args = [q, *params]
+        else:
+            # termenii sub 3 caractere nu au trigrame: cădem pe căutarea prefix
+            fts = "person_trgm" if grams else "person_fts"
+            q = " OR ".join(f'"{g}"' for g in grams) if grams else " ".join(f'"{t}"*' for t in terms)
+            sql = (f"SELECT {cols}, -{fts}.rank AS score FROM {fts} JOIN search_doc d ON d.docid = {fts}.rowid "
+                   f"WHERE {fts} MATCH ?{filters} ORDER BY {fts}.rank, d.name, d.id LIMIT ? OFFSET ?")
+            args = [q, *params]
+        rows = self.db.query(sql, (*args, int(limit), int(offset)))
+        return [SearchHit(r[0], r[1], r[2], r[3], r[4], float(r[5])) for r in rows]
+
+    # ---------- Keyset pagination ----------
+    def page_teachers(self, sort: str = "Name", after: Optional[PageCursor] = None,
+                      limit: int = 50) -> tuple[List[Teacher], Optional[PageCursor]]:
+        return self._page(
+            "teacher", "id,name,salary,department_id,subject_id", sort, after, limit,
+            lambda r: Teacher(r[1], r[0], str(r[2]), r[3], r[4]),
+        )
+
+    def page_assistants(self, sort: str = "Name", after: Optional[PageCursor] = None,
+                        limit: int = 50) -> tuple[List[Assistant], Optional[PageCursor]]:
+        return self._page(
+            "assistant", "id,name,salary,department_id", sort, after, limit,
+            lambda r: Assistant(r[1], r[0], str(r[2]), r[3]),
+        )
+
+    def page_students(self, sort: str = "Name", after: Optional[PageCursor] = None,
+                      limit: int = 50) -> tuple[List[Student], Optional[PageCursor]]:
+        return self._page(
+            "student", "id,name,grade,speciality_id", sort, after, limit,
+            lambda r: Student(r[1], r[0], str(r[2]), r[3]),
+        )
+
+    def _name_order(self) -> str:
+        # ordinea "Name" a stream-urilor = cea a paginilor (idx_<tabel>_name_nocase)
+        pg = self.db.is_postgres()
+        return f"{_NAME_KEY_SQL[pg]}, {_ID_KEY_SQL[pg]}"
+
+    def _order_keys(self, table: str, sort: str) -> list[str]:
+        # expresiile ordinii totale (vezi _PAGE_KEYS), în dialectul bazei curente
+        pg = self.db.is_postgres()
+        lead = _PAGE_KEYS[sort if sort in _PAGE_SORTS[table] else "Name"]
+        return ([lead] if lead else []) + [_NAME_KEY_SQL[pg], _ID_KEY_SQL[pg]]
+
+    def _page(self, table: str, cols: str, sort: str, after: Optional[PageCursor], limit: int,
+              build: Callable[[tuple], Any]) -> tuple[list, Optional[PageCursor]]:
+        """One page in the total order (mode key, folded name, id), starting strictly after `after`.
+
+        The cursor is the last row's order key, so every page is an index
+        range scan of `limit` rows no matter how deep it is. Returns the items
+        and the cursor for the next page, or None on the last page.
+        """
+        limit = int(limit)
+        if limit <= 0:
+            raise ValueError("limit must be positive")
+        keys = self._order_keys(table, sort)
+        key_list = ", ".join(keys)
+        where, params = "", []
+        if after is not None:
+            where = f"WHERE ({key_list}) > ({', '.join('?' * len(keys))})"
+            params = list(after)
+        # un rând în plus ne spune dacă mai există o pagină
+        rows = self.db.query(
+            f"SELECT {cols}, {key_list} FROM {table} {where} ORDER BY {key_list} LIMIT ?",
+            (*params, limit + 1),
+        )
+        more = len(rows) > limit
+        rows = rows[:limit]
+        cursor = tuple(rows[-1][-len(keys):]) if more and rows else None
+        return [build(r) for r in rows], cursor
 
     # ---------- Aggregations for charts ----------
+    # agregatele de dashboard vin din __summary__, ținut la zi de triggere (migrarea 4)
     def counts_by_role(self) -> list[tuple[str,int]]:
-        t = self.db.scalar("SELECT COUNT(*) FROM teacher") or 0
-        a = self.db.scalar("SELECT COUNT(*) FROM assistant") or 0
-        s = self.db.scalar("SELECT COUNT(*) FROM student") or 0
-        return [("Teacher", t), ("Assistant", a), ("Student", s)]
+        counts = dict(self.db.query("SELECT key, n FROM __summary__ WHERE kind='role'"))
+        return [(role, counts.get(role) or 0) for role in ("Teacher", "Assistant", "Student")]
 
     def students_by_speciality(self) -> list[tuple[str,int]]:
-        return self.db.query(
-            "SELECT speciality, COUNT(*) FROM student GROUP BY speciality ORDER BY COUNT(*) DESC, speciality ASC"
-        )
+        return _ranked(self.db.query("SELECT key, n FROM __summary__ WHERE kind='speciality' AND n > 0"), _SPECIALITIES)
 
     def avg_salary_by_department(self) -> list[tuple[str,float]]:
-        return self.db.query(
-            """
-            SELECT department, AVG(salary) AS avg_sal FROM (
-                SELECT department, salary FROM teacher
-                UNION ALL
-                SELECT department, salary FROM assistant
-            ) x GROUP BY department ORDER BY avg_sal DESC, department ASC
-            """
+        return _ranked(
+            self.db.query("SELECT key, total / n FROM __summary__ WHERE kind='department' AND n > 0"), _DEPARTMENTS
         )
 
     def teachers_by_subject(self) -> list[tuple[str,int]]:
-        return self.db.query(
-            "SELECT subject, COUNT(*) FROM teacher GROUP BY subject ORDER BY COUNT(*) DESC, subject ASC"
-        )
+        return _ranked(self.db.query("SELECT key, n FROM __summary__ WHERE kind='subject' AND n > 0"), _SUBJECTS)
+
+    def summary_rows(self) -> list[tuple[str, str, int, float]]:
+        """Raw (kind, key, n, total) counters from __summary__; O(number of categories)."""
+        return self.db.query("SELECT kind, key, n, total FROM __summary__")
+
+    def rebuild_summaries(self) -> None:
+        """Recomputes __summary__ from the base tables (after manual edits or float drift)."""
+        with self.db.transaction() as cur:
+            for sql in SUMMARY_REBUILD:
+                cur.execute(sql)
 
     def salaries_series(self) -> list[float]:
-        rows = self.db.query("SELECT salary FROM teacher UNION ALL SELECT salary FROM assistant")
-        return [float(r[0]) for r in rows]
+        return list(self.iter_salaries())
+
+    def iter_salaries(self, chunk_size: int | None = None) -> Iterator[float]:
+        rows = self.db.iter_query("SELECT salary FROM teacher UNION ALL SELECT salary FROM assistant", (), chunk_size)
+        for r in rows:
+            yield float(r[0])
 
     def student_grades_series(self) -> list[int]:
-        rows = self.db.query("SELECT grade FROM student")
-        return [int(r[0]) for r in rows]
+        return list(self.iter_grades())
+
+    def iter_grades(self, chunk_size: int | None = None) -> Iterator[int]:
+        for r in self.db.iter_query("SELECT grade FROM student", (), chunk_size):
+            yield int(r[0])
 
     def salary_by_department_groups(self) -> list[tuple[str, list[float]]]:
-        rows = self.db.query(
+        groups: dict[str, list[float]] = {}
+        for dep, sal in self.iter_department_salaries():
+            groups.setdefault(dep, []).append(sal)
+        return sorted(groups.items(), key=lambda x: x[0])
+
+    def iter_department_salaries(self, chunk_size: int | None = None) -> Iterator[tuple[str, float]]:
+        rows = self.db.iter_query(
             """
-            SELECT department, salary FROM (
-                SELECT department, salary FROM teacher
+            SELECT department_id, salary FROM (
+                SELECT department_id, salary FROM teacher
                 UNION ALL
-                SELECT department, salary FROM assistant
+                SELECT department_id, salary FROM assistant
             )
-            ORDER BY department
-            """
+            ORDER BY department_id
+            """,
+            (),
+            chunk_size,
         )
-        groups: dict[str, list[float]] = {}
         for dep, sal in rows:
-            groups.setdefault(dep, []).append(float(sal))
-        return sorted(groups.items(), key=lambda x: x[0])
+            yield _DEPARTMENTS[dep], float(sal)
 
-    # ---------- DB normalization (defensive) ----------
-    def normalize_db_values(self) -> None:
-        for t in self.list_teachers():
-            self.db.execute(
-                "UPDATE teacher SET name=?, salary=?, department=?, subject=? WHERE id=?",
-                (t.name, _to_float(t.salary, "Salary"), t.department, t.subject, t.id),
-            )
-        for a in self.list_assistants():
-            self.db.execute(
-                "UPDATE assistant SET name=?, salary=?, department=? WHERE id=?",
-                (a.name, _to_float(a.salary, "Salary"), a.department, a.id),
+    # ---------- streaming summaries ----------
+    def salary_stream_stats(self, k: int = 200, chunk_size: int | None = None) -> GroupedStreamStats:
+        """Mean/stddev/quantile summaries of salaries per department in bounded memory."""
+        return GroupedStreamStats(k).consume(self.iter_department_salaries(chunk_size))
+
+    def grade_stream_stats(self, k: int = 200, chunk_size: int | None = None) -> GroupedStreamStats:
+        """Same for grades per speciality."""
+        return GroupedStreamStats(k).consume((r.speciality, r.grade) for r in self.iter_student_rows(chunk_size))
+
+    # ---------- precomputed distributions ----------
+    def salary_histogram(self, bins: int | None = None) -> tuple[list[float], list[int]]:
+        return self._histogram(f"SELECT salary AS v FROM ({_ALL_SALARIES}) s", bins)
+
+    def grade_histogram(self, bins: int | None = None) -> tuple[list[float], list[int]]:
+        return self._histogram("SELECT grade AS v FROM student", bins)
+
+    def _histogram(self, source: str, bins: int | None) -> tuple[list[float], list[int]]:
+        """Bins `v` of `source` in SQL; returns (edges, counts) with len(edges) == len(counts) + 1.
+
+        Bins are equal-width over [min, max], the last one closed like numpy's.
+        """
+        with self.db.read():
+            lo, hi, n = self.db.query(f"SELECT MIN(v), MAX(v), COUNT(*) FROM ({source}) h")[0]
+            if not n:
+                return [], []
+            lo, hi = float(lo), float(hi)
+            if bins is None:
+                bins = _default_bins(n)
+            if hi == lo:
+                return [lo - 0.5, lo + 0.5], [n]
+            width = (hi - lo) / bins
+            # v - lo >= 0, deci trunchierea e floor; pe Postgres CAST rotunjește
+            bucket = "FLOOR((v - ?) / ?)" if self.db.is_postgres() else "CAST((v - ?) / ? AS INTEGER)"
+            rows = self.db.query(f"SELECT {bucket} AS b, COUNT(*) FROM ({source}) h GROUP BY b", (lo, width))
+        counts = [0] * bins
+        for b, c in rows:
+            counts[min(int(b), bins - 1)] += c
+        return [lo + i * width for i in range(bins)] + [hi], counts
+
+    def salary_box_stats(self) -> list[dict]:
+        """Five-number summary plus mean of salaries per department, computed in SQL.
+
+        Only the rows at the quartile positions leave the database (at most
+        eight per department); quartiles interpolate linearly like numpy.
+        """
+        rows = self.db.query(
+            f"""
+            WITH r AS (
+                SELECT department_id, salary,
+                       ROW_NUMBER() OVER (PARTITION BY department_id ORDER BY salary) - 1 AS pos,
+                       COUNT(*) OVER (PARTITION BY department_id) AS n,
+                       AVG(salary) OVER (PARTITION BY department_id) AS mean
+                FROM ({_ALL_SALARIES}) s
             )
-        for s in self.list_students():
-            self.db.execute(
-                "UPDATE student SET name=?, grade=?, speciality=? WHERE id=?",
-                (s.name, _to_int(s.grade, "Grade"), s.speciality, s.id),
+            SELECT department_id, pos, salary, n, mean FROM r
+            WHERE pos IN (0, n - 1, (n - 1) / 4, (n - 1) / 4 + 1, (n - 1) / 2, (n - 1) / 2 + 1,
+                          3 * (n - 1) / 4, 3 * (n - 1) / 4 + 1)
+            ORDER BY department_id, pos
+            """
+        )
+        by_dep: dict[str, tuple[int, float, dict[int, float]]] = {}
+        for dep, pos, sal, n, mean in rows:
+            by_dep.setdefault(_DEPARTMENTS[dep], (int(n), float(mean), {}))[2][int(pos)] = float(sal)
+        out = []
+        for dep, (n, mean, values) in by_dep.items():
+            out.append({
+                "label": dep, "n": n,
+                "min": values[0], "q1": _interpolate(values, n, 0.25), "median": _interpolate(values, n, 0.5),
+                "q3": _interpolate(values, n, 0.75), "max": values[n - 1], "mean": mean,
+            })
+        return sorted(out, key=lambda b: b["label"])
+
+    # ---------- DB normalization (defensive) ----------
+    def normalize_db_values(self, force: bool = False) -> int:
+        """Rewrites numbers stored as text the way the models would parse them.
+
+        Categories need no pass: they are codes checked by foreign keys
+        (migration 7). Runs as set-based UPDATEs that touch only rows that
+        differ, and is skipped entirely when __meta__ says nothing was flagged
+        dirty since the last run. Returns the number of rows changed.
+        """
+        if not force and self._meta("normalize_version") == NORMALIZE_VERSION and self._meta("normalize_dirty") == "0":
+            return 0
+
+        statements = []
+        pg = self.db.is_postgres()
+        if not pg:
+            # SQLite păstrează ca TEXT ce nu a putut converti (ex. "1,5"); Postgres are tipuri stricte.
+            # Ce e număr valid decid chiar parserele modelului (_to_float/_to_int), ca funcții SQL.
+            for table in ("teacher", "assistant"):
+                statements.append(
+                    f"UPDATE {table} SET salary=__to_float(salary) "
+                    f"WHERE typeof(salary)<>'real' AND __to_float(salary) IS NOT NULL"
+                )
+            statements.append(
+                "UPDATE student SET grade=__to_int(grade) WHERE typeof(grade)<>'integer' AND __to_int(grade) IS NOT NULL"
             )
+
+        changed = 0
+        with self.db.transaction() as cur:
+            if not pg:
+                cur.connection.create_function("__to_float", 1, _sql_parser(_to_float, "Salary"), deterministic=True)
+                cur.connection.create_function("__to_int", 1, _sql_parser(_to_int, "Grade"), deterministic=True)
+            for sql in statements:
+                cur.execute(sql)
+                changed += max(0, cur.rowcount)
+            self._set_meta(cur, "normalize_version", NORMALIZE_VERSION)
+            self._set_meta(cur, "normalize_dirty", "0")
+        return changed
+
+    def _meta(self, key: str) -> Optional[str]:
+        return self.db.scalar("SELECT value FROM __meta__ WHERE key=?", (key,))
+
+    @staticmethod
+    def _set_meta(cur: Any, key: str, value: str) -> None:
+        cur.execute(
+            "INSERT INTO __meta__(key, value) VALUES(?, ?) ON CONFLICT(key) DO UPDATE SET value=excluded.value",
+            (key, value),
+        )
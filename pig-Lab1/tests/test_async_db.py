@@ -0,0 +1,97 @@
+import asyncio
+import os
+import tempfile
+import unittest
+from data.db_config import DBConfig
+from data.async_db import AsyncDatabase
+from repository.async_repository import AsyncSchoolRepository
+from model.student import Student
+
+
+class TestAsyncDatabase(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self._old_path = DBConfig.SQLITE_PATH
+        DBConfig.SQLITE_PATH = os.path.join(self._tmp.name, "test.db")
+
+    def tearDown(self):
+        DBConfig.SQLITE_PATH = self._old_path
+        self._tmp.cleanup()
+
+    async def test_repository_calls_and_streaming(self):
+        async with AsyncDatabase() as adb:
+            repo = AsyncSchoolRepository(adb)
+            n = await repo.add_students(Student(f"Name {i}", f"S-{i}", "7", "Physics") for i in range(30))
+            self.assertEqual(n, 30)
+            counts = await asyncio.gather(repo.counts_by_role(), adb.scalar("SELECT COUNT(*) FROM student"))
+            self.assertEqual(counts[0][2], ("Student", 30))
+            self.assertEqual(counts[1], 30)
+            ids = [s.id async for s in repo.iter_students(chunk_size=7)]
+            self.assertEqual(len(ids), 30)
+            rows = [r async for r in adb.iter_query("SELECT id FROM student", (), 4)]
+            self.assertEqual(len(rows), 30)
+
+    async def test_await_inside_stream_without_pool(self):
+        async with AsyncDatabase() as adb:
+            self.assertEqual(adb.db.pool_size(), 0)
+            repo = AsyncSchoolRepository(adb)
+            await repo.add_students(Student(f"Name {i}", f"S-{i}", "7", "Physics") for i in range(12))
+            seen = 0
+            async for _ in repo.iter_students(chunk_size=5):
+                counts = await asyncio.wait_for(repo.counts_by_role(), timeout=5)
+                self.assertEqual(counts[2], ("Student", 12 + seen))
+                await asyncio.wait_for(repo.add_student(Student("Late", f"L-{seen}", "5", "cs")), timeout=5)
+                seen += 1
+            self.assertEqual(seen, 12)  # stream-ul rămâne pe instantaneul de la început
+
+    async def test_stream_is_lazy_without_pool(self):
+        async with AsyncDatabase() as adb:
+            repo = AsyncSchoolRepository(adb)
+            await repo.add_students(Student(f"Name {i}", f"S-{i}", "7", "Physics") for i in range(40))
+            pulled = []
+
+            def rows():
+                for r in adb.db.iter_query("SELECT id FROM student ORDER BY id", (), 5):
+                    pulled.append(r)
+                    yield r
+
+            got = []
+            async for r in adb.stream(rows, 5):
+                got.append(r)
+                self.assertLessEqual(len(pulled), 5 * ((len(got) + 4) // 5))
+            self.assertEqual(len(got), 40)
+
+    async def test_query_stats_report_the_awaiting_caller(self):
+        async with AsyncDatabase() as adb:
+            repo = AsyncSchoolRepository(adb)
+            adb.db.enable_query_stats(slow_ms=1e9)
+            await repo.add_student(Student("Ana", "S-1", "7", "Physics"))
+            await adb.query("SELECT id FROM student WHERE grade = 7")
+            async for row in adb.iter_query("SELECT name FROM student", (), 2):
+                self.assertEqual(row, ("Ana",))
+            by_sql = {st["sql"]: st for st in adb.db.query_stats()}
+            me = "test_query_stats_report_the_awaiting_caller"
+            for sql in ("SELECT id FROM student WHERE grade = ?", "SELECT name FROM student"):
+                self.assertEqual([c for c, _ in by_sql[sql]["callers"]], [f"{__name__}.{me}"], sql)
+            # prin repository apelantul e metoda sincronă, ca la apelurile fără async
+            ins = next(st for sql, st in by_sql.items() if sql.startswith("INSERT INTO student"))
+            self.assertEqual([c for c, _ in ins["callers"]], ["repository.school_repository.add_student"])
+
+    async def test_await_inside_stream_with_pool(self):
+        old = DBConfig.POOL_SIZE
+        DBConfig.POOL_SIZE = 2
+        try:
+            async with AsyncDatabase() as adb:
+                repo = AsyncSchoolRepository(adb)
+                await repo.add_students(Student(f"Name {i}", f"S-{i}", "7", "Physics") for i in range(12))
+                seen = 0
+                async for _ in repo.iter_students(chunk_size=5):
+                    await asyncio.wait_for(repo.counts_by_role(), timeout=5)
+                    seen += 1
+                self.assertEqual(seen, 12)
+        finally:
+            DBConfig.POOL_SIZE = old
+
+
+if __name__ == "__main__":
+    unittest.main()
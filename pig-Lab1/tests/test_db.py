@@ -0,0 +1,200 @@
+import os
+import tempfile
+import threading
+import unittest
+from unittest import mock
+from data.db_config import DBConfig
+from data.db import Database
+from data.migrations import MIGRATIONS, latest_version
+from model.caracteristica import Departament, Speciality
+
+PHYSICS = Speciality.speciality_code("Physics")
+
+
+class TestDatabase(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self._old_path = DBConfig.SQLITE_PATH
+        DBConfig.SQLITE_PATH = os.path.join(self._tmp.name, "test.db")
+        self.db = Database("")
+
+    def tearDown(self):
+        self.db.close()
+        DBConfig.SQLITE_PATH = self._old_path
+        self._tmp.cleanup()
+
+    def test_execute_many_commits_per_batch(self):
+        rows = ((f"S-{i}", f"Student {i}", i % 10 + 1, PHYSICS) for i in range(25))
+        n = self.db.execute_many("INSERT INTO student(id,name,grade,speciality_id) VALUES(?,?,?,?)", rows, batch_size=10)
+        self.assertEqual(n, 25)
+        self.assertEqual(self.db.scalar("SELECT COUNT(*) FROM student"), 25)
+
+    def test_execute_many_integrity_error(self):
+        rows = [("S-1", "A", 5, PHYSICS), ("S-1", "B", 6, PHYSICS)]
+        with self.assertRaises(ValueError):
+            self.db.execute_many("INSERT INTO student(id,name,grade,speciality_id) VALUES(?,?,?,?)", rows)
+        # batch-ul eșuat nu lasă rânduri parțiale
+        self.assertEqual(self.db.scalar("SELECT COUNT(*) FROM student"), 0)
+
+    def test_checkpoint_every_n_commits(self):
+        self.db.close()
+        old = (DBConfig.CHECKPOINT_POLICY, DBConfig.CHECKPOINT_EVERY_COMMITS)
+        DBConfig.CHECKPOINT_POLICY, DBConfig.CHECKPOINT_EVERY_COMMITS = "commits", 3
+        try:
+            self.db = Database("")
+            before = self.db.checkpoint_stats()["checkpoints"]
+            for i in range(6):
+                self.db.execute("INSERT INTO student(id,name,grade,speciality_id) VALUES(?,?,?,?)", (f"S-{i}", "X", 5, PHYSICS))
+            stats = self.db.checkpoint_stats()
+            self.assertEqual(stats["policy"], "commits")
+            self.assertEqual(stats["checkpoints"] - before, 2)
+            self.assertGreaterEqual(stats["checkpoint_seconds"], 0.0)
+        finally:
+            DBConfig.CHECKPOINT_POLICY, DBConfig.CHECKPOINT_EVERY_COMMITS = old
+
+    def test_auto_policy_skips_explicit_checkpoints(self):
+        self.db.close()
+        old = DBConfig.CHECKPOINT_POLICY
+        DBConfig.CHECKPOINT_POLICY = "auto"
+        try:
+            self.db = Database("")
+            self.db.execute("INSERT INTO student(id,name,grade,speciality_id) VALUES(?,?,?,?)", ("S-1", "X", 5, PHYSICS))
+            stats = self.db.checkpoint_stats()
+            self.assertEqual(stats["checkpoints"], 0)
+            self.assertGreater(stats["wal_pages"], 0)
+        finally:
+            DBConfig.CHECKPOINT_POLICY = old
+
+    def test_reads_do_not_commit(self):
+        self.db.execute("INSERT INTO student(id,name,grade,speciality_id) VALUES(?,?,?,?)", ("S-1", "X", 5, PHYSICS))
+        commits = self.db.checkpoint_stats()["commits"]
+        with self.db.read():
+            self.assertEqual(self.db.scalar("SELECT COUNT(*) FROM student"), 1)
+            self.assertEqual(self.db.query("SELECT id FROM student"), [("S-1",)])
+            self.assertTrue(self.db._conn.in_transaction)
+        self.assertFalse(self.db._conn.in_transaction)
+        self.assertEqual(self.db.checkpoint_stats()["commits"], commits)
+
+    def test_iter_query_streams_in_chunks(self):
+        rows = ((f"S-{i:03d}", f"Student {i}", 5, PHYSICS) for i in range(7))
+        self.db.execute_many("INSERT INTO student(id,name,grade,speciality_id) VALUES(?,?,?,?)", rows)
+        it = self.db.iter_query("SELECT id FROM student ORDER BY id", (), chunk_size=3)
+        self.assertEqual(next(it), ("S-000",))
+        self.assertEqual([r[0] for r in it], [f"S-{i:03d}" for i in range(1, 7)])
+        self.assertFalse(self.db._conn.in_transaction)
+
+    def test_pool_mode_concurrent_reads_and_writes(self):
+        self.db.close()
+        old = DBConfig.POOL_SIZE
+        DBConfig.POOL_SIZE = 3
+        try:
+            self.db = Database("")
+            self.assertEqual(self.db.pool_size(), 3)
+            errors = []
+
+            def writer(k):
+                try:
+                    rows = ((f"S-{k}-{i}", "X", 5, PHYSICS) for i in range(50))
+                    self.db.execute_many("INSERT INTO student(id,name,grade,speciality_id) VALUES(?,?,?,?)", rows, batch_size=5)
+                except Exception as e:
+                    errors.append(e)
+
+            def reader():
+                try:
+                    for _ in range(20):
+                        with self.db.read():
+                            a = self.db.scalar("SELECT COUNT(*) FROM student")
+                            b = len(self.db.query("SELECT id FROM student"))
+                        self.assertEqual(a, b)  # aceeași tranzacție de citire
+                except Exception as e:
+                    errors.append(e)
+
+            threads = [threading.Thread(target=writer, args=(k,)) for k in range(3)]
+            threads += [threading.Thread(target=reader) for _ in range(4)]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+            self.assertEqual(errors, [])
+            self.assertEqual(self.db.scalar("SELECT COUNT(*) FROM student"), 150)
+        finally:
+            DBConfig.POOL_SIZE = old
+
+    def test_migrations_add_indexes(self):
+        self.assertEqual(self.db.schema_version(), latest_version())
+        plan = self.db.query("EXPLAIN QUERY PLAN SELECT id FROM student ORDER BY name")
+        self.assertIn("idx_student_name", " ".join(str(r[-1]) for r in plan))
+
+    def test_migrations_upgrade_old_database(self):
+        # o bază rămasă la v1: tabelele inițiale, cu categorii text (și aliasuri nenormalizate)
+        self.db.close()
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(DBConfig.SQLITE_PATH + suffix):
+                os.remove(DBConfig.SQLITE_PATH + suffix)
+        with mock.patch("data.db.MIGRATIONS", MIGRATIONS[:1]):
+            self.db = Database("")
+        self.db.execute_many("INSERT INTO teacher(id,name,salary,department,subject) VALUES(?,?,?,?,?)",
+                             [("T-1", "Ana", 1000.0, " hr ", "Physics"), ("T-2", "Bo", 3000.0, "Finance", "???")])
+        self.db.execute("INSERT INTO student(id,name,grade,speciality) VALUES('S-1', 'Alex', 9, 'cs')")
+        self.db.close()
+
+        self.db = Database("")
+        self.assertEqual(self.db.schema_version(), latest_version())
+        names = [r[0] for r in self.db.query("SELECT name FROM sqlite_master WHERE type='index'")]
+        self.assertIn("idx_teacher_name", names)
+        self.assertEqual(self.db.query("""SELECT t.id, d.name, s.name FROM teacher t
+                                          JOIN department d ON d.id = t.department_id
+                                          JOIN subject s ON s.id = t.subject_id ORDER BY t.id"""),
+                         [("T-1", "Human Resources", "Physics"), ("T-2", "Finance", "Unknown")])
+        self.assertEqual(self.db.query("SELECT role, id, speciality_id FROM search_doc WHERE role='Student'"),
+                         [("Student", "S-1", Speciality.speciality_code("Computer Science"))])
+        self.assertEqual(self.db.scalar("SELECT n FROM __summary__ WHERE kind='department' AND key=?",
+                                        (str(Departament.department_code("Finance")),)), 1)
+        with self.assertRaises(ValueError):  # cheie străină
+            self.db.execute("UPDATE teacher SET department_id=99 WHERE id='T-1'")
+
+    def test_query_stats_group_by_normalized_sql(self):
+        stats = self.db.enable_query_stats(slow_ms=0.0, explain=True)
+        with self.assertLogs("data.db.slow", level="WARNING") as logs:
+            for i in range(5):
+                self.db.execute("INSERT INTO student(id,name,grade,speciality_id) VALUES(?,?,?,?)", (f"S-{i}", "X", 5, PHYSICS))
+            self.db.query("SELECT id FROM student WHERE grade = 5 ORDER BY name")
+            self.db.query("SELECT id FROM student WHERE grade = 7 ORDER BY name")
+        self.assertTrue(any("plan:" in line for line in logs.output))
+        by_sql = {st["sql"]: st for st in self.db.query_stats()}
+        ins = by_sql["INSERT INTO student(id,name,grade,speciality_id) VALUES(?,?,?,?)"]
+        self.assertEqual(ins["calls"], 5)
+        self.assertEqual(ins["rows"], 5)
+        sel = by_sql["SELECT id FROM student WHERE grade = ? ORDER BY name"]
+        self.assertEqual((sel["calls"], sel["rows"]), (2, 5))
+        self.assertLessEqual(sel["p50_ms"], sel["p99_ms"])
+        self.assertTrue(sel["callers"][0][0].endswith("test_query_stats_group_by_normalized_sql"))
+        stats.reset()
+        self.assertEqual(self.db.query_stats(), [])
+
+    def test_query_stats_skip_explain_and_register_exit_once(self):
+        with mock.patch.object(DBConfig, "QUERY_STATS_DUMP", "stats.json"), \
+                mock.patch("data.db.atexit.register") as register:
+            for _ in range(3):
+                self.db.enable_query_stats(slow_ms=0.0, explain=True)
+        self.assertEqual(register.call_count, 1)
+        with self.assertLogs("data.db.slow", level="WARNING"):
+            self.db.query("SELECT id FROM student ORDER BY name")
+        self.assertFalse(any("EXPLAIN" in st["sql"] for st in self.db.query_stats()))
+
+    def test_bulk_load_restores_profile(self):
+        sync = lambda: self.db.scalar("PRAGMA synchronous")
+        self.assertEqual(self.db.profile(), "balanced")
+        self.assertEqual(self.db.scalar("PRAGMA temp_store"), 2)  # MEMORY
+        normal = sync()
+        with self.db.bulk_load():
+            self.assertEqual(self.db.profile(), "bulk-load")
+            self.assertEqual(sync(), 0)  # OFF
+        self.assertEqual(self.db.profile(), "balanced")
+        self.assertEqual(sync(), normal)
+        with self.assertRaises(ValueError):
+            self.db.apply_profile("turbo")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,78 @@
+import os
+import tempfile
+import unittest
+from collections import Counter
+from data.db_config import DBConfig
+from data.db import Database
+from repository.school_repository import SchoolRepository
+from model.caracteristica import Departament, Subject, Speciality
+from model.faker import Distributions, load_into, stream_rows, synthesize
+
+
+class TestFaker(unittest.TestCase):
+    COUNTS = {"Teacher": 250, "Assistant": 120, "Student": 1037}
+
+    def _all(self, **kw):
+        return [(role, row) for role, rows in stream_rows(self.COUNTS, **kw) for row in rows]
+
+    def test_output_independent_of_sharding(self):
+        whole = self._all(seed=7, block_size=100)
+        sharded = []
+        for shard in range(3):
+            sharded += self._all(seed=7, block_size=100, shard=shard, shards=3)
+        self.assertEqual(sorted(whole), sorted(sharded))
+        self.assertNotEqual(whole, self._all(seed=8, block_size=100))
+
+    def test_ids_are_contiguous_per_role(self):
+        rows = self._all(seed=1, block_size=64)
+        for role, prefix in (("Teacher", "T"), ("Assistant", "A"), ("Student", "S")):
+            ids = [r[0] for ro, r in rows if ro == role]
+            self.assertEqual(ids, [f"{prefix}-{i}" for i in range(10001, 10001 + self.COUNTS[role])])
+
+    def test_skewed_distributions(self):
+        dist = Distributions(salary_shape="normal", department_weights={"Engineering": 9},
+                             grade_weights={g: 0 for g in range(1, 6)})
+        rows = self._all(seed=3, dist=dist)
+        deps = Counter(r[3] for ro, r in rows if ro != "Student")
+        self.assertEqual(deps.most_common(1)[0][0], Departament.department_code("Engineering"))
+        self.assertTrue(all(r[2] >= 6 for ro, r in rows if ro == "Student"))
+        self.assertTrue(all(900 <= r[2] for ro, r in rows if ro == "Teacher"))
+        with self.assertRaises(ValueError):
+            Distributions(salary_shape="cauchy")
+
+    def test_never_generates_unknown_categories(self):
+        dist = Distributions(subject_weights={"Unknown": 50}, speciality_weights={"Unknown": 50})
+        rows = self._all(seed=2, dist=dist)
+        for role, r in rows:
+            if role == "Student":
+                self.assertNotEqual(r[3], Speciality.speciality_code("Unknown"))
+                continue
+            self.assertNotEqual(r[3], Departament.department_code("Unknown"))
+            if role == "Teacher":
+                self.assertNotEqual(r[4], Subject.subject_code("Unknown"))
+
+    def test_synthesize_matches_stream(self):
+        models = synthesize({"Student": 5}, seed=4)["Student"]
+        rows = next(stream_rows({"Student": 5}, seed=4))[1]
+        self.assertEqual([(s.id, s.name, s.grade) for s in models], [(r[0], r[1], str(r[2])) for r in rows])
+
+    def test_load_into_repository(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            old = DBConfig.SQLITE_PATH
+            DBConfig.SQLITE_PATH = os.path.join(tmp, "test.db")
+            db = Database("")
+            try:
+                with db.bulk_load():
+                    written = load_into(SchoolRepository(db), self.COUNTS, seed=5, block_size=200, processes=2)
+                self.assertEqual(written, self.COUNTS)
+                self.assertEqual(db.scalar("SELECT COUNT(*) FROM student"), self.COUNTS["Student"])
+                self.assertEqual(db.scalar("SELECT n FROM __summary__ WHERE kind='role' AND key='Teacher'"), 250)
+
+                # a doua încărcare continuă id-urile în loc să le suprascrie
+                again = load_into(SchoolRepository(db), {"Student": 10}, seed=5)
+                self.assertEqual(again["Student"], 10)
+                self.assertEqual(db.scalar("SELECT COUNT(*) FROM student"), self.COUNTS["Student"] + 10)
+                self.assertEqual(db.scalar("SELECT MAX(id) FROM student"), f"S-{10001 + self.COUNTS['Student'] + 9}")
+            finally:
+                db.close()
+                DBConfig.SQLITE_PATH = old
@@ -0,0 +1,53 @@
+import unittest
+from model.teacher import Teacher
+from model.student import Student
+from model.assistant import Assistant
+from model.caracteristica import Departament, Subject, Speciality
+
+
+class TestCategories(unittest.TestCase):
+    def test_instances_have_no_dict(self):
+        people = [Teacher("Ana", "T-1", "1000", "hr", "bio"), Assistant("Bo", "A-1", "700", "fin"),
+                  Student("Cy", "S-1", "9", "cs")]
+        for p in people:
+            self.assertFalse(hasattr(p, "__dict__"), type(p).__name__)
+            with self.assertRaises(AttributeError):
+                p.extra = 1
+
+    def test_aliases_map_to_codes(self):
+        self.assertEqual(Departament.department_code("HR "), Departament.ALLOWED_DEPARTMENTS.index("Human Resources"))
+        self.assertEqual(Departament.department_code("it"), Departament.ALLOWED_DEPARTMENTS.index("Engineering"))
+        self.assertEqual(Subject.subject_code("Chem"), Subject.ALLOWED_SUBJECTS.index("Chemistry"))
+        self.assertEqual(Speciality.speciality_code("cs"), Speciality.ALLOWED_SPECIALTIES.index("Computer Science"))
+        self.assertEqual(Speciality.speciality_code("astronomy"), Speciality.ALLOWED_SPECIALTIES.index("Unknown"))
+        self.assertEqual(Speciality.speciality_code(None), Speciality.ALLOWED_SPECIALTIES.index("Unknown"))
+        self.assertEqual(Subject.subject_code(2), 2)
+        t = Teacher("Ana", "T-1", "1000", "mkt", "phys")
+        self.assertEqual((t.department, t.subject), ("Marketing", "Physics"))
+
+    def test_old_misspelling_is_an_alias(self):
+        math = Speciality.ALLOWED_SPECIALTIES.index("Mathematics")
+        for raw in ("mathematics", "Mathematics", "Mathematatics", " MATHEMATATICS"):
+            self.assertEqual(Speciality.speciality_code(raw), math, raw)
+        self.assertEqual(Student("Cy", "S-1", "9", "Mathematatics").speciality, "Mathematics")
+        self.assertNotIn("Mathematatics", Speciality.ALLOWED_SPECIALTIES)
+
+    def test_invalid_types_raise_value_error(self):
+        for bad in (1.0, True, -1, len(Departament.ALLOWED_DEPARTMENTS), b"hr", ["hr"]):
+            with self.assertRaises(ValueError, msg=repr(bad)):
+                Departament.department_code(bad)
+        with self.assertRaises(ValueError):
+            Subject.subject_code(2.5)
+        with self.assertRaises(ValueError):
+            Student("Cy", "S-1", "9", {"cs"})
+
+    def test_normalization_is_memoized(self):
+        Speciality._normalize_speciality.cache_clear()
+        for _ in range(5):
+            Speciality.speciality_code("Computer Science")
+        info = Speciality._normalize_speciality.cache_info()
+        self.assertEqual((info.misses, info.hits), (1, 4))
+
+
+if __name__ == "__main__":
+    unittest.main()
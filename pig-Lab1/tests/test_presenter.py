@@ -1,5 +1,10 @@
+import os
+import tempfile
 import unittest
+from unittest import mock
+from data.db_config import DBConfig
 from presenter.school_presenter import SchoolPresenter
+from repository.school_repository import SchoolRepository
 
 
 class TestSchoolPresenter(unittest.TestCase):
@@ -30,5 +35,84 @@ class TestSchoolPresenter(unittest.TestCase):
         self.assertIn("not found", msg.lower())
 
 
+class TestIncrementalStats(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self._old_path = DBConfig.SQLITE_PATH
+        DBConfig.SQLITE_PATH = os.path.join(self._tmp.name, "test.db")
+        self.presenter = SchoolPresenter(seed=7)
+
+    def tearDown(self):
+        self.presenter._db.close()
+        DBConfig.SQLITE_PATH = self._old_path
+        self._tmp.cleanup()
+
+    def test_crud_keeps_aggregates_in_sync(self):
+        p = self.presenter
+        self.assertEqual(p.check_stats(), [])
+        p.add_person("Teacher", {"Name": "Ana", "ID": "T-1", "Salary": "1000", "Department": "hr", "Subject": "bio"})
+        p.add_person("Student", {"Name": "Bo", "ID": "S-1", "Grade": "9", "Speciality": "cs"})
+        p.apply_changes("Teacher", "T-1", {"ID": "T-2", "Salary": "3000", "Department": "Finance"})
+        p.edit_by_id("Student", "S-1", {"Speciality": "Physics"})
+        p.delete_person("Student", "Bo")
+        p.delete_by_id("Teacher", "T-2")
+        p.delete_by_id("Teacher", "missing")
+        self.assertEqual(p.check_stats(), [])
+
+        p._db.execute("DELETE FROM student")  # scriere din afara presenter-ului
+        self.assertNotEqual(p.check_stats(), [])
+        p.rebuild_stats()
+        self.assertEqual(p.check_stats(), [])
+        self.assertEqual(p.get_chart_payload("Roles Distribution")["values"][2], 0)
+
+    def test_rebuild_reads_summaries_not_rows(self):
+        p = self.presenter
+        p.add_person("Teacher", {"Name": "Ana", "ID": "T-1", "Salary": "1000,5", "Department": "hr", "Subject": "bio"})
+        with mock.patch.object(SchoolRepository, "iter_teacher_rows", side_effect=AssertionError), \
+                mock.patch.object(SchoolRepository, "iter_assistant_rows", side_effect=AssertionError), \
+                mock.patch.object(SchoolRepository, "iter_student_rows", side_effect=AssertionError):
+            p.rebuild_stats()
+        self.assertEqual(p.check_stats(), [])
+        self.assertEqual(sum(v for _, v in p._agg.roles_distribution()), sum(n for _, n in p._repo.counts_by_role()))
+
+    def test_id_change_keeps_aggregates_in_sync(self):
+        p = self.presenter
+        p.add_person("Student", {"Name": "Zed", "ID": "S-1", "Grade": "9", "Speciality": "cs"})
+        p.add_person("Assistant", {"Name": "Ava", "ID": "A-1", "Salary": "700", "Department": "hr"})
+        self.assertTrue(p.edit_person("Student", "Zed", {"ID": "S-2", "Speciality": "Physics"})[0])
+        self.assertTrue(p.edit_by_id("Assistant", "A-1", {"ID": "A-2", "Salary": "900"})[0])
+        self.assertIsNotNone(p.find_by_id("Student", "S-2"))
+        self.assertIsNone(p.find_by_id("Assistant", "A-1"))
+        self.assertEqual(p.check_stats(), [])
+
+    def test_pull_changes_refreshes_charts(self):
+        p1 = self.presenter
+        p2 = SchoolPresenter()
+        try:
+            p1.pull_changes()
+            before = p1.get_chart_payload("Roles Distribution")["values"][2]
+            self.assertTrue(p2.add_person("Student", {"Name": "New", "ID": "S-9", "Grade": "8", "Speciality": "cs"})[0])
+            self.assertEqual(p1.get_chart_payload("Roles Distribution")["values"][2], before)
+            deltas = p1.pull_changes()
+            self.assertEqual([r.id for r in deltas["Student"]["upserted"]], ["S-9"])
+            self.assertEqual(p1.get_chart_payload("Roles Distribution")["values"][2], before + 1)
+            self.assertEqual(p1.check_stats(), [])
+        finally:
+            p2._db.close()
+
+    def test_snapshot_does_not_skip_foreign_changes(self):
+        p1 = self.presenter
+        p2 = SchoolPresenter()
+        try:
+            p1.pull_changes()
+            p2.add_person("Student", {"Name": "Other", "ID": "S-8", "Grade": "8", "Speciality": "cs"})
+            p1.add_person("Student", {"Name": "Mine", "ID": "S-9", "Grade": "9", "Speciality": "Physics"})
+            p1._snapshot()  # ce face render_cards după fiecare CRUD local
+            self.assertEqual(p1.pull_changes(), {})
+            self.assertEqual(p1.check_stats(), [])
+        finally:
+            p2._db.close()
+
+
 if __name__ == "__main__":
     unittest.main()
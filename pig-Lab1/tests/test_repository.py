@@ -0,0 +1,288 @@
+import os
+import statistics
+import tempfile
+import unittest
+from data.db_config import DBConfig
+from data.db import Database
+from repository.school_repository import SchoolRepository, name_sort_key, page_sort_key
+from repository._helpers import _to_float, _to_int
+from model.teacher import Teacher
+from model.student import Student
+from model.assistant import Assistant
+
+
+class TestSchoolRepository(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self._old_path = DBConfig.SQLITE_PATH
+        DBConfig.SQLITE_PATH = os.path.join(self._tmp.name, "test.db")
+        self.db = Database("")
+        self.repo = SchoolRepository(self.db)
+
+    def tearDown(self):
+        self.db.close()
+        DBConfig.SQLITE_PATH = self._old_path
+        self._tmp.cleanup()
+
+    def _pages(self, fetch, limit):
+        out, cursor = [], None
+        while True:
+            items, cursor = fetch(after=cursor, limit=limit)
+            out.extend(items)
+            if cursor is None:
+                return out
+
+    def test_keyset_pages_match_full_sort(self):
+        self.repo.add_students(Student(f"N{i % 4}", f"S-{i:02d}", str(i % 5 + 1), "Physics") for i in range(23))
+        self.repo.add_teachers(Teacher(f"T{i}", f"T-{i:02d}", str(1000 + (i % 3) * 100), "Finance", "Physics")
+                               for i in range(11))
+
+        by_grade = self._pages(lambda **kw: self.repo.page_students("Grade", **kw), 5)
+        expected = sorted(self.repo.list_students(), key=page_sort_key("student", "Grade"))
+        self.assertEqual([s.id for s in by_grade], [s.id for s in expected])
+
+        by_name = self._pages(lambda **kw: self.repo.page_students("Name", **kw), 4)
+        self.assertEqual([s.id for s in by_name], [s.id for s in sorted(expected, key=name_sort_key)])
+
+        by_salary = self._pages(lambda **kw: self.repo.page_teachers("Salary", **kw), 3)
+        self.assertEqual([t.id for t in by_salary],
+                         [t.id for t in sorted(self.repo.list_teachers(), key=page_sort_key("teacher", "Salary"))])
+
+    def test_ties_page_in_the_total_order(self):
+        # multe egalități pe notă/salariu și pe nume (cu majuscule diferite): departajarea e (nume pliat, id)
+        names = ["bob", "Alice", "alice", "Bob", "carl", "ALICE"]
+        self.repo.add_students(Student(names[i % 6], f"S-{(i * 7) % 30:02d}", str(i % 3 + 8), "Physics")
+                               for i in range(30))
+        self.repo.add_assistants(Assistant(names[i % 6], f"A-{(i * 7) % 20:02d}", ("900", "900,0", "700")[i % 3], "hr")
+                                 for i in range(20))
+        for limit in (1, 4, 7):
+            pages = self._pages(lambda **kw: self.repo.page_students("Grade", **kw), limit)
+            expected = sorted(self.repo.list_students(), key=page_sort_key("student", "Grade"))
+            self.assertEqual([s.id for s in pages], [s.id for s in expected], limit)
+            pages = self._pages(lambda **kw: self.repo.page_assistants("Salary", **kw), limit)
+            expected = sorted(self.repo.list_assistants(), key=page_sort_key("assistant", "Salary"))
+            self.assertEqual([a.id for a in pages], [a.id for a in expected], limit)
+        # stream-urile folosesc aceeași ordine "Name"
+        self.assertEqual([s.id for s in self.repo.iter_student_rows()],
+                         [s.id for s in sorted(self.repo.list_students(), key=name_sort_key)])
+        plan = " ".join(str(r[-1]) for r in self.db.query(
+            "EXPLAIN QUERY PLAN SELECT id FROM student WHERE (-grade, name COLLATE NOCASE, id) > (?, ?, ?) "
+            "ORDER BY -grade, name COLLATE NOCASE, id LIMIT 3", (-9, "b", "S-00")))
+        self.assertIn("idx_student_grade_order", plan)
+
+    def test_name_pages_ignore_case_like_snapshot(self):
+        names = ["bob", "Alice", "alice", "Bob", "carl", "Anna", "ALICE", "Ştefan", "zoe", "Zack"]
+        self.repo.add_students(Student(n, f"S-{i:02d}", "5", "Physics") for i, n in enumerate(names))
+        pages = self._pages(lambda **kw: self.repo.page_students("Name", **kw), 3)
+        expected = sorted(self.repo.list_students(), key=name_sort_key)
+        self.assertEqual([s.id for s in pages], [s.id for s in expected])
+        self.assertEqual([s.name for s in pages[:4]], ["Alice", "alice", "ALICE", "Anna"])
+        plan = " ".join(str(r[-1]) for r in self.db.query(
+            "EXPLAIN QUERY PLAN SELECT id FROM student WHERE (name COLLATE NOCASE, id) > (?, ?) "
+            "ORDER BY name COLLATE NOCASE, id LIMIT 3", ("b", "S-00")))
+        self.assertIn("idx_student_name_nocase", plan)
+
+    def test_last_page_has_no_cursor(self):
+        self.repo.add_students(Student(f"N{i}", f"S-{i}", "5", "Physics") for i in range(4))
+        items, cursor = self.repo.page_students(limit=4)
+        self.assertEqual((len(items), cursor), (4, None))
+
+    def test_get_and_find_by_name(self):
+        self.repo.add_teacher(Teacher("Ana Pop", "T-1", "1500", "fin", "bio"))
+        self.repo.add_teacher(Teacher("Ana Pop", "T-0", "1200", "hr", "math"))
+        t = self.repo.get("Teacher", "T-1")
+        self.assertEqual((t.name, t.salary, t.department, t.subject), ("Ana Pop", "1500.0", "Finance", "Biology"))
+        self.assertIsNone(self.repo.get_teacher("T-9"))
+        self.assertIsNone(self.repo.get("Student", "T-1"))
+        self.assertEqual([x.id for x in self.repo.find_by_name("Teacher", "Ana Pop")], ["T-0", "T-1"])
+        self.assertEqual(self.repo.find_by_name("Assistant", "Ana Pop"), [])
+
+    def test_single_adds_use_plain_insert(self):
+        self.repo.add_teacher(Teacher("Ana", "T-1", "1500,5", "fin", "bio"))
+        self.repo.add_assistant(Assistant("Dan", "A-1", "900", "hr"))
+        self.repo.add_student(Student("Ion", "S-1", "7", "cs"))
+        # fără tabele TEMP de staging (acelea sunt doar pentru copy_rows pe loturi)
+        self.assertEqual(self.db.query("SELECT name FROM temp.sqlite_master WHERE name LIKE '\\_copy\\_%' ESCAPE '\\'"), [])
+        self.assertEqual(self.repo.get_teacher("T-1").salary, "1500.5")
+        self.assertEqual(self.repo.get_student("S-1").grade, "7")
+        with self.assertRaises(ValueError):
+            self.repo.add_assistant(Assistant("Dan", "A-1", "900", "hr"))
+        with self.assertRaises(ValueError):
+            self.repo.add_student(Student("Ion", "S-2", "abc", "cs"))
+
+    def test_upsert_many_reports_counts(self):
+        self.repo.add_students(Student(f"N{i}", f"S-{i}", "5", "Physics") for i in range(3))
+        batch = [
+            Student("N0", "S-0", "5", "Physics"),    # neschimbat
+            Student("N1", "S-1", "9", "Physics"),    # actualizat
+            Student("N7", "S-7", "6", "cs"),         # nou
+            Student("Bad", "S-8", "abc", "Physics"), # respins
+        ]
+        res = self.repo.upsert_many_students(batch)
+        self.assertEqual((res["inserted"], res["updated"], res["unchanged"], res["rejected"]), (1, 1, 1, 1))
+        self.assertEqual(res["errors"], [("S-8", "Grade must be integer")])
+        self.assertEqual(self.repo.get_student("S-1").grade, "9")
+        self.assertEqual(self.repo.get_student("S-7").speciality, "Computer Science")
+        self.assertEqual(self.db.scalar("SELECT COUNT(*) FROM student"), 4)
+
+    def test_normalize_db_values_only_when_dirty(self):
+        rows = [("T-1", "A", " 1500,5 ", 1, 0), ("T-2", "B", 2000.0, 1, 1)]
+        self.db.execute_many("INSERT INTO teacher(id,name,salary,department_id,subject_id) VALUES(?,?,?,?,?)", rows)
+        self.assertEqual(self.repo.normalize_db_values(), 1)
+        self.assertEqual(self.db.query("SELECT salary, department_id, subject_id FROM teacher WHERE id='T-1'"),
+                         [(1500.5, 1, 0)])
+        self.assertEqual(self.repo._meta("normalize_dirty"), "0")
+
+        # date curate nu marchează baza ca „murdară”
+        self.repo.add_teacher(Teacher("C", "T-3", "1000", "Finance", "Physics"))
+        self.assertEqual(self.repo._meta("normalize_dirty"), "0")
+        self.assertEqual(self.repo.normalize_db_values(), 0)
+
+        self.db.execute("UPDATE teacher SET salary='7,5' WHERE id='T-2'")
+        self.assertEqual(self.repo._meta("normalize_dirty"), "1")
+        self.assertEqual(self.repo.normalize_db_values(), 1)
+        self.assertEqual(self.db.scalar("SELECT salary FROM teacher WHERE id='T-2'"), 7.5)
+
+        # categoriile sunt coduri validate de cheile străine, nu mai pot fi „murdare”
+        with self.assertRaises(ValueError):
+            self.db.execute("UPDATE teacher SET department_id=99 WHERE id='T-2'")
+
+    def test_normalize_db_values_agrees_with_model_parsers(self):
+        salaries = [" 1e3 ", "+1500,5", "-2", "1_000", " 12 ", "nan", "inf", "1.2.3", "12abc", "1,2,3", "", "--1"]
+        grades = ["+7", " 8 ", "1_0", "7.5", "-3", "x", "", "9e0"]
+        self.db.execute_many("INSERT INTO teacher(id,name,salary,department_id,subject_id) VALUES(?,?,?,?,?)",
+                             [(f"T-{i}", "A", v, 1, 0) for i, v in enumerate(salaries)])
+        self.db.execute_many("INSERT INTO student(id,name,grade,speciality_id) VALUES(?,?,?,?)",
+                             [(f"S-{i}", "B", v, 0) for i, v in enumerate(grades)])
+        tables = (("teacher", "salary", salaries, _to_float), ("student", "grade", grades, _to_int))
+        before = {t: dict(self.db.query(f"SELECT id, {c} FROM {t}")) for t, c, _, _ in tables}
+        self.repo.normalize_db_values(force=True)
+        for table, col, values, parse in tables:
+            stored = dict(self.db.query(f"SELECT id, {col} FROM {table}"))
+            for i, raw in enumerate(values):
+                key = f"{table[0].upper()}-{i}"
+                got = stored[key]
+                try:
+                    expected = parse(raw, col)
+                except ValueError:
+                    self.assertEqual(got, before[table][key], raw)  # respinsă de model: rămâne neatinsă
+                else:
+                    self.assertEqual((got, type(got)), (expected, type(expected)), raw)
+
+    def test_summary_tables_follow_writes(self):
+        self.repo.add_teachers(Teacher(f"T{i}", f"T-{i}", str(1000 + i * 100), ("Finance", "Marketing")[i % 2],
+                                       ("Physics", "Biology")[i % 2]) for i in range(6))
+        self.repo.add_students(Student(f"S{i}", f"S-{i}", "5", ("Physics", "Engineering")[i % 2]) for i in range(5))
+        self.db.execute("UPDATE teacher SET department_id=(SELECT id FROM department WHERE name='Finance'), salary=5000 "
+                        "WHERE id='T-1'")
+        self.db.execute("DELETE FROM teacher WHERE id='T-2'")
+        self.db.execute("DELETE FROM student WHERE speciality_id=(SELECT id FROM speciality WHERE name='Engineering')")
+
+        def direct():
+            return {
+                "roles": [(r, self.db.scalar(f"SELECT COUNT(*) FROM {r.lower()}")) for r in ("Teacher", "Assistant", "Student")],
+                "spec": self.db.query("SELECT c.name, COUNT(*) FROM student s JOIN speciality c ON c.id = s.speciality_id "
+                                      "GROUP BY c.name"),
+                "subj": sorted(self.db.query("SELECT c.name, COUNT(*) FROM teacher t JOIN subject c ON c.id = t.subject_id "
+                                             "GROUP BY c.name")),
+                "avg": sorted(self.db.query("SELECT c.name, AVG(salary) FROM teacher t JOIN department c "
+                                            "ON c.id = t.department_id GROUP BY c.name")),
+            }
+
+        def summarized():
+            return {
+                "roles": self.repo.counts_by_role(),
+                "spec": self.repo.students_by_speciality(),
+                "subj": sorted(self.repo.teachers_by_subject()),
+                "avg": sorted(self.repo.avg_salary_by_department()),
+            }
+
+        self.assertEqual(summarized(), direct())
+        self.db.execute("UPDATE __summary__ SET n = 99")
+        self.repo.rebuild_summaries()
+        self.assertEqual(summarized(), direct())
+
+    def test_histogram_and_box_stats_in_sql(self):
+        salaries = [1000, 1100, 1100, 1250, 1900, 2500, 3000]
+        self.repo.add_teachers(Teacher(f"T{i}", f"T-{i}", str(v), "Finance", "Physics") for i, v in enumerate(salaries))
+        self.repo.add_students(Student(f"S{i}", f"S-{i}", str(i % 10 + 1), "Physics") for i in range(30))
+
+        edges, counts = self.repo.salary_histogram(bins=4)
+        self.assertEqual(edges, [1000.0, 1500.0, 2000.0, 2500.0, 3000.0])
+        self.assertEqual(counts, [4, 1, 0, 2])
+        edges, counts = self.repo.grade_histogram()
+        self.assertEqual((len(counts), sum(counts)), (5, 30))
+        self.assertEqual(self.repo.salary_histogram(), self.repo._histogram(
+            "SELECT salary AS v FROM teacher UNION ALL SELECT salary AS v FROM assistant", 5))
+
+        (box,) = self.repo.salary_box_stats()
+        q1, med, q3 = statistics.quantiles(salaries, n=4, method="inclusive")
+        self.assertEqual((box["label"], box["n"], box["min"], box["max"]), ("Finance", 7, 1000.0, 3000.0))
+        self.assertAlmostEqual(box["q1"], q1)
+        self.assertAlmostEqual(box["median"], med)
+        self.assertAlmostEqual(box["q3"], q3)
+        self.assertAlmostEqual(box["mean"], statistics.mean(salaries))
+
+    def test_row_projections_match_models(self):
+        self.repo.add_teachers(Teacher(f"T{i}", f"T-{i}", str(1000 + i), "Finance", "Physics") for i in range(3))
+        self.repo.add_students(Student(f"S{i}", f"S-{i}", str(i + 1), "Physics") for i in range(3))
+        rows = list(self.repo.iter_teacher_rows())
+        self.assertEqual([(r.id, r.name, str(r.salary)) for r in rows],
+                         [(t.id, t.name, t.salary) for t in self.repo.list_teachers()])
+        self.assertIsInstance(rows[0].salary, float)
+        student = next(self.repo.iter_student_rows())
+        self.assertEqual((student.grade, student.speciality), (1, "Physics"))
+        with self.assertRaises(AttributeError):
+            student.grade = 5
+
+    def test_search_prefix_fuzzy_filters_and_sync(self):
+        self.repo.add_teachers([Teacher("Alexandru Ionescu", "T-1", "1000", "Finance", "Physics"),
+                                Teacher("Ștefan Popa", "T-2", "1000", "Marketing", "Physics")])
+        self.repo.add_students([Student("Alexia Pop", "S-1", "9", "Physics"),
+                                Student("Maria Alexe", "S-2", "7", "Engineering")])
+
+        hits = self.repo.search("ale")
+        self.assertEqual({h.id for h in hits}, {"T-1", "S-1", "S-2"})
+        self.assertEqual([h.id for h in self.repo.search("stefan")], ["T-2"])  # fără diacritice
+        self.assertEqual([h.id for h in self.repo.search("alex pop")], ["S-1"])
+        self.assertEqual([h.id for h in self.repo.search("ale", roles=["Student"], speciality="Physics")], ["S-1"])
+        self.assertEqual([h.id for h in self.repo.search("ale", department="Finance")], ["T-1"])
+        self.assertEqual(self.repo.search("ionesku", fuzzy=True)[0].id, "T-1")
+
+        first = self.repo.search("ale", limit=2)
+        rest = self.repo.search("ale", limit=2, offset=2)
+        self.assertEqual(len(first) + len(rest), 3)
+        self.assertFalse({h.id for h in first} & {h.id for h in rest})
+
+        self.db.execute("UPDATE teacher SET id='T-9', name='Bogdan Ionescu' WHERE id='T-1'")
+        self.repo.delete_student("S-1")
+        self.assertEqual({h.id for h in self.repo.search("ale")}, {"S-2"})
+        self.assertEqual([h.id for h in self.repo.search("bogd")], ["T-9"])
+
+    def test_changes_since_and_prune(self):
+        v0 = self.repo.data_version()
+        self.repo.add_students(Student(f"S{i}", f"S-{i}", "5", "Physics") for i in range(3))
+        self.db.execute("UPDATE student SET id='S-9' WHERE id='S-1'")
+        self.repo.delete_student("S-2")
+        changes = self.repo.changes_since(v0)
+        self.assertEqual([(c.id, c.op) for c in changes],
+                         [("S-0", "I"), ("S-1", "I"), ("S-2", "I"), ("S-1", "D"), ("S-9", "U"), ("S-2", "D")])
+        self.assertEqual(self.repo.data_version(), changes[-1].version)
+        self.assertEqual(self.repo.changes_since(self.repo.data_version()), [])
+        self.assertEqual([r.id for r in self.repo.get_rows("Student", ["S-9", "S-2", "S-0"])], ["S-0", "S-9"])
+
+        self.repo.prune_changes(changes[2].version)
+        self.assertIsNone(self.repo.changes_since(v0))
+        self.assertEqual(len(self.repo.changes_since(changes[2].version)), 3)
+
+    def test_stream_stats_from_row_stream(self):
+        self.repo.add_teachers(Teacher(f"T{i}", f"T-{i}", str(1000 + 100 * i), "Finance", "Physics") for i in range(5))
+        self.repo.add_students(Student(f"S{i}", f"S-{i}", str(i + 6), "cs") for i in range(3))
+        (dep, s), = self.repo.salary_stream_stats().summaries()
+        self.assertEqual((dep, s["n"], s["mean"], s["median"]), ("Finance", 5, 1200.0, 1200.0))
+        self.assertAlmostEqual(s["stddev"], statistics.pstdev([1000, 1100, 1200, 1300, 1400]))
+        self.assertEqual(dict(self.repo.grade_stream_stats().summaries())["Computer Science"]["max"], 8.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
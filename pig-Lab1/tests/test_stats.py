@@ -0,0 +1,54 @@
+import importlib.util
+import random
+import unittest
+from model.stats import StatsModel
+from model.teacher import Teacher
+from model.assistant import Assistant
+from model.student import Student
+
+
+def _data(n: int, seed: int = 3) -> dict:
+    rand = random.Random(seed)
+    deps = ["Finance", "Marketing", "Engineering", "bogus"]
+    salaries = lambda: rand.choice([str(rand.randint(600, 2500)), f"{rand.random() * 1000:.3f}", "n/a", ""])
+    return {
+        "Teacher": [Teacher(f"T{i}", f"T-{i}", salaries(), rand.choice(deps), rand.choice(["math", "bio", "x"]))
+                    for i in range(n)],
+        "Assistant": [Assistant(f"A{i}", f"A-{i}", salaries(), rand.choice(deps)) for i in range(n // 2)],
+        "Student": [Student(f"S{i}", f"S-{i}", rand.choice(["5", "10", "7.5", ""]), rand.choice(["cs", "phys", "?"]))
+                    for i in range(n)] + ["not a student"],
+    }
+
+
+@unittest.skipUnless(importlib.util.find_spec("numpy"), "numpy not installed")
+class TestColumnarStats(unittest.TestCase):
+    METHODS = ("roles_distribution", "students_by_speciality", "avg_salary_by_department", "teachers_by_subject",
+               "student_grades_series", "salaries_series", "salary_by_department_groups")
+
+    def test_matches_loop_implementation(self):
+        stats = StatsModel()
+        for n in (0, 1, 500):
+            data = _data(n)
+            frame = stats.load(data)
+            self.assertIsNot(frame, data)
+            for m in self.METHODS:
+                self.assertEqual(getattr(stats, m)(frame), getattr(stats, m)(data), (n, m))
+
+    def test_matches_loop_implementation_on_clean_rows(self):
+        from model.faker import synthesize
+        stats = StatsModel()
+        data = synthesize({"Teacher": 300, "Assistant": 200, "Student": 1000}, seed=11)
+        frame = stats.load(data)
+        for m in self.METHODS:
+            self.assertEqual(getattr(stats, m)(frame), getattr(stats, m)(data), m)
+
+    def test_parse_flags_invalid_values(self):
+        from model.columnar_stats import _parse
+        values, ok = _parse(["5", "10", "7.5", "", 3], int)
+        self.assertEqual((values.tolist(), ok.tolist()), ([5, 10, 0, 0, 3], [True, True, False, False, True]))
+        values, ok = _parse(["1200.5", " 900 "], float)
+        self.assertEqual((values.tolist(), ok.all()), ([1200.5, 900.0], True))
+
+
+if __name__ == "__main__":
+    unittest.main()
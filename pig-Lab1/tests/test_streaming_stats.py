@@ -0,0 +1,49 @@
+import json
+import random
+import statistics
+import unittest
+from model.streaming_stats import RunningMoments, KLLSketch, GroupedStreamStats
+
+
+class TestStreamingStats(unittest.TestCase):
+    def test_moments_match_statistics_and_merge(self):
+        rand = random.Random(1)
+        xs = [rand.gauss(1500, 300) for _ in range(5000)]
+        a, b = RunningMoments(), RunningMoments()
+        for x in xs[:1234]:
+            a.add(x)
+        for x in xs[1234:]:
+            b.add(x)
+        a.merge(b)
+        self.assertEqual(a.n, len(xs))
+        self.assertAlmostEqual(a.mean, statistics.fmean(xs), places=6)
+        self.assertAlmostEqual(a.stddev(ddof=1), statistics.stdev(xs), places=6)
+        self.assertEqual((a.min, a.max), (min(xs), max(xs)))
+
+    def test_kll_quantiles_bounded_and_mergeable(self):
+        rand = random.Random(2)
+        xs = [rand.random() for _ in range(100_000)]
+        shards = [KLLSketch(k=200, seed=i) for i in range(4)]
+        for i, x in enumerate(xs):
+            shards[i % 4].add(x)
+        sk = shards[0]
+        for other in shards[1:]:
+            sk.merge(KLLSketch.from_dict(json.loads(json.dumps(other.to_dict()))))
+        self.assertEqual(sk.n, len(xs))
+        self.assertLess(sk.retained(), 2000)
+        ordered = sorted(xs)
+        for q in (0.05, 0.25, 0.5, 0.75, 0.95):
+            est = sk.quantile(q)
+            self.assertLess(abs(est - ordered[int(q * (len(xs) - 1))]), 0.02, q)
+
+    def test_grouped_summaries(self):
+        g = GroupedStreamStats(k=64).consume([("Finance", 1000.0), ("Finance", 3000.0), ("Marketing", 2000.0)])
+        other = GroupedStreamStats(k=64).consume([("Marketing", 4000.0)])
+        summaries = dict(g.merge(other).summaries())
+        self.assertEqual(summaries["Finance"]["mean"], 2000.0)
+        self.assertEqual((summaries["Marketing"]["n"], summaries["Marketing"]["max"]), (2, 4000.0))
+        self.assertEqual(g.overall().summary()["n"], 4)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -5,6 +5,7 @@ from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 
 CATEGORICAL_STYLES = ["Bar", "Horizontal Bar", "Pie"]
 SERIES_STYLES      = ["Histogram", "Line"]
+HISTOGRAM_STYLES   = ["Histogram"]
 GROUPS_STYLES      = ["Boxplot"]
 
 class ChartsFrame(customtkinter.CTkFrame):
@@ -50,6 +51,8 @@ class ChartsFrame(customtkinter.CTkFrame):
             styles = CATEGORICAL_STYLES; default = "Bar"
         elif t == "series":
             styles = SERIES_STYLES; default = "Histogram"
+        elif t == "histogram":
+            styles = HISTOGRAM_STYLES; default = "Histogram"
         else:
             styles = GROUPS_STYLES; default = styles[0]
         self.style_selector.configure(values=styles)
@@ -91,6 +94,28 @@ class ChartsFrame(customtkinter.CTkFrame):
                     self.ax.plot(series, marker="o"); self.ax.set_ylabel(payload.get("ylabel", "")); self.ax.grid(True, alpha=0.3)
             self.ax.set_title(payload.get("title", ""))
 
+        elif t == "histogram":
+            edges = payload["edges"]; counts = payload["counts"]
+            if not counts:
+                self.ax.text(0.5, 0.5, "No data", ha="center", va="center")
+            else:
+                widths = [b - a for a, b in zip(edges, edges[1:])]
+                self.ax.bar(edges[:-1], counts, width=widths, align="edge", edgecolor="white")
+                self.ax.set_ylabel(payload.get("ylabel", "")); self.ax.grid(True, axis="y", alpha=0.3)
+            self.ax.set_title(payload.get("title", ""))
+
+        elif t == "boxstats":
+            stats = payload["stats"]
+            if not stats:
+                self.ax.text(0.5, 0.5, "No data", ha="center", va="center")
+            else:
+                # mustățile merg la min/max: sumarul nu conține valorile extreme individuale
+                boxes = [{"label": s["label"], "whislo": s["min"], "q1": s["q1"], "med": s["median"],
+                          "q3": s["q3"], "whishi": s["max"], "mean": s["mean"], "fliers": []} for s in stats]
+                self.ax.bxp(boxes, showmeans=True)
+                self.ax.set_ylabel(payload.get("ylabel", "")); self.ax.grid(True, axis="y", alpha=0.3)
+            self.ax.set_title(payload.get("title", ""))
+
         else:
             groups: List[Tuple[str, List[float]]] = payload["groups"]
             if not groups:
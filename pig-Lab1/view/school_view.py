@@ -1,3 +1,4 @@
+import bisect
 import customtkinter
 from functools import partial
 from view.charts_view import ChartsFrame
@@ -16,6 +17,11 @@ class SchoolView(customtkinter.CTk):
         self.selected = set()           # (person_type, id)
         self.checkbox_widgets = {}
         self.input_widgets = {}
+        # cardurile desenate, ca Reload să poată aplica doar deltele
+        self._card_headers = {}         # person_type -> label
+        self._card_rows = {}            # (person_type, id) -> (cheie de sortare, frame)
+        self._card_order = {}           # person_type -> [(cheie de sortare, id)] sortată
+        self._chart_frames = []
 
         self.setup_ui()
 
@@ -112,7 +118,7 @@ class SchoolView(customtkinter.CTk):
             db_path = ""
         self.db_label = customtkinter.CTkLabel(self.dbbar, text=f"DB: {db_path}", font=("Consolas", 10))
         self.db_label.pack(side="left")
-        self.reload_btn = customtkinter.CTkButton(self.dbbar, text="Reload from DB", width=130, command=self.render_cards)
+        self.reload_btn = customtkinter.CTkButton(self.dbbar, text="Reload from DB", width=130, command=self.on_reload_clicked)
         self.reload_btn.pack(side="right", padx=(6, 0))
 
         self.selectbar = customtkinter.CTkFrame(self.right_frame, fg_color="transparent")
@@ -134,6 +140,27 @@ class SchoolView(customtkinter.CTk):
         self.viewall_box.insert("1.0", text or "")
         self.viewall_box.configure(state="disabled")
 
+    def on_reload_clicked(self):
+        # aplicăm doar deltele din jurnal; redesenare completă doar când jurnalul nu mai ajunge până la noi
+        try:
+            delta = self.presenter.pull_changes()
+        except Exception as e:
+            self.show_message(f"Reload error: {e}")
+            return
+        if delta == {}:
+            self.show_message("Already up to date")
+            return
+        if delta is None or not self._patch_cards(delta):
+            self.render_cards()
+        self._refresh_charts()
+        self.show_message("Reloaded changes")
+
+    def _refresh_charts(self):
+        # agregatele au fost deja actualizate de pull_changes; ferestrele deschise doar redesenează
+        self._chart_frames = [f for f in self._chart_frames if f.winfo_exists()]
+        for frame in self._chart_frames:
+            frame.render_chart()
+
     def show_message(self, message):
         try:
             self.status_label.configure(text=message)
@@ -178,6 +205,9 @@ class SchoolView(customtkinter.CTk):
         for widget in self.cards_frame.winfo_children():
             widget.destroy()
         self.checkbox_widgets.clear()
+        self._card_headers.clear()
+        self._card_rows.clear()
+        self._card_order.clear()
 
     def render_cards(self):
         self.clear_cards()
@@ -192,50 +222,86 @@ class SchoolView(customtkinter.CTk):
                 continue
             header = customtkinter.CTkLabel(self.cards_frame, text=f"— {person_type}s —", font=("Arial", 14, "bold"))
             header.pack(anchor="w", padx=8, pady=(12, 6))
-
+            self._card_headers[person_type] = header
+            key = self.presenter.card_sort_key(person_type)
+            order = self._card_order[person_type] = []
             for obj in objs:
-                row = customtkinter.CTkFrame(self.cards_frame, fg_color="transparent")
+                k = key(obj)
+                row = self._make_card(person_type, obj)
                 row.pack(fill="x", pady=6, padx=6)
+                self._card_rows[(person_type, obj.id)] = (k, row)
+                order.append((k, obj.id))
 
-                key = (person_type, getattr(obj, "id", ""))
-                var = customtkinter.StringVar(value="1" if key in self.selected else "0")
-                chk = customtkinter.CTkCheckBox(row, text="", variable=var, width=24, command=partial(self._on_toggle_select, key, var))
-                chk.pack(side="left", padx=(2, 6))
-                self.checkbox_widgets[key] = chk
-
-                card = customtkinter.CTkFrame(row, corner_radius=8, fg_color="#2f2f2f")
-                card.pack(side="left", fill="x", expand=True, padx=(0, 8))
-
-                name = getattr(obj, "name", ""); idv = getattr(obj, "id", "")
-                grade = getattr(obj, "grade", ""); speciality = getattr(obj, "speciality", "")
-                salary = getattr(obj, "salary", ""); department = getattr(obj, "department", ""); subject = getattr(obj, "subject", "")
-
-                line1 = customtkinter.CTkLabel(card, text=f"{name}  •  ID: {idv}", font=("Arial", 13, "bold"))
-                line1.pack(anchor="w", padx=10, pady=(8, 0))
+        self._refresh_bulk_buttons_state()
 
-                sort_label = self.sort_menu.get()
-                if sort_label == "Grade" and grade != "":
-                    extra = f"Grade={grade}"
-                elif sort_label == "Salary" and salary != "":
-                    extra = f"Salary={salary}"
-                else:
-                    extra = f"{'Grade='+str(grade) if grade!='' else 'Salary='+str(salary)}"
+    def _make_card(self, person_type, obj):
+        """One card row (checkbox, details, actions); the caller packs it."""
+        row = customtkinter.CTkFrame(self.cards_frame, fg_color="transparent")
 
-                right_ctx = speciality or department or subject
-                line2 = customtkinter.CTkLabel(card, text=f"{extra}   |   {right_ctx}", font=("Consolas", 12))
-                line2.pack(anchor="w", padx=10, pady=(4, 10))
+        key = (person_type, getattr(obj, "id", ""))
+        var = customtkinter.StringVar(value="1" if key in self.selected else "0")
+        chk = customtkinter.CTkCheckBox(row, text="", variable=var, width=24, command=partial(self._on_toggle_select, key, var))
+        chk.pack(side="left", padx=(2, 6))
+        self.checkbox_widgets[key] = chk
 
-                actions = customtkinter.CTkFrame(row, fg_color="transparent")
-                actions.pack(side="right")
+        card = customtkinter.CTkFrame(row, corner_radius=8, fg_color="#2f2f2f")
+        card.pack(side="left", fill="x", expand=True, padx=(0, 8))
 
-                edit_btn = customtkinter.CTkButton(actions, text="Edit", width=64, command=partial(self._on_card_edit_id, person_type, idv))
-                edit_btn.pack(pady=2)
+        name = getattr(obj, "name", ""); idv = getattr(obj, "id", "")
+        grade = getattr(obj, "grade", ""); speciality = getattr(obj, "speciality", "")
+        salary = getattr(obj, "salary", ""); department = getattr(obj, "department", ""); subject = getattr(obj, "subject", "")
 
-                del_btn = customtkinter.CTkButton(actions, text="Delete", width=64, fg_color="#ef4444", hover_color="#f97373",
-                                                  command=partial(self._on_card_delete_id, person_type, idv))
-                del_btn.pack(pady=2)
+        line1 = customtkinter.CTkLabel(card, text=f"{name}  •  ID: {idv}", font=("Arial", 13, "bold"))
+        line1.pack(anchor="w", padx=10, pady=(8, 0))
 
+        sort_label = self.sort_menu.get()
+        if sort_label == "Grade" and grade != "":
+            extra = f"Grade={grade}"
+        elif sort_label == "Salary" and salary != "":
+            extra = f"Salary={salary}"
+        else:
+            extra = f"{'Grade='+str(grade) if grade!='' else 'Salary='+str(salary)}"
+
+        right_ctx = speciality or department or subject
+        line2 = customtkinter.CTkLabel(card, text=f"{extra}   |   {right_ctx}", font=("Consolas", 12))
+        line2.pack(anchor="w", padx=10, pady=(4, 10))
+
+        actions = customtkinter.CTkFrame(row, fg_color="transparent")
+        actions.pack(side="right")
+
+        edit_btn = customtkinter.CTkButton(actions, text="Edit", width=64, command=partial(self._on_card_edit_id, person_type, idv))
+        edit_btn.pack(pady=2)
+
+        del_btn = customtkinter.CTkButton(actions, text="Delete", width=64, fg_color="#ef4444", hover_color="#f97373",
+                                          command=partial(self._on_card_delete_id, person_type, idv))
+        del_btn.pack(pady=2)
+        return row
+
+    def _patch_cards(self, delta) -> bool:
+        """Applies pulled changes to the drawn cards; False when a full render is needed instead."""
+        if any(person_type not in self._card_order for person_type in delta):
+            return False  # rol fără carduri desenate (fără antet): mai simplu să redesenăm tot
+        for person_type, change in delta.items():
+            order = self._card_order[person_type]
+            key = self.presenter.card_sort_key(person_type)
+            for idv in list(change["deleted"]) + [r.id for r in change["upserted"]]:
+                drawn = self._card_rows.pop((person_type, idv), None)
+                if drawn is not None:
+                    order.remove((drawn[0], idv))
+                    drawn[1].destroy()
+                    self.checkbox_widgets.pop((person_type, idv), None)
+            for idv in change["deleted"]:
+                self.selected.discard((person_type, idv))
+            for obj in change["upserted"]:
+                k = key(obj)
+                pos = bisect.bisect_left(order, (k, obj.id))
+                anchor = self._card_headers[person_type] if pos == 0 else self._card_rows[(person_type, order[pos - 1][1])][1]
+                row = self._make_card(person_type, obj)
+                row.pack(fill="x", pady=6, padx=6, after=anchor)
+                self._card_rows[(person_type, obj.id)] = (k, row)
+                order.insert(pos, (k, obj.id))
         self._refresh_bulk_buttons_state()
+        return True
 
     # -------- selection --------
     def _on_toggle_select(self, key, var):
@@ -363,3 +429,4 @@ class SchoolView(customtkinter.CTk):
         win.geometry("900x600")
         frame = ChartsFrame(win, self.presenter, width=860, height=540)
         frame.pack(fill="both", expand=True, padx=10, pady=10)
+        self._chart_frames.append(frame)